@@ -0,0 +1,146 @@
+"""Compare model load time and per-worker memory for pickles vs the bundle.
+
+Each format is loaded in a fresh interpreter, which then forks workers that
+score a batch and report their proportional (Pss) and private memory from
+/proc/self/smaps_rollup. Bundle node tables are memory-mapped, so forked
+workers share their pages with each other and the page cache.
+
+Run with: python -m benchmarks.artifact_loading [--model-dir models] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+FORMATS = ("pickle", "bundle", "bundle-native")
+
+
+def _smaps_rollup_mb() -> dict[str, float]:
+    """Rss, Pss and private memory of this process in MB."""
+    fields: dict[str, float] = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def _child(fmt: str, model_dir: str, workers: int) -> None:
+    """Load one format, fork workers and print a JSON report to stdout."""
+    start = time.perf_counter()
+    if fmt == "pickle":
+        with open(Path(model_dir) / "model.pkl", "rb") as f:
+            model = pickle.load(f)
+        with open(Path(model_dir) / "feature_engineer.pkl", "rb") as f:
+            feature_engineer = pickle.load(f)
+        features = feature_engineer.compile(list(model.get_booster().feature_names))
+        predictor = model
+    else:
+        from src.serving.artifacts import load_bundle
+
+        native = fmt == "bundle-native"
+        bundle = load_bundle(model_dir, load_classifier=not native)
+        features = bundle.features
+        predictor = bundle.trees if native else bundle.classifier
+    load_s = time.perf_counter() - start
+
+    import numpy as np
+
+    from src.serving.reload import canary_batch
+
+    batch = canary_batch(len(features.input_columns), n_rows=256)
+    predictor.predict_proba(features.transform(batch.copy()))
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for _ in range(20):
+                predictor.predict_proba(features.transform(batch.copy()))
+            time.sleep(0.5)  # let siblings map their pages before measuring
+            os.write(write_fd, (json.dumps(_smaps_rollup_mb()) + "\n").encode())
+            os._exit(0)
+        pids.append(pid)
+    os.close(write_fd)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as f:
+        reports = [json.loads(line) for line in f]
+
+    print(
+        json.dumps(
+            {
+                "format": fmt,
+                "load_ms": load_s * 1e3,
+                "parent": _smaps_rollup_mb(),
+                "worker_pss_mb": float(np.mean([r["pss_mb"] for r in reports])),
+                "worker_private_mb": float(np.mean([r["private_mb"] for r in reports])),
+            }
+        )
+    )
+
+
+def run(model_dir: str, workers: int) -> list[dict]:
+    """Export the pickles in model_dir to a bundle and measure every format."""
+    from src.serving.artifacts import save_bundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(model_dir) / "model.pkl", "rb") as f:
+            model = pickle.load(f)
+        with open(Path(model_dir) / "feature_engineer.pkl", "rb") as f:
+            feature_engineer = pickle.load(f)
+        for name in ("model.pkl", "feature_engineer.pkl"):
+            shutil.copy(Path(model_dir) / name, Path(tmp) / name)
+        save_bundle(model, feature_engineer, tmp)
+
+        results = []
+        for fmt in FORMATS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.artifact_loading", "--child", fmt]
+                + ["--model-dir", tmp, "--workers", str(workers)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--child", choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.model_dir, args.workers)
+        return
+
+    print(
+        f"{'format':>14} {'load_ms':>8} {'parent_rss_mb':>14} "
+        f"{'worker_pss_mb':>14} {'worker_private_mb':>18}"
+    )
+    for r in run(args.model_dir, args.workers):
+        print(
+            f"{r['format']:>14} {r['load_ms']:>8.1f} {r['parent']['rss_mb']:>14.1f} "
+            f"{r['worker_pss_mb']:>14.1f} {r['worker_private_mb']:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
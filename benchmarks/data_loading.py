@@ -0,0 +1,74 @@
+"""Compare plain pd.read_csv with the schema-typed and chunked load_data.
+
+Writes a synthetic extract with the training schema, then reports parse
+time, throughput, the resulting frame's memory and the peak memory allocated
+while parsing (tracked with tracemalloc, which sees NumPy buffers).
+
+Run with: python -m benchmarks.data_loading [--rows 500000] [--chunksize 100000]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import load_data
+
+
+def _write_extract(path: Path, n_rows: int, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n_rows, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(n_rows, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1.5, size=n_rows).round(2)
+    df["Class"] = (rng.random(n_rows) < 0.002).astype(int)
+    df.to_csv(path, index=False)
+
+
+def _measure(fn: Callable[[], pd.DataFrame]) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def run(n_rows: int, chunksize: int) -> dict[str, dict]:
+    """Measure each loader on a fresh synthetic extract."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "extract.csv"
+        _write_extract(path, n_rows)
+        return {
+            "read_csv": _measure(lambda: pd.read_csv(path)),
+            "load_data": _measure(lambda: load_data(path)),
+            f"load_data[{chunksize}]": _measure(lambda: load_data(path, chunksize=chunksize)),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'loader':>18} {'seconds':>8} {'rows/s':>10} {'frame_mb':>9} {'peak_mb':>8}")
+    for name, r in run(args.rows, args.chunksize).items():
+        print(
+            f"{name:>18} {r['seconds']:>8.2f} {r['rows_per_second']:>10,.0f} "
+            f"{r['frame_mb']:>9.1f} {r['peak_mb']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare training-data load times: CSV, Parquet cache and memory-mapped Arrow cache.
+
+Cold reads first evict the files from the page cache with
+posix_fadvise(DONTNEED); warm reads follow a previous read of the same file.
+The projected row reads only the columns training uses (Time dropped).
+
+Run with: python -m benchmarks.dataset_cache [--rows 500000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.cache import build_cache, read_cache
+from src.data.preprocessing import SCHEMA, load_data
+
+
+def _write_extract(path: Path, n_rows: int, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n_rows, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(n_rows, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1.5, size=n_rows).round(2)
+    df["Class"] = (rng.random(n_rows) < 0.002).astype(int)
+    df.to_csv(path, index=False)
+
+
+def _evict(path: Path) -> None:
+    """Drop a file, or every file in a directory, from the page cache."""
+    for file in [path] if path.is_file() else list(path.iterdir()):
+        fd = os.open(file, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _time(fn: Callable[[], pd.DataFrame]) -> float:
+    start = time.perf_counter()
+    df = fn()
+    # Touch every value so lazily mapped pages are actually read.
+    df.to_numpy(dtype=np.float64).sum()
+    return time.perf_counter() - start
+
+
+def run(n_rows: int) -> dict[str, float]:
+    """Seconds per load for each source and cache state."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "extract.csv"
+        _write_extract(csv_path, n_rows)
+        start = time.perf_counter()
+        arrow = build_cache(csv_path, Path(tmp) / "cache")
+        convert_s = time.perf_counter() - start
+        parquet = build_cache(csv_path, Path(tmp) / "cache", cache_format="parquet")
+        projected = [col for col in SCHEMA if col != "Time"]
+
+        _evict(csv_path)
+        csv_cold = _time(lambda: load_data(csv_path))
+        _evict(parquet)
+        parquet_cold = _time(lambda: read_cache(parquet))
+        _evict(arrow)
+        arrow_cold = _time(lambda: read_cache(arrow))
+        arrow_warm = _time(lambda: read_cache(arrow))
+        arrow_projected = _time(lambda: read_cache(arrow, columns=projected))
+
+    return {
+        "csv_to_arrow_convert": convert_s,
+        "csv_cold": csv_cold,
+        "parquet_cold": parquet_cold,
+        "arrow_mmap_cold": arrow_cold,
+        "arrow_mmap_warm": arrow_warm,
+        "arrow_mmap_warm_projected": arrow_projected,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    baseline = results["csv_cold"]
+    print(f"{'load':>26} {'seconds':>8} {'vs_csv':>8}")
+    for name, seconds in results.items():
+        ratio = "" if name == "csv_to_arrow_convert" else f"{baseline / seconds:>7.1f}x"
+        print(f"{name:>26} {seconds:>8.3f} {ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
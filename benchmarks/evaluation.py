@@ -0,0 +1,85 @@
+"""Compare per-metric sklearn evaluation with the single-pass evaluate_scores.
+
+The sklearn path is what training used to run: five metric functions, plus
+the confusion matrix, the classification report and average precision, each
+validating and scanning the arrays again. The single-pass path sorts the
+scores once and reads everything from cumulative counts; it also reports
+metrics at every distinct threshold, which sklearn would need one call per
+threshold for.
+
+Run with: python -m benchmarks.evaluation [--rows 5000000] [--repeat 3]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+import numpy as np
+from sklearn import metrics
+
+from src.training.evaluate import evaluate_scores, get_classification_report
+
+
+def _synthetic(n_rows: int, seed: int = 42) -> tuple[np.ndarray, np.ndarray]:
+    """Fraud-like labels (0.2% positive) with float32 model scores."""
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n_rows) < 0.002).astype(np.int8)
+    scores = rng.beta(1, 20, size=n_rows) + y * rng.beta(5, 2, size=n_rows)
+    return y, np.clip(scores, 0, 1).astype(np.float32)
+
+
+def _sklearn(y: np.ndarray, scores: np.ndarray) -> dict:
+    y_pred = (scores > 0.5).astype(int)
+    metrics.confusion_matrix(y, y_pred)
+    metrics.classification_report(y, y_pred, target_names=["Not Fraud", "Fraud"])
+    return {
+        "accuracy": metrics.accuracy_score(y, y_pred),
+        "precision": metrics.precision_score(y, y_pred),
+        "recall": metrics.recall_score(y, y_pred),
+        "f1": metrics.f1_score(y, y_pred),
+        "roc_auc": metrics.roc_auc_score(y, scores),
+        "pr_auc": metrics.average_precision_score(y, scores),
+    }
+
+
+def _single_pass(y: np.ndarray, scores: np.ndarray) -> dict:
+    evaluation = evaluate_scores(y, scores)
+    get_classification_report(y, scores > 0.5)
+    evaluation.f1.argmax()  # metrics at every threshold come for free
+    return evaluation.metrics(0.5)
+
+
+def _best_of(fn: Callable[[], dict], repeat: int) -> tuple[float, dict]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run(n_rows: int, repeat: int) -> dict[str, float]:
+    """Best-of-``repeat`` seconds for each path; checks both agree."""
+    y, scores = _synthetic(n_rows)
+    sklearn_s, expected = _best_of(lambda: _sklearn(y, scores), repeat)
+    single_s, result = _best_of(lambda: _single_pass(y, scores), repeat)
+    for name, value in expected.items():
+        if not np.isclose(result[name], value, rtol=1e-9):
+            raise AssertionError(f"{name}: {result[name]} != sklearn {value}")
+    return {"sklearn": sklearn_s, "single_pass": single_s}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    print(f"{'path':>12} {'seconds':>8} {'speedup':>8}")
+    for name, seconds in results.items():
+        print(f"{name:>12} {seconds:>8.3f} {results['sklearn'] / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare FeatureEngineer.transform (pandas) with the compiled NumPy path.
+
+Run with: python -m benchmarks.feature_transform
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_engineering import FeatureEngineer
+
+COLUMNS = [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+
+def _time_per_call(fn: Callable[[], None], number: int) -> float:
+    """Best-of-5 mean seconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def run(batch_sizes: list[int], seed: int = 42) -> list[dict]:
+    """Time both transform paths for each batch size."""
+    rng = np.random.default_rng(seed)
+    train = pd.DataFrame(rng.normal(size=(10_000, len(COLUMNS))), columns=COLUMNS)
+    train["Amount"] = rng.lognormal(3, 1.5, size=len(train))
+    fe = FeatureEngineer(scale_features=["Amount"]).fit(train)
+    compiled = fe.compile(COLUMNS)
+
+    results = []
+    for n_rows in batch_sizes:
+        rows = train.sample(n_rows, replace=True, random_state=seed).to_numpy(dtype=np.float32)
+        buffer = np.empty_like(rows)
+        number = max(5, 500 // n_rows)
+
+        def pandas_path(rows: np.ndarray = rows) -> None:
+            fe.transform(pd.DataFrame(rows, columns=COLUMNS))
+
+        def numpy_path(rows: np.ndarray = rows, buffer: np.ndarray = buffer) -> None:
+            buffer[...] = rows
+            compiled.transform(buffer)
+
+        expected = fe.transform(pd.DataFrame(rows, columns=COLUMNS)).to_numpy()
+        buffer[...] = rows
+        max_abs_diff = float(np.max(np.abs(compiled.transform(buffer) - expected)))
+
+        pandas_s = _time_per_call(pandas_path, number)
+        numpy_s = _time_per_call(numpy_path, number)
+        results.append(
+            {
+                "rows": n_rows,
+                "pandas_us": pandas_s * 1e6,
+                "numpy_us": numpy_s * 1e6,
+                "speedup": pandas_s / numpy_s,
+                "max_abs_diff": max_abs_diff,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'pandas_us':>12} {'numpy_us':>10} {'speedup':>8} {'max_abs_diff':>13}")
+    for r in run(args.batch_sizes):
+        print(
+            f"{r['rows']:>6} {r['pandas_us']:>12.1f} {r['numpy_us']:>10.1f} "
+            f"{r['speedup']:>7.1f}x {r['max_abs_diff']:>13.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
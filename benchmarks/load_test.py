@@ -0,0 +1,366 @@
+"""Load-test the serving API and gate its latency against a stored baseline.
+
+Replays a JSONL request file (or seeded synthetic transactions) against the
+app in-process over ASGI, a local uvicorn or pre-fork server started for the
+run, or an already running URL. Closed-loop mode keeps ``--concurrency``
+requests in flight; open-loop mode sends at a fixed ``--rate`` and measures
+each latency from its scheduled send time, so a slow server cannot hide its
+queueing delay by slowing the sender down.
+
+Each line of a request file is ``{"path": "/predict/batch", "body": {...}}``
+or a bare transaction, which is sent to ``/predict``. Requests are cycled
+until ``--n-requests`` have been sent.
+
+Run with: python -m benchmarks.load_test [--target asgi|uvicorn|server|URL]
+    [--requests FILE.jsonl] [--mode closed|open] [--concurrency 8] [--rate 200]
+    [--n-requests 2000] [--output results.json]
+    [--baseline baseline.json] [--tolerance 0.2]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+import numpy as np
+
+from src.serving.app import FEATURE_COLUMNS
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGETS = ("asgi", "uvicorn", "server")
+MODES = ("closed", "open")
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+DEFAULT_GATE = ["p50", "p95", "p99"]
+
+
+@dataclass(frozen=True)
+class Sample:
+    path: str
+    latency: float
+    ok: bool
+
+
+def load_requests(path: str | Path) -> list[tuple[str, bytes]]:
+    """(path, JSON body) pairs from a request file, bodies serialised once up front."""
+    requests = []
+    for line in Path(path).read_text().splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "body" in record:
+            requests.append((record.get("path", "/predict"), json.dumps(record["body"]).encode()))
+        else:
+            requests.append(("/predict", json.dumps(record).encode()))
+    if not requests:
+        raise ValueError(f"{path} holds no requests")
+    return requests
+
+
+def synthetic_requests(
+    n: int, batch_fraction: float, batch_size: int, seed: int = 42
+) -> list[tuple[str, bytes]]:
+    """Seeded transactions, a ``batch_fraction`` of them sent as ``batch_size`` batches."""
+    rng = np.random.default_rng(seed)
+
+    def transaction() -> dict[str, float]:
+        values = rng.normal(size=len(FEATURE_COLUMNS))
+        values[-1] = rng.lognormal(mean=3.0, sigma=1.5)  # Amount
+        return dict(zip(FEATURE_COLUMNS, values.round(6).tolist(), strict=True))
+
+    requests = []
+    for _ in range(n):
+        if rng.random() < batch_fraction:
+            body: dict = {"transactions": [transaction() for _ in range(batch_size)]}
+            requests.append(("/predict/batch", json.dumps(body).encode()))
+        else:
+            requests.append(("/predict", json.dumps(transaction()).encode()))
+    return requests
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(f"{base_url}/health").raise_for_status()
+            return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f"server at {base_url} did not become healthy") from None
+            time.sleep(0.1)
+
+
+@asynccontextmanager
+async def open_target(target: str, max_connections: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for ``target``, starting and stopping the app or server it names.
+
+    ``asgi`` runs the app's lifespan in this process and calls it without a
+    socket; ``uvicorn`` and ``server`` start a single uvicorn process or the
+    pre-fork server on a free local port; anything else is a base URL.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=None)
+    timeout = httpx.Timeout(30.0)
+    if target == "asgi":
+        from src.serving.app import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://asgi", timeout=timeout
+            ) as client:
+                yield client
+        return
+
+    process = None
+    base_url = target
+    if target in ("uvicorn", "server"):
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        if target == "uvicorn":
+            module = ["uvicorn", "src.serving.app:app", "--log-level", "warning"]
+        else:
+            module = ["src.serving.server"]
+        process = subprocess.Popen(
+            [sys.executable, "-m", *module, "--host", "127.0.0.1", "--port", str(port)],
+            cwd=REPO_ROOT,
+        )
+    try:
+        if process is not None:
+            _wait_healthy(base_url, process)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+            yield client
+    finally:
+        if process is not None and process.poll() is None:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+async def _send(client: httpx.AsyncClient, path: str, body: bytes, start: float) -> Sample:
+    """Send one request; latency runs from ``start``, which may precede the call."""
+    try:
+        response = await client.post(
+            path, content=body, headers={"content-type": "application/json"}
+        )
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+    return Sample(path, time.perf_counter() - start, ok)
+
+
+async def closed_loop(
+    client: httpx.AsyncClient, requests: Iterator[tuple[str, bytes]], concurrency: int
+) -> list[Sample]:
+    """``concurrency`` workers, each sending its next request when the last completes."""
+    samples: list[Sample] = []
+
+    async def worker() -> None:
+        for path, body in requests:
+            samples.append(await _send(client, path, body, time.perf_counter()))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def open_loop(
+    client: httpx.AsyncClient, requests: Iterator[tuple[str, bytes]], rate: float
+) -> list[Sample]:
+    """Send request i at ``i / rate`` seconds, whether or not earlier ones have finished."""
+    start = time.perf_counter()
+    tasks = []
+    for i, (path, body) in enumerate(requests):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_send(client, path, body, scheduled)))
+    return list(await asyncio.gather(*tasks))
+
+
+def summarize(samples: list[Sample], seconds: float) -> dict[str, dict]:
+    """Throughput and latency percentiles (ms) per path, over successful requests."""
+    by_path: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_path[sample.path].append(sample)
+
+    summary = {}
+    for path, path_samples in sorted(by_path.items()):
+        latencies = np.array([s.latency for s in path_samples if s.ok]) * 1e3
+        stats: dict[str, Any] = {
+            "requests": len(path_samples),
+            "errors": sum(not s.ok for s in path_samples),
+            "throughput_rps": round(len(path_samples) / seconds, 2),
+        }
+        if len(latencies):
+            values = np.percentile(latencies, list(PERCENTILES.values()))
+            stats["latency_ms"] = {
+                **{name: round(float(v), 3) for name, v in zip(PERCENTILES, values, strict=True)},
+                "mean": round(float(latencies.mean()), 3),
+                "max": round(float(latencies.max()), 3),
+            }
+        summary[path] = stats
+    return summary
+
+
+def regressions(
+    results: dict, baseline: dict, tolerance: float, percentiles: list[str] = DEFAULT_GATE
+) -> list[str]:
+    """Latency percentiles more than ``tolerance`` (a fraction) above the baseline.
+
+    Paths missing from either run are skipped; new errors always fail the gate.
+    """
+    failures = []
+    for path, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(path)
+        if current is None:
+            continue
+        if current["errors"] > base["errors"]:
+            failures.append(f"{path} errors: {base['errors']} -> {current['errors']}")
+        for name in percentiles:
+            before = base.get("latency_ms", {}).get(name)
+            after = current.get("latency_ms", {}).get(name)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance):
+                failures.append(
+                    f"{path} {name}: {before:.3f}ms -> {after:.3f}ms "
+                    f"(+{after / before - 1:.0%}, tolerance {tolerance:.0%})"
+                )
+    return failures
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run(
+    target: str,
+    requests: list[tuple[str, bytes]],
+    mode: str,
+    n_requests: int,
+    concurrency: int,
+    rate: float,
+    warmup: int,
+) -> tuple[list[Sample], float]:
+    """Warm the target up, then replay ``n_requests`` and return the samples and wall time."""
+    async with open_target(target, max_connections=concurrency) as client:
+        replay = itertools.cycle(requests)
+        await closed_loop(client, itertools.islice(replay, warmup), concurrency)
+
+        measured = itertools.islice(replay, n_requests)
+        start = time.perf_counter()
+        if mode == "closed":
+            samples = await closed_loop(client, measured, concurrency)
+        else:
+            samples = await open_loop(client, measured, rate)
+        return samples, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target", default="asgi", help=f"one of {TARGETS} or a base URL")
+    parser.add_argument("--requests", default=None, help="JSONL request file to replay")
+    parser.add_argument("--mode", choices=MODES, default="closed")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=200.0, help="requests/s in open loop")
+    parser.add_argument("--n-requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--batch-fraction", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-dir", default=None, help="sets SERVING_MODEL_DIR")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="results JSON to gate against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--gate-percentiles", nargs="+", default=DEFAULT_GATE)
+    args = parser.parse_args()
+
+    if args.model_dir is not None:
+        os.environ["SERVING_MODEL_DIR"] = args.model_dir
+    if args.requests:
+        requests = load_requests(args.requests)
+    else:
+        requests = synthetic_requests(
+            max(args.n_requests, 1), args.batch_fraction, args.batch_size, args.seed
+        )
+
+    samples, seconds = asyncio.run(
+        run(
+            args.target,
+            requests,
+            args.mode,
+            args.n_requests,
+            args.concurrency,
+            args.rate,
+            args.warmup,
+        )
+    )
+    results: dict[str, Any] = {
+        "commit": _git_commit(),
+        "config": {
+            "target": args.target,
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "rate": args.rate if args.mode == "open" else None,
+            "n_requests": args.n_requests,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(samples) / seconds, 2),
+        "endpoints": summarize(samples, seconds),
+    }
+
+    print(
+        f"{'path':<16} {'req':>6} {'err':>4} {'rps':>8}" + "".join(f" {p:>8}" for p in PERCENTILES)
+    )
+    for path, stats in results["endpoints"].items():
+        latency = stats.get("latency_ms", {})
+        print(
+            f"{path:<16} {stats['requests']:>6} {stats['errors']:>4} "
+            f"{stats['throughput_rps']:>8.1f}"
+            + "".join(f" {latency.get(p, float('nan')):>8.2f}" for p in PERCENTILES)
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        failures = regressions(results, baseline, args.tolerance, args.gate_percentiles)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print(f"no regression against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare a prediction cache lookup with scoring a single row.
+
+Times the cache hit path (quantised row key plus LRU get), the miss path
+(key, get and put into a full cache) and single-row predict_proba with the
+XGBoost booster and the native engine.
+
+Run with: python -m benchmarks.prediction_cache [--model models/model.pkl]
+    [--entries 100000] [--decimals 6]
+"""
+
+import argparse
+import pickle
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+
+from src.serving.cache import LRUCache, row_key
+from src.serving.tree_engine import TreeEnsemble
+
+
+def _time_per_call(fn: Callable[[], None], number: int) -> float:
+    """Best-of-5 mean seconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def run(model_path: str, n_entries: int, decimals: int, seed: int = 42) -> dict[str, float]:
+    """Microseconds per call of each path."""
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    engine = TreeEnsemble.from_booster(model.get_booster())
+
+    rng = np.random.default_rng(seed)
+    rows = rng.normal(size=(n_entries, engine.n_features)).astype(np.float32)
+    cache: LRUCache[float] = LRUCache(n_entries, ttl_seconds=300.0)
+    for row in rows:
+        cache.put(row_key("v1", row, decimals), 0.5)
+    hit = rows[0]
+    misses = iter(rng.normal(size=(100_000, engine.n_features)).astype(np.float32))
+
+    def hit_path() -> None:
+        cache.get(row_key("v1", hit, decimals))
+
+    def miss_path() -> None:
+        key = row_key("v1", next(misses), decimals)
+        if cache.get(key) is None:
+            cache.put(key, 0.5)
+
+    def xgboost_path() -> None:
+        model.predict_proba(hit[None])
+
+    def native_path() -> None:
+        engine.predict_proba(hit[None])
+
+    return {
+        "cache_hit_us": _time_per_call(hit_path, 10_000) * 1e6,
+        "cache_miss_us": _time_per_call(miss_path, 10_000) * 1e6,
+        "xgboost_us": _time_per_call(xgboost_path, 500) * 1e6,
+        "native_us": _time_per_call(native_path, 500) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="models/model.pkl")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--decimals", type=int, default=6)
+    args = parser.parse_args()
+
+    for name, micros in run(args.model, args.entries, args.decimals).items():
+        print(f"{name:>14} {micros:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure the request latency that shadow scoring adds, and fail above a bound.
+
+Runs the same seeded load (see benchmarks.load_test) against the app with
+shadow scoring off and on, alternating the two for ``--repeats`` rounds, and
+compares the median of each latency percentile per path. The run exits
+non-zero if, for any path, shadow scoring adds more than ``--max-overhead-ms``
+or ``--max-overhead-fraction`` of the baseline to a gated percentile,
+whichever bound is larger.
+
+Run with: python -m benchmarks.shadow_overhead [--model-dir models]
+    [--shadow-model-dir models] [--mode open] [--rate 200] [--n-requests 2000]
+    [--repeats 3] [--max-overhead-ms 1.0] [--max-overhead-fraction 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+from benchmarks.load_test import MODES, run, summarize, synthetic_requests
+
+VARIANTS = ("off", "on")
+GATED = ["p50", "p99"]
+
+
+def _set_shadow(enabled: bool, shadow_model_dir: str) -> None:
+    os.environ["SERVING_SHADOW_SOURCE"] = "directory" if enabled else "none"
+    os.environ["SERVING_SHADOW_MODEL_DIR"] = shadow_model_dir
+
+
+def measure(
+    shadow_model_dir: str,
+    mode: str,
+    n_requests: int,
+    concurrency: int,
+    rate: float,
+    repeats: int,
+    batch_fraction: float,
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Median latency percentiles (ms) per variant and path."""
+    requests = synthetic_requests(n_requests, batch_fraction, batch_size=100)
+    runs: dict[str, list[dict]] = {variant: [] for variant in VARIANTS}
+    for _ in range(repeats):
+        for variant in VARIANTS:
+            _set_shadow(variant == "on", shadow_model_dir)
+            samples, seconds = asyncio.run(
+                run("asgi", requests, mode, n_requests, concurrency, rate, warmup=100)
+            )
+            runs[variant].append(summarize(samples, seconds))
+
+    medians: dict[str, dict[str, dict[str, float]]] = {}
+    for variant, summaries in runs.items():
+        medians[variant] = {
+            path: {
+                name: float(np.median([s[path]["latency_ms"][name] for s in summaries]))
+                for name in GATED
+            }
+            for path in summaries[0]
+        }
+    return medians
+
+
+def overheads(
+    medians: dict[str, dict[str, dict[str, float]]], max_ms: float, max_fraction: float
+) -> tuple[list[str], list[str]]:
+    """Report lines for every path and percentile, and the ones over the bound."""
+    lines, failures = [], []
+    for path, base in medians["off"].items():
+        for name in GATED:
+            before, after = base[name], medians["on"][path][name]
+            bound = max(max_ms, max_fraction * before)
+            line = (
+                f"{path:<16} {name:>4} off {before:8.3f}ms  on {after:8.3f}ms  "
+                f"overhead {after - before:+8.3f}ms  (bound {bound:.3f}ms)"
+            )
+            lines.append(line)
+            if after - before > bound:
+                failures.append(line)
+    return lines, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--shadow-model-dir", default=None, help="default: --model-dir")
+    parser.add_argument("--mode", choices=MODES, default="open")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=200.0, help="requests/s in open loop")
+    parser.add_argument("--n-requests", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--batch-fraction", type=float, default=0.05)
+    parser.add_argument("--max-overhead-ms", type=float, default=1.0)
+    parser.add_argument("--max-overhead-fraction", type=float, default=0.1)
+    args = parser.parse_args()
+
+    os.environ["SERVING_MODEL_DIR"] = args.model_dir
+    medians = measure(
+        args.shadow_model_dir or args.model_dir,
+        args.mode,
+        args.n_requests,
+        args.concurrency,
+        args.rate,
+        args.repeats,
+        args.batch_fraction,
+    )
+    lines, failures = overheads(medians, args.max_overhead_ms, args.max_overhead_fraction)
+    print("\n".join(lines))
+    if failures:
+        print(f"\n{len(failures)} percentile(s) over the overhead bound", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
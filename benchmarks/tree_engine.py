@@ -0,0 +1,72 @@
+"""Compare the native NumPy tree engine with XGBClassifier.predict_proba.
+
+Run with: python -m benchmarks.tree_engine [--model models/model.pkl]
+"""
+
+import argparse
+import pickle
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+
+from src.serving.tree_engine import TreeEnsemble
+
+
+def _time_per_call(fn: Callable[[], None], number: int) -> float:
+    """Best-of-5 mean seconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def run(model_path: str, batch_sizes: list[int], seed: int = 42) -> list[dict]:
+    """Time both scorers for each batch size."""
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    engine = TreeEnsemble.from_booster(model.get_booster())
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for n_rows in batch_sizes:
+        x = rng.normal(size=(n_rows, engine.n_features)).astype(np.float32)
+        number = max(3, 2_000 // n_rows)
+
+        max_abs_diff = float(
+            np.max(np.abs(engine.predict_proba(x)[:, 1] - model.predict_proba(x)[:, 1]))
+        )
+
+        def xgboost_path(x: np.ndarray = x) -> None:
+            model.predict_proba(x)
+
+        def native_path(x: np.ndarray = x) -> None:
+            engine.predict_proba(x)
+
+        xgb_s = _time_per_call(xgboost_path, number)
+        native_s = _time_per_call(native_path, number)
+        results.append(
+            {
+                "rows": n_rows,
+                "xgboost_us": xgb_s * 1e6,
+                "native_us": native_s * 1e6,
+                "speedup": xgb_s / native_s,
+                "max_abs_diff": max_abs_diff,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="models/model.pkl")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'xgboost_us':>12} {'native_us':>10} {'speedup':>8} {'max_abs_diff':>13}")
+    for r in run(args.model, args.batch_sizes):
+        print(
+            f"{r['rows']:>6} {r['xgboost_us']:>12.1f} {r['native_us']:>10.1f} "
+            f"{r['speedup']:>7.2f}x {r['max_abs_diff']:>13.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure VelocityStore memory and update latency at millions of entities.
+
+For each entity count the store is filled with one transaction per entity,
+its memory measured with tracemalloc (slot buffers plus the entity index),
+and then single updates are timed for entities already tracked ("hit"),
+and for unseen entities once the store is full, which recycles the least
+recently seen slot ("evict").
+
+Run with: python -m benchmarks.velocity_store [--entities 1000000 2000000]
+    [--updates 200000] [--capacity 16]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.features.velocity import DEFAULT_WINDOWS, VelocitySpec, VelocityStore
+
+
+def _latencies_us(store: VelocityStore, entities: np.ndarray, start: float) -> np.ndarray:
+    """Per-call update latency in microseconds, one event per second from ``start``."""
+    amounts = np.random.default_rng(1).lognormal(3, 1.5, size=len(entities)).tolist()
+    out = np.empty(len(entities))
+    clock = time.perf_counter_ns
+    update = store.update
+    for i, (entity, amount) in enumerate(zip(entities.tolist(), amounts, strict=True)):
+        t0 = clock()
+        update(entity, start + i, amount)
+        out[i] = clock() - t0
+    return out / 1e3
+
+
+def run(entity_counts: list[int], n_updates: int, capacity: int, seed: int = 42) -> list[dict]:
+    """Memory and latency percentiles of a store holding each number of entities."""
+    rng = np.random.default_rng(seed)
+    spec = VelocitySpec("entity", windows=DEFAULT_WINDOWS, capacity=capacity)
+    results = []
+    for n_entities in entity_counts:
+        tracemalloc.start()
+        store = VelocityStore(spec, max_entities=n_entities)
+        for entity in range(n_entities):
+            store.update(entity, 0.0, 10.0)
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        hits = _latencies_us(store, rng.integers(0, n_entities, size=n_updates), 1.0)
+        unseen = np.arange(n_entities, n_entities + n_updates)
+        evicts = _latencies_us(store, unseen, 1.0 + n_updates)
+        assert len(store) == n_entities
+
+        row: dict = {
+            "entities": n_entities,
+            "memory_mb": traced / 2**20,
+            "bytes_per_entity": traced / n_entities,
+            "buffer_bytes_per_entity": store.nbytes / n_entities,
+        }
+        for name, latencies in (("hit", hits), ("evict", evicts)):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            row[f"{name}_p50_us"] = p50
+            row[f"{name}_p99_us"] = p99
+        results.append(row)
+        del store
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, nargs="+", default=[1_000_000, 2_000_000])
+    parser.add_argument("--updates", type=int, default=200_000)
+    parser.add_argument("--capacity", type=int, default=16)
+    args = parser.parse_args()
+
+    print(
+        f"{'entities':>10} {'memory_mb':>10} {'B/entity':>9} {'buffers':>8} "
+        f"{'hit_p50':>8} {'hit_p99':>8} {'evict_p50':>10} {'evict_p99':>10}"
+    )
+    for r in run(args.entities, args.updates, args.capacity):
+        print(
+            f"{r['entities']:>10} {r['memory_mb']:>10.1f} {r['bytes_per_entity']:>9.0f} "
+            f"{r['buffer_bytes_per_entity']:>8.0f} {r['hit_p50_us']:>7.2f}u "
+            f"{r['hit_p99_us']:>7.2f}u {r['evict_p50_us']:>9.2f}u {r['evict_p99_us']:>9.2f}u"
+        )
+
+
+if __name__ == "__main__":
+    main()
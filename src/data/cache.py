@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from src.data.preprocessing import SCHEMA, data_files, iter_data
+
+CACHE_FORMATS = ("arrow", "parquet")
+MANIFEST_FILE = "manifest.json"
+HASH_INDEX_FILE = "hash_index.json"
+PART_ROWS = 1_000_000
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(source: str | Path, cache_dir: str | Path) -> str:
+    """Content hash of a CSV file or directory of part files.
+
+    Hashing a large extract still costs a full read, so hashes are remembered
+    in ``cache_dir`` per file path, size and modification time; a file is only
+    re-hashed when one of those changes.
+    """
+    index_path = Path(cache_dir) / HASH_INDEX_FILE
+    index = json.loads(index_path.read_text()) if index_path.exists() else {}
+
+    digest = hashlib.sha256()
+    for file in data_files(source):
+        stat = file.stat()
+        key = str(file.resolve())
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if index.get(key, {}).get("stamp") != stamp:
+            index[key] = {"stamp": stamp, "sha256": _file_sha256(file)}
+        digest.update(f"{file.name}:{index[key]['sha256']}\n".encode())
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_index = index_path.with_suffix(".tmp")
+    tmp_index.write_text(json.dumps(index, indent=2))
+    os.replace(tmp_index, index_path)
+    return digest.hexdigest()[:16]
+
+
+def _write_part(table: pa.Table, path: Path, cache_format: str) -> None:
+    if cache_format == "arrow":
+        # Uncompressed IPC so parts can be memory-mapped and read zero-copy.
+        with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=table.num_rows or None)
+    else:
+        pq.write_table(table, path)
+
+
+def build_cache(
+    source: str | Path,
+    cache_dir: str | Path,
+    cache_format: str = "arrow",
+    schema: dict[str, str] | None = None,
+    part_rows: int = PART_ROWS,
+) -> Path:
+    """Convert the source CSV into a partitioned columnar cache and return its path.
+
+    The cache lives in ``cache_dir/<key>-<format>``, where the key hashes the
+    source content and the schema, with one file per ``part_rows`` rows. It is
+    written to a temporary directory that is renamed into place,
+    so readers never see a partial cache. Older caches of the same source are
+    removed. Conversion streams through iter_data, so memory is bounded by
+    ``part_rows``.
+    """
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"cache_format must be one of {CACHE_FORMATS}, got {cache_format}")
+    cache_root = Path(cache_dir)
+    content_hash = source_hash(source, cache_root)
+    schema_json = json.dumps(SCHEMA if schema is None else schema, sort_keys=True)
+    key = hashlib.sha256(f"{content_hash}:{schema_json}".encode()).hexdigest()[:16]
+    target = cache_root / f"{key}-{cache_format}"
+    if (target / MANIFEST_FILE).exists():
+        return target
+
+    tmp = cache_root / f".{target.name}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    parts = []
+    n_rows = 0
+    for i, chunk in enumerate(iter_data(source, chunksize=part_rows, schema=schema)):
+        name = f"part-{i:05d}.{cache_format}"
+        _write_part(pa.Table.from_pandas(chunk, preserve_index=False), tmp / name, cache_format)
+        parts.append(name)
+        n_rows += len(chunk)
+
+    manifest = {
+        "source": str(Path(source).resolve()),
+        "source_hash": content_hash,
+        "format": cache_format,
+        "rows": n_rows,
+        "parts": parts,
+    }
+    (tmp / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+    for stale in cache_root.glob(f"*-{cache_format}"):
+        if stale != target and (stale / MANIFEST_FILE).exists():
+            stale_manifest = json.loads((stale / MANIFEST_FILE).read_text())
+            if stale_manifest["source"] == manifest["source"]:
+                shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def iter_cache(cache_path: str | Path, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+    """Yield a cache built by build_cache one part at a time, projected to ``columns``."""
+    path = Path(cache_path)
+    for name in json.loads((path / MANIFEST_FILE).read_text())["parts"]:
+        yield _read_table(path / name, columns).to_pandas(split_blocks=True)
+
+
+def _read_table(path: Path, columns: list[str] | None) -> pa.Table:
+    if path.suffix == ".arrow":
+        table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        return table.select(columns) if columns is not None else table
+    return pq.read_table(path, columns=columns, memory_map=True)
+
+
+def read_cache(cache_path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a cache built by build_cache, projecting to ``columns``.
+
+    Arrow parts are memory-mapped and only the requested columns are touched.
+    A single-part cache converts without copying, so the returned columns are
+    read-only views of the page cache; several parts are concatenated once.
+    Parquet parts are decoded, reading only the requested columns.
+    """
+    path = Path(cache_path)
+    manifest = json.loads((path / MANIFEST_FILE).read_text())
+    tables = [_read_table(path / name, columns) for name in manifest["parts"]]
+    table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+    return table.to_pandas(split_blocks=True)
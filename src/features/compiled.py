@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class CompiledFeatureEngineer:
+    """NumPy inference form of a fitted FeatureEngineer.
+
+    Column order, scaler means and scales are precomputed as arrays so rows can
+    be transformed without building a DataFrame.
+    """
+
+    def __init__(
+        self,
+        input_columns: list[str],
+        output_columns: list[str],
+        scale_indices: np.ndarray,
+        mean: np.ndarray,
+        scale: np.ndarray,
+    ):
+        self.input_columns = list(input_columns)
+        self.output_columns = list(output_columns)
+        self.keep_indices = np.array(
+            [self.input_columns.index(col) for col in self.output_columns], dtype=np.intp
+        )
+        self._drops_columns = len(self.output_columns) != len(self.input_columns)
+        self.scale_indices = np.asarray(scale_indices, dtype=np.intp)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable parameters, the inverse of from_dict."""
+        return {
+            "input_columns": self.input_columns,
+            "output_columns": self.output_columns,
+            "scale_indices": self.scale_indices.tolist(),
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, params: dict) -> "CompiledFeatureEngineer":
+        """Rebuild from to_dict output without sklearn or a pickled FeatureEngineer."""
+        return cls(
+            input_columns=params["input_columns"],
+            output_columns=params["output_columns"],
+            scale_indices=np.asarray(params["scale_indices"]),
+            mean=np.asarray(params["mean"]),
+            scale=np.asarray(params["scale"]),
+        )
+
+    def transform(self, x: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Transform a single row or a 2-D array of rows in input_columns order.
+
+        Without ``out``, a writeable float32 ``x`` with no columns to drop is
+        transformed in place; otherwise the result is written to ``out`` (or a
+        new float32 buffer) with shape (n_rows, len(output_columns)).
+        """
+        rows = x.reshape(1, -1) if x.ndim == 1 else x
+        if rows.shape[1] != len(self.input_columns):
+            raise ValueError(
+                f"Expected {len(self.input_columns)} input columns, got {rows.shape[1]}"
+            )
+
+        if out is None:
+            if not self._drops_columns and rows.dtype == np.float32 and rows.flags.writeable:
+                out = rows
+            else:
+                out = np.empty((rows.shape[0], len(self.output_columns)), dtype=np.float32)
+
+        if out is not rows:
+            if self._drops_columns:
+                np.take(rows, self.keep_indices, axis=1, out=out)
+            else:
+                out[...] = rows
+
+        for idx, mean, scale in zip(self.scale_indices, self.mean, self.scale, strict=True):
+            column = out[:, idx]
+            column -= mean
+            column /= scale
+
+        return out
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
+from src.features.compiled import CompiledFeatureEngineer
+
 
 class FeatureEngineer:
     """Simple feature engineering pipeline."""
@@ -17,6 +20,13 @@ class FeatureEngineer:
         self._is_fitted = True
         return self
 
+    def partial_fit(self, df: pd.DataFrame) -> "FeatureEngineer":
+        """Update the fit with one chunk of training data, for out-of-core training."""
+        if self.scale_features:
+            self.scaler.partial_fit(df[self.scale_features])
+        self._is_fitted = True
+        return self
+
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Transform features."""
         if not self._is_fitted:
@@ -35,3 +45,19 @@ class FeatureEngineer:
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Fit and transform in one step."""
         return self.fit(df).transform(df)
+
+    def compile(self, input_columns: list[str]) -> CompiledFeatureEngineer:
+        """Build the NumPy inference form for rows laid out as input_columns."""
+        if not self._is_fitted:
+            raise ValueError("FeatureEngineer must be fitted before compile")
+
+        output_columns = [col for col in input_columns if col != "Time"]
+        n_scaled = len(self.scale_features)
+
+        return CompiledFeatureEngineer(
+            input_columns=input_columns,
+            output_columns=output_columns,
+            scale_indices=np.array([output_columns.index(col) for col in self.scale_features]),
+            mean=self.scaler.mean_ if self.scaler.with_mean else np.zeros(n_scaled),
+            scale=self.scaler.scale_ if self.scaler.with_std else np.ones(n_scaled),
+        )
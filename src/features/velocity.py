@@ -0,0 +1,284 @@
+import json
+import math
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+VELOCITY_FILE = "velocity.json"
+DEFAULT_WINDOWS = (60.0, 3600.0)
+DEFAULT_CAPACITY = 16
+DEFAULT_MAX_ENTITIES = 1_000_000
+# Slots allocated up front; the buffers double from here up to max_entities.
+INITIAL_SLOTS = 1024
+
+
+@dataclass(frozen=True)
+class VelocitySpec:
+    """Which velocity features a model was trained with.
+
+    Stored with the model so serving computes exactly the training features:
+    for each window (seconds), the entity's transaction count, amount sum and
+    the amount's z-score against those transactions, over at most the last
+    ``capacity`` transactions.
+    """
+
+    entity_column: str
+    windows: tuple[float, ...] = DEFAULT_WINDOWS
+    capacity: int = DEFAULT_CAPACITY
+
+    def __post_init__(self) -> None:
+        if not self.windows or min(self.windows) <= 0:
+            raise ValueError(f"windows must be positive, got {self.windows}")
+        if self.capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {self.capacity}")
+
+    @property
+    def feature_names(self) -> list[str]:
+        return [
+            f"{name}_{window:g}s"
+            for window in self.windows
+            for name in ("txn_count", "amount_sum", "amount_zscore")
+        ]
+
+    @classmethod
+    def from_config(cls, features_config: dict) -> "VelocitySpec | None":
+        """Spec from the ``features`` config block; None without an ``entity_column``."""
+        entity_column = features_config.get("entity_column")
+        if not entity_column:
+            return None
+        velocity = features_config.get("velocity") or {}
+        return cls(
+            entity_column=entity_column,
+            windows=tuple(float(w) for w in velocity.get("windows", DEFAULT_WINDOWS)),
+            capacity=velocity.get("capacity", DEFAULT_CAPACITY),
+        )
+
+    def save(self, model_dir: str | Path) -> Path:
+        path = Path(model_dir) / VELOCITY_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "entity_column": self.entity_column,
+                    "windows": list(self.windows),
+                    "capacity": self.capacity,
+                }
+            )
+        )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, model_dir: str | Path) -> "VelocitySpec | None":
+        """Read the spec stored with a model, or None for models without velocity features."""
+        path = Path(model_dir) / VELOCITY_FILE
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return cls(
+            entity_column=data["entity_column"],
+            windows=tuple(data["windows"]),
+            capacity=data["capacity"],
+        )
+
+
+class VelocityStore:
+    """Bounded in-process store of per-entity transaction history.
+
+    Each entity owns a slot: a ring buffer of its last ``capacity``
+    (time, amount) events and, per window, the count, sum and sum of squares
+    of the events still inside it. Events arrive in time order, so a window
+    is always the newest events of the ring; ``update`` expires the oldest
+    ones and adds the new one, O(1) amortised per window. Slots live in flat
+    typed arrays rather than per-entity objects, and are reused from the
+    least recently seen entity once ``max_entities`` are tracked. History
+    older than the longest window is dropped on the entity's next event.
+
+    Safe to call from several threads.
+    """
+
+    def __init__(self, spec: VelocitySpec, max_entities: int = DEFAULT_MAX_ENTITIES):
+        if max_entities < 1:
+            raise ValueError(f"max_entities must be at least 1, got {max_entities}")
+        self.spec = spec
+        self.max_entities = max_entities
+        self.feature_names = spec.feature_names
+        self._windows = spec.windows
+        self._ttl = max(spec.windows)
+        self._n_windows = len(spec.windows)
+        self._capacity = spec.capacity
+        self._slots: OrderedDict[Hashable, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._allocated = 0
+        self._times = array("d")
+        self._amounts = array("d")
+        self._head = array("l")
+        self._size = array("l")
+        self._last = array("d")
+        self._count = array("l")
+        self._sum = array("d")
+        self._sumsq = array("d")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the slot buffers (the entity index comes on top)."""
+        buffers = (
+            self._times,
+            self._amounts,
+            self._head,
+            self._size,
+            self._last,
+            self._count,
+            self._sum,
+            self._sumsq,
+        )
+        return sum(len(buffer) * buffer.itemsize for buffer in buffers)
+
+    def _grow(self) -> None:
+        extra = min(max(INITIAL_SLOTS, self._allocated), self.max_entities - self._allocated)
+        for buffer, width in (
+            (self._times, self._capacity),
+            (self._amounts, self._capacity),
+            (self._head, 1),
+            (self._size, 1),
+            (self._last, 1),
+            (self._count, self._n_windows),
+            (self._sum, self._n_windows),
+            (self._sumsq, self._n_windows),
+        ):
+            buffer.frombytes(bytes(extra * width * buffer.itemsize))
+        self._allocated += extra
+
+    def _reset(self, slot: int) -> None:
+        self._head[slot] = 0
+        self._size[slot] = 0
+        base = slot * self._n_windows
+        for i in range(base, base + self._n_windows):
+            self._count[i] = 0
+            self._sum[i] = 0.0
+            self._sumsq[i] = 0.0
+
+    def _slot(self, entity: Hashable, time: float) -> int:
+        slot = self._slots.get(entity)
+        if slot is not None:
+            self._slots.move_to_end(entity)
+            if time - self._last[slot] > self._ttl:
+                self._reset(slot)
+            return slot
+        if len(self._slots) < self.max_entities:
+            slot = len(self._slots)
+            if slot == self._allocated:
+                self._grow()
+        else:
+            _, slot = self._slots.popitem(last=False)
+        self._slots[entity] = slot
+        self._reset(slot)
+        return slot
+
+    def update(
+        self, entity: Hashable | None, time: float, amount: float, record: bool = True
+    ) -> list[float]:
+        """Features of a transaction from the entity's history, then record it.
+
+        The features describe only earlier transactions, as they would have
+        been known when this one was scored. Without an entity every feature
+        is 0 and nothing is recorded; with ``record=False`` the transaction
+        is only looked up, for callers that are not scoring a new one.
+        """
+        if entity is None:
+            return [0.0] * len(self.feature_names)
+
+        capacity = self._capacity
+        times, amounts = self._times, self._amounts
+        count, sums, sumsq = self._count, self._sum, self._sumsq
+        features: list[float] = []
+        with self._lock:
+            if not record and entity not in self._slots:
+                return [0.0] * len(self.feature_names)
+            slot = self._slot(entity, time)
+            base = slot * capacity
+            head = self._head[slot]
+            size = self._size[slot]
+            if size:
+                time = max(time, self._last[slot])
+
+            first = slot * self._n_windows
+            for i, window in enumerate(self._windows, start=first):
+                n, s, q = count[i], sums[i], sumsq[i]
+                while n and time - times[base + (head - n) % capacity] > window:
+                    old = amounts[base + (head - n) % capacity]
+                    s -= old
+                    q -= old * old
+                    n -= 1
+                if not n:
+                    s = q = 0.0
+                zscore = 0.0
+                if n > 1:
+                    mean = s / n
+                    variance = q / n - mean * mean
+                    if variance > 0:
+                        zscore = (amount - mean) / math.sqrt(variance)
+                features += (float(n), s, zscore)
+                if not record:
+                    continue
+
+                # Record the new event; a full ring first drops its oldest one.
+                if n == capacity:
+                    old = amounts[base + head]
+                    s -= old
+                    q -= old * old
+                    n -= 1
+                count[i], sums[i], sumsq[i] = n + 1, s + amount, q + amount * amount
+
+            if not record:
+                return features
+            times[base + head] = time
+            amounts[base + head] = amount
+            self._head[slot] = (head + 1) % capacity
+            self._size[slot] = min(size + 1, capacity)
+            self._last[slot] = time
+        return features
+
+    def replay(
+        self, entities: Sequence[Hashable], times: Sequence[float], amounts: Sequence[float]
+    ) -> np.ndarray:
+        """Features of each transaction in turn; the input must be in time order."""
+        out = np.empty((len(entities), len(self.feature_names)), dtype=np.float32)
+        for row, (entity, time, amount) in enumerate(zip(entities, times, amounts, strict=True)):
+            out[row] = self.update(entity, float(time), float(amount))
+        return out
+
+
+def add_velocity_features(
+    df: "pd.DataFrame", spec: VelocitySpec, time_column: str = "Time", amount_column: str = "Amount"
+) -> "pd.DataFrame":
+    """``df`` with the spec's velocity features appended, replaying it in time order.
+
+    Each row sees only the transactions before it, as serving would have, but
+    every entity is tracked: there is no ``max_entities`` eviction. Rows with
+    a missing entity get zero features.
+    """
+    order = np.argsort(df[time_column].to_numpy(), kind="stable")
+    entity = df[spec.entity_column]
+    entities = entity.astype(object).where(entity.notna(), None).to_numpy()
+    store = VelocityStore(spec, max_entities=max(1, entity.nunique()))
+    features = np.empty((len(df), len(spec.feature_names)), dtype=np.float32)
+    features[order] = store.replay(
+        entities[order],
+        df[time_column].to_numpy()[order],
+        df[amount_column].to_numpy()[order],
+    )
+    return df.assign(**dict(zip(spec.feature_names, features.T, strict=True)))
@@ -0,0 +1,5 @@
+import time
+
+# Taken before any serving module or its dependencies are imported, so the
+# startup profile can attribute import time.
+IMPORT_STARTED = time.perf_counter()
@@ -1,58 +1,555 @@
+import asyncio
+import dataclasses
+import os
 import pickle
-from collections.abc import AsyncGenerator
+import shutil
+import time
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
-import xgboost as xgb
-from fastapi import FastAPI, HTTPException
-from prometheus_client import Counter, Histogram, make_asgi_app
-from pydantic import BaseModel
+import numpy as np
+import structlog
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from pydantic import BaseModel, Field, ValidationError
+
+from src.features.velocity import VelocitySpec, VelocityStore
+from src.serving import IMPORT_STARTED
+from src.serving.artifacts import has_bundle, load_bundle
+from src.serving.batching import MicroBatcher
+from src.serving.cache import LRUCache, row_key
+from src.serving.config import ServingConfig
+from src.serving.drift import DriftMonitor, DriftReference
+from src.serving.explain import (
+    DEFAULT_TOP_K,
+    MAX_EXPLAIN_BATCH_SIZE,
+    feature_contributions,
+    margin_probabilities,
+    top_features,
+)
+from src.serving.instrumentation import (
+    SlowRequestLog,
+    StageTimingMiddleware,
+    handler_finished,
+    handler_started,
+    queued,
+    request_timings,
+    stage,
+)
+from src.serving.pool import InferencePool, PoolSaturatedError
+from src.serving.profiling import MAX_PROFILE_SECONDS, collapsed, sample_stacks
+from src.serving.reload import (
+    LoadedModel,
+    ModelWatcher,
+    canary_batch,
+    directory_fingerprint,
+    download_mlflow_artifacts,
+    mlflow_alias_version,
+    validate_canary,
+)
+from src.serving.shadow import ShadowScorer
+from src.serving.startup import StartupProfile, imported_heavy_modules
+from src.serving.thresholds import OperatingPoints, resolve_threshold
+from src.serving.tree_engine import TreeEnsemble
+
+if TYPE_CHECKING:
+    import xgboost as xgb
 
-from src.features.feature_engineering import FeatureEngineer
+    from src.features.feature_engineering import FeatureEngineer
+
+# pandas, sklearn and xgboost are imported lazily: the bundle + native engine
+# path scores with NumPy alone, and each of them adds hundreds of milliseconds
+# to a cold start.
+# Set by the pre-fork server before this module is imported.
+MULTIPROCESS_METRICS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+STARTUP = StartupProfile()
+STARTUP.record("import", time.perf_counter() - IMPORT_STARTED)
+
+logger = structlog.get_logger(__name__)
 
 
 class ModelState:
-    model: xgb.XGBClassifier | None = None
-    feature_engineer: FeatureEngineer | None = None
+    active: LoadedModel | None = None
+    preloaded: LoadedModel | None = None
+    batcher: MicroBatcher | None = None
+    pool: InferencePool | None = None
+    explain_pool: InferencePool | None = None
+    explanations: LRUCache[np.ndarray] | None = None
+    predictions: LRUCache[float] | None = None
+    prediction_cache_decimals: int | None = None
+    watcher: ModelWatcher | None = None
+    shadow: ShadowScorer | None = None
+    shadow_version: str | None = None
+    drift_task: asyncio.Task | None = None
+    profiling_enabled: bool = False
+    profiling: bool = False
+
+    @property
+    def model(self) -> "xgb.XGBClassifier | None":
+        return self.active.model if self.active is not None else None
+
+    @property
+    def feature_engineer(self) -> "FeatureEngineer | None":
+        return self.active.feature_engineer if self.active is not None else None
 
 
 state = ModelState()
+slow_requests = SlowRequestLog()
+
+# Stages of a scoring call, run on the inference pool.
+SCORING_STAGES = ("dataframe", "transform", "predict")
+
+
+def _load_model(model_path: Path, config: ServingConfig, version: str) -> LoadedModel:
+    """Load model artifacts and build their inference helpers.
+
+    Bundles are preferred when present (or forced by the artifact format); the
+    booster is skipped entirely when the native engine serves from the
+    memory-mapped node tables. The decision threshold is resolved here, from
+    the config and the operating points stored with the model, a drift
+    monitor is attached when the model has a drift reference, and an empty
+    velocity store when it was trained with velocity features.
+    """
+    points = OperatingPoints.load(model_path)
+    if points is None and config.target_precision is not None:
+        logger.warning("no_operating_points", model_dir=str(model_path))
+    threshold = resolve_threshold(points, config.decision_threshold, config.target_precision)
+    spec = VelocitySpec.load(model_path)
+    velocity = VelocityStore(spec, config.velocity_max_entities) if spec is not None else None
+    columns = _input_columns(spec)
+    drift = _drift_monitor(model_path, config, columns)
+
+    artifact_format = config.artifact_format
+    if artifact_format == "auto":
+        artifact_format = "bundle" if has_bundle(model_path) else "pickle"
+
+    if artifact_format == "bundle":
+        native = config.model_engine == "native"
+        bundle = load_bundle(model_path, load_classifier=not native)
+        if bundle.classifier is not None:
+            bundle.classifier.set_params(n_jobs=config.threads_per_worker)
+        return LoadedModel(
+            model=bundle.classifier,
+            feature_engineer=None,
+            version=bundle.version,
+            compiled_features=bundle.features,
+            tree_engine=bundle.trees if native else None,
+            threshold=threshold,
+            drift=drift,
+            velocity=velocity,
+        )
+
+    # Unpickling imports xgboost and sklearn regardless, so these cost nothing extra.
+    import xgboost as xgb
+
+    from src.features.feature_engineering import FeatureEngineer
+
+    with open(model_path / "model.pkl", "rb") as f:
+        model = pickle.load(f)
+
+    with open(model_path / "feature_engineer.pkl", "rb") as f:
+        feature_engineer = pickle.load(f)
+
+    if isinstance(model, xgb.XGBModel):
+        model.set_params(n_jobs=config.threads_per_worker)
+
+    compiled_features = None
+    if isinstance(feature_engineer, FeatureEngineer):
+        compiled_features = feature_engineer.compile(columns)
+
+    tree_engine = None
+    if config.model_engine == "native":
+        tables_path = model_path / "trees"
+        if (tables_path / "ensemble.json").exists():
+            tree_engine = TreeEnsemble.load(tables_path)
+        else:
+            tree_engine = TreeEnsemble.from_booster(model.get_booster())
+
+    return LoadedModel(
+        model=model,
+        feature_engineer=feature_engineer,
+        version=version,
+        compiled_features=compiled_features,
+        tree_engine=tree_engine,
+        threshold=threshold,
+        drift=drift,
+        velocity=velocity,
+    )
+
+
+def _input_columns(spec: VelocitySpec | None) -> list[str]:
+    """Model input columns: the API features, then the velocity features of ``spec``."""
+    return FEATURE_COLUMNS if spec is None else [*FEATURE_COLUMNS, *spec.feature_names]
+
+
+def _velocity_spec(loaded: LoadedModel) -> VelocitySpec | None:
+    """Velocity spec of a loaded model, or None if it uses no velocity features."""
+    return loaded.velocity.spec if loaded.velocity is not None else None
+
+
+def _drift_monitor(
+    model_path: Path, config: ServingConfig, columns: list[str]
+) -> DriftMonitor | None:
+    """Monitor for a model's drift reference, if it has one matching the input ``columns``."""
+    if not config.drift_enabled:
+        return None
+    reference = DriftReference.load(model_path)
+    if reference is None:
+        return None
+    if reference.names[:-1] != columns:
+        logger.warning("drift_reference_mismatch", model_dir=str(model_path))
+        return None
+    return DriftMonitor(reference, decay=config.drift_decay)
+
+
+async def _publish_drift(interval_seconds: float) -> None:
+    """Recompute the drift gauges of the active model every ``interval_seconds``."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        loaded = state.active
+        if loaded is not None and loaded.drift is not None:
+            loaded.drift.publish()
+
+
+def _load_from_mlflow(config: ServingConfig, version: str) -> LoadedModel:
+    """Load a registry version's artifact pair via a temporary download."""
+    artifact_dir = download_mlflow_artifacts(version)
+    try:
+        return _load_model(artifact_dir, config, version)
+    finally:
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+
+
+def _validate(loaded: LoadedModel) -> None:
+    """Warm a candidate model on the canary batch and check its scores."""
+    validate_canary(
+        partial(_score_matrix, loaded=loaded), len(_input_columns(_velocity_spec(loaded)))
+    )
+
+
+def _warm_up(loaded: LoadedModel) -> None:
+    """Score synthetic rows so first requests skip one-off setup costs.
+
+    Covers the single-row and batch shapes, which page in memory-mapped node
+    tables and let the booster and pandas fallback initialise their caches.
+    """
+    n_features = len(_input_columns(_velocity_spec(loaded)))
+    _score_matrix(canary_batch(n_features, n_rows=1), loaded)
+    _score_matrix(canary_batch(n_features), loaded)
+
+
+def _activate(loaded: LoadedModel) -> None:
+    """Swap in a model; in-flight requests keep the version they started with.
+
+    A model with the same velocity spec as the one it replaces takes over its
+    store, so entity history survives reloads. Cached predictions of the
+    previous model are dropped.
+    """
+    previous = state.active
+    if (
+        previous is not None
+        and previous.velocity is not None
+        and loaded.velocity is not None
+        and previous.velocity.spec == loaded.velocity.spec
+    ):
+        loaded = dataclasses.replace(loaded, velocity=previous.velocity)
+    state.active = loaded
+    if state.predictions is not None and previous is not None:
+        state.predictions.clear()
+    if previous is not None:
+        _retire_model_info(previous.version)
+    MODEL_INFO.labels(version=loaded.version).set(1)
+
+
+def _retire_model_info(version: str) -> None:
+    """Stop reporting a version in fraud_model_info.
+
+    Label sets cannot be removed in multiprocess mode, so the version is zeroed
+    there instead; "livemax" keeps it at 1 while any worker still serves it.
+    """
+    if MULTIPROCESS_METRICS:
+        MODEL_INFO.labels(version=version).set(0)
+    else:
+        MODEL_INFO.clear()
+
+
+def preload_model(config: ServingConfig) -> LoadedModel:
+    """Load the model before forking so every worker shares one copy.
+
+    The lifespan of each worker then serves this model instead of loading its
+    own. Nothing is scored here: forking after XGBoost has started OpenMP
+    threads is unsafe, so warmup runs in each worker.
+    """
+    model_path = Path(config.model_dir)
+    with STARTUP.phase("load"):
+        version = directory_fingerprint(model_path) or "unknown"
+        state.preloaded = _load_model(model_path, config, version)
+    return state.preloaded
+
+
+def _load_shadow(config: ServingConfig) -> LoadedModel | None:
+    """Load and warm the shadow model, or None if it cannot be loaded.
+
+    The shadow model scores with a single XGBoost thread and without a drift
+    monitor; a failure to load it is logged and never stops the service.
+    """
+    shadow_config = dataclasses.replace(config, drift_enabled=False)
+    try:
+        if config.shadow_source == "mlflow":
+            # Raises if no version has the alias; logged below like any load failure.
+            version = mlflow_alias_version(config.shadow_model_alias)
+            shadow = _load_from_mlflow(shadow_config, version)
+        else:
+            path = Path(config.shadow_model_dir)
+            version = directory_fingerprint(path) or "unknown"
+            shadow = _load_model(path, shadow_config, version)
+        if shadow.model is not None:
+            shadow.model.set_params(n_jobs=1)
+        _warm_up(shadow)
+    except Exception:
+        logger.exception("shadow_model_load_failed", source=config.shadow_source)
+        return None
+    return shadow
+
+
+def _start_shadow(config: ServingConfig, primary: LoadedModel) -> ShadowScorer | None:
+    """Shadow scorer for the configured second model, if it takes the primary's inputs."""
+    shadow = _load_shadow(config)
+    if shadow is None:
+        return None
+    columns = _input_columns(_velocity_spec(shadow))
+    if columns != _input_columns(_velocity_spec(primary)):
+        logger.warning("shadow_model_schema_mismatch", shadow_version=shadow.version)
+        return None
+    state.shadow_version = shadow.version
+    logger.info("shadow_model_loaded", shadow_version=shadow.version)
+    return ShadowScorer(
+        partial(_score_matrix, loaded=shadow),
+        n_features=len(columns),
+        threshold=shadow.threshold,
+        sample_rate=config.shadow_sample_rate,
+        max_batch_size=config.shadow_max_batch_size,
+        max_queue=config.shadow_queue_size,
+        interval_seconds=config.shadow_interval_ms / 1000,
+    )
+
+
+def _start_watcher(config: ServingConfig, model_path: Path) -> ModelWatcher:
+    """Build the watcher for the configured reload source."""
+    assert state.active is not None
+    if config.reload_source == "mlflow":
+        fingerprint_fn: Callable[[], str | None] = partial(
+            mlflow_alias_version, config.reload_model_alias
+        )
+        load_fn = partial(_load_from_mlflow, config)
+    else:
+        fingerprint_fn = partial(directory_fingerprint, model_path)
+        load_fn = partial(_load_model, model_path, config)
+
+    return ModelWatcher(
+        fingerprint_fn=fingerprint_fn,
+        load_fn=load_fn,
+        validate_fn=_validate,
+        swap_fn=_activate,
+        current_version=state.active.version,
+        interval_seconds=config.reload_interval_seconds,
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Load model on startup, cleanup on shutdown."""
-    model_path = Path("models")
+    config = ServingConfig.from_env()
+    model_path = Path(config.model_dir)
 
-    with open(model_path / "model.pkl", "rb") as f:
-        state.model = pickle.load(f)
+    loaded = state.preloaded
+    if loaded is None:
+        with STARTUP.phase("load"):
+            version = directory_fingerprint(model_path) or "unknown"
+            loaded = _load_model(model_path, config, version)
 
-    with open(model_path / "feature_engineer.pkl", "rb") as f:
-        state.feature_engineer = pickle.load(f)
+    if config.warmup_enabled:
+        with STARTUP.phase("warmup"):
+            _warm_up(loaded)
+    _activate(loaded)
+
+    slow_requests.threshold_seconds = (
+        config.slow_request_ms / 1000 if config.slow_request_ms is not None else None
+    )
+    slow_requests.sample_rate = config.slow_request_sample_rate
+    state.profiling_enabled = config.profiling_enabled
+
+    state.pool = InferencePool(
+        max_workers=config.inference_workers,
+        max_queue=config.inference_queue_size,
+    )
+    # Explanations get their own workers so they never hold up /predict.
+    state.explain_pool = InferencePool(
+        max_workers=config.explain_workers,
+        max_queue=config.explain_queue_size,
+        thread_name_prefix="explain",
+        report_metrics=False,
+    )
+    if config.explain_cache_size:
+        state.explanations = LRUCache(config.explain_cache_size)
+    if config.prediction_cache_size:
+        state.predictions = LRUCache(
+            config.prediction_cache_size,
+            ttl_seconds=config.prediction_cache_ttl_seconds,
+            on_evict=_count_prediction_evictions,
+        )
+        state.prediction_cache_decimals = config.prediction_cache_decimals
+
+    if config.microbatch_enabled:
+        state.batcher = MicroBatcher(
+            _score_microbatch,
+            max_batch_size=config.microbatch_max_size,
+            max_wait_seconds=config.microbatch_max_wait_ms / 1000,
+        )
+        await state.batcher.start()
+
+    if config.reload_source != "none":
+        state.watcher = _start_watcher(config, model_path)
+        await state.watcher.start()
+
+    if config.drift_enabled:
+        state.drift_task = asyncio.create_task(_publish_drift(config.drift_interval_seconds))
+
+    if config.shadow_source != "none":
+        state.shadow = _start_shadow(config, loaded)
+        if state.shadow is not None:
+            await state.shadow.start()
+
+    report = STARTUP.report()
+    for phase, seconds in report.items():
+        STARTUP_SECONDS.labels(phase=phase).set(seconds)
+    logger.info(
+        "startup_complete",
+        model_version=loaded.version,
+        decision_threshold=loaded.threshold,
+        heavy_modules=imported_heavy_modules(),
+        **{f"{phase}_ms": round(seconds * 1e3, 1) for phase, seconds in report.items()},
+    )
 
     yield
 
-    state.model = None
-    state.feature_engineer = None
+    if state.shadow is not None:
+        await state.shadow.stop()
+        state.shadow = None
+        state.shadow_version = None
+    if state.drift_task is not None:
+        state.drift_task.cancel()
+        state.drift_task = None
+    if state.watcher is not None:
+        await state.watcher.stop()
+        state.watcher = None
+    if state.batcher is not None:
+        await state.batcher.stop()
+        state.batcher = None
+    state.pool.shutdown()
+    state.pool = None
+    state.explain_pool.shutdown()
+    state.explain_pool = None
+    state.explanations = None
+    state.predictions = None
+    if state.active is not None:
+        _retire_model_info(state.active.version)
+    state.active = None
 
 
 app = FastAPI(title="Fraud Detection API", version="1.0.0", lifespan=lifespan)
+app.add_middleware(StageTimingMiddleware, slow_log=slow_requests)
 
 PREDICTION_COUNT = Counter(
     "fraud_predictions_total",
     "Total predictions",
-    ["result"],
+    ["result", "model_version"],
+)
+MODEL_INFO = Gauge(
+    "fraud_model_info",
+    "Active model version (value is always 1)",
+    ["version"],
+    multiprocess_mode="livemax",
 )
 PREDICTION_LATENCY = Histogram(
     "fraud_prediction_latency_seconds",
     "Prediction latency",
 )
+BATCH_LATENCY = Histogram(
+    "fraud_batch_prediction_latency_seconds",
+    "Batch prediction latency",
+    ["size_bucket"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BATCH_ROWS = Histogram(
+    "fraud_batch_prediction_rows",
+    "Rows per batch prediction request",
+    ["size_bucket"],
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
+EXPLAIN_LATENCY = Histogram(
+    "fraud_explain_latency_seconds",
+    "Explanation latency",
+    ["endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EXPLAIN_CACHE = Counter(
+    "fraud_explain_cache_total",
+    "Explanation cache lookups, by result (hit or miss)",
+    ["result"],
+)
+PREDICTION_CACHE = Counter(
+    "fraud_prediction_cache_total",
+    "Prediction cache lookups, by result (hit or miss)",
+    ["result"],
+)
+PREDICTION_CACHE_EVICTIONS = Counter(
+    "fraud_prediction_cache_evictions_total",
+    "Entries dropped from the prediction cache, by reason (capacity, expired or cleared)",
+    ["reason"],
+)
+
+STARTUP_SECONDS = Gauge(
+    "fraud_startup_phase_seconds",
+    "Cold-start duration by phase (import, load, warmup, total)",
+    ["phase"],
+    multiprocess_mode="livemax",
+)
+
+
+def _metrics_registry() -> CollectorRegistry:
+    """Registry to expose: under the pre-fork server it aggregates all workers."""
+    if not MULTIPROCESS_METRICS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
 
-metrics_app = make_asgi_app()
+metrics_app = make_asgi_app(registry=_metrics_registry())
 app.mount("/metrics", metrics_app)
 
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError) -> JSONResponse:
+    """Shed load with a fast 503 when the inference queue is full."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 class Transaction(BaseModel):
     """Input transaction schema."""
 
@@ -85,6 +582,12 @@ class Transaction(BaseModel):
     V27: float
     V28: float
     Amount: float
+    entity_id: str | None = None  # e.g. a card id; keys the velocity features
+
+
+FEATURE_COLUMNS = [name for name in Transaction.model_fields if name != "entity_id"]
+MAX_BATCH_SIZE = 10_000
+BATCH_SIZE_BUCKETS = (1, 10, 100, 1000, MAX_BATCH_SIZE)
 
 
 class Prediction(BaseModel):
@@ -94,25 +597,419 @@ class Prediction(BaseModel):
     fraud_probability: float
 
 
+class BatchRequest(BaseModel):
+    """Batch input schema; rows are validated individually."""
+
+    transactions: list[dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchPredictionItem(BaseModel):
+    """Per-row batch result, either a prediction or a validation error."""
+
+    index: int
+    is_fraud: bool | None = None
+    fraud_probability: float | None = None
+    error: str | None = None
+
+
+class BatchPrediction(BaseModel):
+    """Output batch prediction schema, in input order."""
+
+    predictions: list[BatchPredictionItem]
+    n_scored: int
+    n_failed: int
+
+
+class FeatureContribution(BaseModel):
+    """One input's raw value and its SHAP contribution to the log-odds."""
+
+    feature: str
+    value: float
+    contribution: float
+
+
+class Explanation(BaseModel):
+    """Output explanation schema: the score and its top contributing inputs."""
+
+    is_fraud: bool
+    fraud_probability: float
+    base_value: float
+    contributions: list[FeatureContribution]
+
+
+class ExplainBatchRequest(BaseModel):
+    """Batch explanation input schema; rows are validated individually."""
+
+    transactions: list[dict[str, Any]] = Field(..., min_length=1, max_length=MAX_EXPLAIN_BATCH_SIZE)
+
+
+class BatchExplanationItem(BaseModel):
+    """Per-row batch result, either an explanation or a validation error."""
+
+    index: int
+    explanation: Explanation | None = None
+    error: str | None = None
+
+
+class BatchExplanation(BaseModel):
+    """Output batch explanation schema, in input order."""
+
+    explanations: list[BatchExplanationItem]
+    n_explained: int
+    n_failed: int
+
+
+def _size_bucket(n_rows: int) -> str:
+    """Label a batch by the smallest size bucket that holds it."""
+    for bound in BATCH_SIZE_BUCKETS:
+        if n_rows <= bound:
+            return f"le_{bound}"
+    return f"gt_{MAX_BATCH_SIZE}"
+
+
+def _count_prediction_evictions(reason: str, count: int) -> None:
+    PREDICTION_CACHE_EVICTIONS.labels(reason=reason).inc(count)
+
+
+def _feature_values(transaction: Transaction) -> list[float]:
+    """Extract the API features of a transaction in FEATURE_COLUMNS order."""
+    return [getattr(transaction, col) for col in FEATURE_COLUMNS]
+
+
+def _model_inputs(
+    transaction: Transaction, loaded: LoadedModel, now: float, record: bool = True
+) -> list[float]:
+    """Model inputs of a transaction, recording it in the velocity store if there is one."""
+    values = _feature_values(transaction)
+    if loaded.velocity is not None:
+        values += loaded.velocity.update(
+            transaction.entity_id, now, transaction.Amount, record=record
+        )
+    return values
+
+
+def _parse_rows(
+    rows: list[dict[str, Any]], loaded: LoadedModel, record: bool = True
+) -> tuple[np.ndarray, list[int], dict[int, str]]:
+    """Validate rows individually into a matrix of the valid ones.
+
+    Returns the matrix, the index of each of its rows in ``rows`` and the
+    validation error of every invalid row.
+    """
+    features = np.empty((len(rows), len(_input_columns(_velocity_spec(loaded)))), np.float32)
+    valid_rows: list[int] = []
+    errors: dict[int, str] = {}
+    now = time.time()
+    for i, raw in enumerate(rows):
+        try:
+            transaction = Transaction.model_validate(raw)
+        except ValidationError as e:
+            errors[i] = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            continue
+        features[len(valid_rows)] = _model_inputs(transaction, loaded, now, record)
+        valid_rows.append(i)
+    return features[: len(valid_rows)], valid_rows, errors
+
+
+def _model_input(features: np.ndarray, loaded: LoadedModel) -> Any:
+    """Transform raw input rows into what the trees take.
+
+    Uses the compiled NumPy transform when available, which scales
+    ``features`` in place; otherwise falls back to the DataFrame path.
+    """
+    if loaded.compiled_features is not None:
+        with stage("transform"):
+            return loaded.compiled_features.transform(features)
+
+    import pandas as pd
+
+    with stage("dataframe"):
+        columns = _input_columns(_velocity_spec(loaded))
+        df = pd.DataFrame(features, columns=columns, copy=False)
+    with stage("transform"):
+        return loaded.feature_engineer.transform(df)
+
+
+def _score_matrix(features: np.ndarray, loaded: LoadedModel | None = None) -> np.ndarray:
+    """Score a (n_rows, n_features) float32 matrix with a single predict_proba call.
+
+    ``features`` may be scaled in place (see ``_model_input``). Trees are
+    evaluated by the native engine when it is enabled, else by the XGBoost
+    booster. Scores with ``loaded`` if given, else with the model active at
+    call time.
+    """
+    loaded = loaded if loaded is not None else state.active
+    assert loaded is not None
+    model_input = _model_input(features, loaded)
+    predictor = loaded.tree_engine if loaded.tree_engine is not None else loaded.model
+    with stage("predict"):
+        return np.asarray(predictor.predict_proba(model_input))[:, 1]
+
+
+async def _score_in_pool(features: np.ndarray, loaded: LoadedModel | None = None) -> np.ndarray:
+    """Run _score_matrix on the bounded inference pool."""
+    assert state.pool is not None
+    return await state.pool.run(_score_matrix, features, loaded)
+
+
+async def _score_microbatch(features: np.ndarray, loaded: LoadedModel) -> np.ndarray:
+    """Score a micro-batch, timing its stages under the ``microbatch`` endpoint."""
+    with request_timings("microbatch"):
+        return await _score_in_pool(features, loaded)
+
+
+def _score_batch(
+    rows: list[dict[str, Any]], loaded: LoadedModel
+) -> tuple[list[BatchPredictionItem], int]:
+    """Validate rows individually and score the valid ones in one call."""
+    items = [BatchPredictionItem(index=i) for i in range(len(rows))]
+    with stage("validate_rows"):
+        valid, valid_rows, errors = _parse_rows(rows, loaded)
+    for i, error in errors.items():
+        items[i].error = error
+
+    if valid_rows:
+        # Scoring scales the features in place, so the monitors get a copy.
+        shadow = state.shadow
+        inputs = valid.copy() if loaded.drift is not None or shadow is not None else valid
+        probabilities = _score_matrix(valid, loaded)
+        if loaded.drift is not None:
+            loaded.drift.observe(inputs, probabilities)
+        if shadow is not None:
+            shadow.submit(inputs, probabilities, probabilities > loaded.threshold)
+        for row, probability in zip(valid_rows, probabilities, strict=True):
+            is_fraud = bool(probability > loaded.threshold)
+            items[row].is_fraud = is_fraud
+            items[row].fraud_probability = float(probability)
+            PREDICTION_COUNT.labels(
+                result="fraud" if is_fraud else "not_fraud", model_version=loaded.version
+            ).inc()
+
+    return items, len(valid_rows)
+
+
+def _contributions(features: np.ndarray, loaded: LoadedModel) -> np.ndarray:
+    """SHAP contributions of raw input rows, reusing cached rows of the same model version."""
+    cache = state.explanations
+    contributions = np.empty((len(features), features.shape[1] + 1), dtype=np.float32)
+    keys = [row_key(loaded.version, row) for row in features] if cache is not None else []
+    missing = []
+    for i in range(len(features)):
+        cached = cache.get(keys[i]) if cache is not None else None
+        if cached is None:
+            missing.append(i)
+        else:
+            contributions[i] = cached
+    if cache is not None:
+        EXPLAIN_CACHE.labels(result="hit").inc(len(features) - len(missing))
+        EXPLAIN_CACHE.labels(result="miss").inc(len(missing))
+
+    if missing:
+        # Fancy indexing copies, so scaling the model input leaves features raw.
+        model_input = _model_input(features[missing], loaded)
+        computed = feature_contributions(loaded.model.get_booster(), model_input)
+        contributions[missing] = computed
+        if cache is not None:
+            for i, row in zip(missing, computed, strict=True):
+                cache.put(keys[i], row)
+    return contributions
+
+
+def _explain_matrix(features: np.ndarray, loaded: LoadedModel, top_k: int) -> list[Explanation]:
+    """Explain each raw input row by its ``top_k`` largest contributions."""
+    columns = _input_columns(_velocity_spec(loaded))
+    contributions = _contributions(features, loaded)
+    probabilities = margin_probabilities(contributions)
+    top = top_features(contributions, top_k)
+    return [
+        Explanation(
+            is_fraud=bool(probability > loaded.threshold),
+            fraud_probability=float(probability),
+            base_value=float(row_contributions[-1]),
+            contributions=[
+                FeatureContribution(
+                    feature=columns[j],
+                    value=float(row[j]),
+                    contribution=float(row_contributions[j]),
+                )
+                for j in row_top.tolist()
+            ],
+        )
+        for row, row_contributions, probability, row_top in zip(
+            features, contributions, probabilities, top, strict=True
+        )
+    ]
+
+
+def _explain_batch(
+    rows: list[dict[str, Any]], loaded: LoadedModel, top_k: int
+) -> tuple[list[BatchExplanationItem], int]:
+    """Validate rows individually and explain the valid ones in one call."""
+    items = [BatchExplanationItem(index=i) for i in range(len(rows))]
+    features, valid_rows, errors = _parse_rows(rows, loaded, record=False)
+    for i, error in errors.items():
+        items[i].error = error
+    if valid_rows:
+        explanations = _explain_matrix(features, loaded, top_k)
+        for row, explanation in zip(valid_rows, explanations, strict=True):
+            items[row].explanation = explanation
+    return items, len(valid_rows)
+
+
+def _explainable_model() -> LoadedModel:
+    """The active model, if it has the booster that explanations need."""
+    loaded = state.active
+    if loaded is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    if loaded.model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Explanations need the XGBoost booster, which the native engine does not load",
+        )
+    return loaded
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
-    return {"status": "healthy", "model_loaded": state.model is not None}
+    loaded = state.active
+    return {
+        "status": "healthy",
+        "model_loaded": loaded is not None,
+        "model_version": loaded.version if loaded is not None else None,
+        "decision_threshold": loaded.threshold if loaded is not None else None,
+        "shadow_model_version": state.shadow_version,
+    }
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1),
+) -> PlainTextResponse:
+    """Sample this worker's stacks for ``seconds`` and return collapsed stacks.
+
+    Disabled unless SERVING_PROFILING_ENABLED is set. The sampler runs on its
+    own thread, so requests served meanwhile show up in the profile; under the
+    pre-fork server it profiles whichever worker accepted the call.
+    """
+    if not state.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if state.profiling:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    state.profiling = True
+    try:
+        counts = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    finally:
+        state.profiling = False
+    return PlainTextResponse(collapsed(counts))
 
 
 @app.post("/predict", response_model=Prediction)
 async def predict(transaction: Transaction) -> Prediction:
     """Make fraud prediction."""
-    if state.model is None or state.feature_engineer is None:
+    loaded = state.active
+    if loaded is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
+    handler_started(model_version=loaded.version)
     with PREDICTION_LATENCY.time():
-        df = pd.DataFrame([transaction.model_dump()])
-        df_processed = state.feature_engineer.transform(df)
+        now = time.time()
+        with stage("features"):
+            row = np.array(_model_inputs(transaction, loaded, now, record=False), np.float32)
+            inputs = row.copy()  # scoring scales row in place
+        cache, key, probability = state.predictions, None, None
+        if cache is not None:
+            with stage("cache"):
+                key = row_key(loaded.version, inputs, state.prediction_cache_decimals)
+                probability = cache.get(key)
+            PREDICTION_CACHE.labels(result="miss" if probability is None else "hit").inc()
+        if probability is None:
+            with queued(*SCORING_STAGES):
+                if state.batcher is not None:
+                    probability = await state.batcher.submit(row, loaded)
+                else:
+                    probability = (await _score_in_pool(row.reshape(1, -1), loaded))[0]
+            if cache is not None:
+                cache.put(key, probability)
+        # Only a scored transaction joins the entity's history, so a shed or
+        # failed request that the client retries is counted once.
+        if loaded.velocity is not None:
+            loaded.velocity.update(transaction.entity_id, now, transaction.Amount)
 
-        probability = state.model.predict_proba(df_processed)[0, 1]
-        is_fraud = probability > 0.5
+        is_fraud = probability > loaded.threshold
+        if loaded.drift is not None:
+            with stage("drift"):
+                loaded.drift.observe(inputs[None], np.array([probability]))
+        if state.shadow is not None:
+            state.shadow.submit(inputs[None], np.array([probability]), np.array([is_fraud]))
 
-        PREDICTION_COUNT.labels(result="fraud" if is_fraud else "not_fraud").inc()
+        PREDICTION_COUNT.labels(
+            result="fraud" if is_fraud else "not_fraud", model_version=loaded.version
+        ).inc()
 
+    handler_finished()
     return Prediction(is_fraud=is_fraud, fraud_probability=float(probability))
+
+
+@app.post("/predict/batch", response_model=BatchPrediction)
+async def predict_batch(request: BatchRequest) -> BatchPrediction:
+    """Score many transactions in one vectorized call.
+
+    Rows that fail validation are reported in place and do not fail the batch.
+    """
+    loaded = state.active
+    if loaded is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    n_rows = len(request.transactions)
+    handler_started(model_version=loaded.version, rows=n_rows)
+    size_bucket = _size_bucket(n_rows)
+    BATCH_ROWS.labels(size_bucket=size_bucket).observe(n_rows)
+
+    with BATCH_LATENCY.labels(size_bucket=size_bucket).time():
+        assert state.pool is not None
+        with queued("validate_rows", *SCORING_STAGES):
+            items, n_scored = await state.pool.run(_score_batch, request.transactions, loaded)
+
+    handler_finished()
+    return BatchPrediction(predictions=items, n_scored=n_scored, n_failed=n_rows - n_scored)
+
+
+@app.post("/explain", response_model=Explanation)
+async def explain(transaction: Transaction, top_k: int = Query(DEFAULT_TOP_K, ge=1)) -> Explanation:
+    """Explain a transaction's score by its ``top_k`` largest SHAP contributions.
+
+    Runs on a separate worker pool from scoring and does not record the
+    transaction in the velocity store.
+    """
+    loaded = _explainable_model()
+    with EXPLAIN_LATENCY.labels(endpoint="explain").time():
+        features = np.array(
+            [_model_inputs(transaction, loaded, time.time(), record=False)], dtype=np.float32
+        )
+        assert state.explain_pool is not None
+        (explanation,) = await state.explain_pool.run(_explain_matrix, features, loaded, top_k)
+    return explanation
+
+
+@app.post("/explain/batch", response_model=BatchExplanation)
+async def explain_batch(
+    request: ExplainBatchRequest, top_k: int = Query(DEFAULT_TOP_K, ge=1)
+) -> BatchExplanation:
+    """Explain many transactions with one vectorized ``pred_contribs`` call.
+
+    Rows that fail validation are reported in place and do not fail the batch.
+    """
+    loaded = _explainable_model()
+    n_rows = len(request.transactions)
+    with EXPLAIN_LATENCY.labels(endpoint="explain_batch").time():
+        assert state.explain_pool is not None
+        items, n_explained = await state.explain_pool.run(
+            _explain_batch, request.transactions, loaded, top_k
+        )
+    return BatchExplanation(
+        explanations=items, n_explained=n_explained, n_failed=n_rows - n_explained
+    )
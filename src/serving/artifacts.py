@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.features.compiled import CompiledFeatureEngineer
+from src.features.velocity import VELOCITY_FILE
+from src.serving.drift import DRIFT_REFERENCE_FILE
+from src.serving.thresholds import OPERATING_POINTS_FILE
+from src.serving.tree_engine import TreeEnsemble
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+BOOSTER_FILE = "model.ubj"
+TREES_DIR = "trees"
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A loaded artifact bundle.
+
+    ``classifier`` is only loaded on request, so serving with the native
+    engine needs neither xgboost nor sklearn.
+    """
+
+    version: str
+    features: CompiledFeatureEngineer
+    trees: TreeEnsemble
+    classifier: Any = None
+
+
+def save_bundle(model: Any, feature_engineer: Any, output_dir: str | Path) -> str:
+    """Write a versioned bundle next to the pickles and return its version.
+
+    Layout: the booster in XGBoost's UBJSON format, its flattened node tables
+    (memory-mappable .npy files) and a JSON manifest holding the scaler
+    parameters and feature schema. The manifest is written last, atomically,
+    so readers never see a partial bundle. An operating-point table, drift
+    reference or velocity spec already in ``output_dir`` is part of the
+    version, so a new threshold is a new version.
+    """
+    path = Path(output_dir)
+    path.mkdir(parents=True, exist_ok=True)
+
+    model.save_model(path / BOOSTER_FILE)
+    booster = model.get_booster()
+    TreeEnsemble.from_booster(booster).save(path / TREES_DIR)
+    features = feature_engineer.compile(list(booster.feature_names))
+
+    digest = hashlib.sha256((path / BOOSTER_FILE).read_bytes())
+    digest.update(json.dumps(features.to_dict(), sort_keys=True).encode())
+    for extra in (OPERATING_POINTS_FILE, DRIFT_REFERENCE_FILE, VELOCITY_FILE):
+        if (path / extra).exists():
+            digest.update((path / extra).read_bytes())
+    version = digest.hexdigest()[:12]
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "booster_file": BOOSTER_FILE,
+        "trees_dir": TREES_DIR,
+        "features": features.to_dict(),
+    }
+    tmp_manifest = path / f".{MANIFEST_FILE}.tmp"
+    tmp_manifest.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_manifest, path / MANIFEST_FILE)
+    return version
+
+
+def read_manifest(model_dir: str | Path) -> dict:
+    """Read and check a bundle manifest."""
+    manifest = json.loads((Path(model_dir) / MANIFEST_FILE).read_text())
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format: {manifest.get('format_version')}")
+    return manifest
+
+
+def has_bundle(model_dir: str | Path) -> bool:
+    """Whether model_dir holds a bundle manifest."""
+    return (Path(model_dir) / MANIFEST_FILE).exists()
+
+
+def load_bundle(
+    model_dir: str | Path, load_classifier: bool = True, mmap: bool = True
+) -> ModelBundle:
+    """Load a bundle, memory-mapping node tables so forked workers share pages."""
+    path = Path(model_dir)
+    manifest = read_manifest(path)
+
+    classifier = None
+    if load_classifier:
+        import xgboost as xgb
+
+        classifier = xgb.XGBClassifier()
+        classifier.load_model(path / manifest["booster_file"])
+
+    return ModelBundle(
+        version=manifest["version"],
+        features=CompiledFeatureEngineer.from_dict(manifest["features"]),
+        trees=TreeEnsemble.load(path / manifest["trees_dir"], mmap_mode="r" if mmap else None),
+        classifier=classifier,
+    )
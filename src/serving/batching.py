@@ -0,0 +1,164 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from prometheus_client import Gauge, Histogram
+
+MICROBATCH_QUEUE_DEPTH = Gauge(
+    "fraud_microbatch_queue_depth",
+    "Requests waiting in the micro-batch queue",
+    multiprocess_mode="livesum",
+)
+MICROBATCH_SIZE = Histogram(
+    "fraud_microbatch_size",
+    "Requests scored per micro-batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+MICROBATCH_WAIT = Histogram(
+    "fraud_microbatch_queue_wait_seconds",
+    "Time a request spends queued before its micro-batch is scored",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+@dataclass
+class _Pending:
+    """A queued request awaiting its score."""
+
+    row: np.ndarray
+    context: Any
+    future: asyncio.Future
+    enqueued_at: float
+
+
+def _fail_stopped(pending: list[_Pending]) -> None:
+    """Fail queued requests that will never be scored."""
+    MICROBATCH_QUEUE_DEPTH.dec(len(pending))
+    for p in pending:
+        if not p.future.done():
+            p.future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row requests into vectorized scoring calls.
+
+    A batch is flushed when it reaches ``max_batch_size`` or when its oldest
+    request has waited ``max_wait_seconds``, whichever comes first. Flushes run
+    as separate tasks, so the next batch is collected while one is scored.
+
+    Each row is submitted with an opaque ``context`` (the model that must score
+    it); a flush calls ``score_fn(rows, context)`` once per distinct context,
+    so rows submitted against different models never share a call.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray, Any], Awaitable[np.ndarray]],
+        max_batch_size: int = 64,
+        max_wait_seconds: float = 0.002,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: asyncio.Queue[_Pending] | None = None
+        self._task: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the background batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and fail any requests still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+        remainder = []
+        while self._queue is not None and not self._queue.empty():
+            remainder.append(self._queue.get_nowait())
+        _fail_stopped(remainder)
+
+    async def submit(self, row: np.ndarray, context: Any = None) -> float:
+        """Queue one feature row and wait for its fraud probability under ``context``."""
+        if self._queue is None or self._task is None:
+            raise RuntimeError("Micro-batcher is not running")
+
+        loop = asyncio.get_running_loop()
+        pending = _Pending(
+            row=row, context=context, future=loop.create_future(), enqueued_at=loop.time()
+        )
+        self._queue.put_nowait(pending)
+        MICROBATCH_QUEUE_DEPTH.inc()
+        return await pending.future
+
+    async def _run(self) -> None:
+        """Collect requests into batches and score them until cancelled."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+
+        batch: list[_Pending] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = batch[0].enqueued_at + self.max_wait_seconds
+
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                MICROBATCH_QUEUE_DEPTH.dec(len(batch))
+                flush = asyncio.create_task(self._flush(batch, loop.time()))
+                self._flushes.add(flush)
+                flush.add_done_callback(self._flushes.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Rows already taken off the queue are in neither the queue nor a flush.
+            _fail_stopped(batch)
+            raise
+
+    async def _flush(self, batch: list[_Pending], now: float) -> None:
+        """Score a batch with one call per context and resolve each caller's future."""
+        MICROBATCH_SIZE.observe(len(batch))
+        for pending in batch:
+            MICROBATCH_WAIT.observe(now - pending.enqueued_at)
+
+        groups: dict[int, list[_Pending]] = {}
+        for pending in batch:
+            groups.setdefault(id(pending.context), []).append(pending)
+        for group in groups.values():
+            await self._score(group)
+
+    async def _score(self, batch: list[_Pending]) -> None:
+        """Score rows sharing one context and resolve their futures."""
+        try:
+            probabilities = await self.score_fn(np.stack([p.row for p in batch]), batch[0].context)
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, probability in zip(batch, probabilities, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(float(probability))
@@ -0,0 +1,188 @@
+"""Offline bulk scoring: score a transaction file with the serving artifacts.
+
+Streams a CSV file (or directory of CSV part files) or a Parquet file in
+chunks, scores the chunks on a pool of worker processes and writes one row
+per input row, in input order, to a Parquet file. Scores come from the same
+loader and scoring function as the API, honouring the same SERVING_* settings
+(engine, artifact format, decision threshold), so they are bit-identical to
+``/predict``.
+
+Run with: python -m src.serving.bulk_score INPUT OUTPUT [--workers N]
+    [--chunksize 100000] [--model-dir models] [--keep-columns Time ...]
+"""
+
+import argparse
+import dataclasses
+import multiprocessing
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.features.velocity import VelocitySpec
+from src.serving.config import ServingConfig, available_cpus
+from src.serving.reload import LoadedModel, directory_fingerprint
+
+DEFAULT_CHUNKSIZE = 100_000
+# Chunks queued per worker: keeps workers busy while bounding memory.
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Per-worker state set by _init_worker.
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(config: ServingConfig) -> None:
+    """Load the artifacts once per worker, as the API does at startup."""
+    from src.serving.app import _load_model
+
+    model_path = Path(config.model_dir)
+    version = directory_fingerprint(model_path) or "unknown"
+    _WORKER["loaded"] = _load_model(model_path, config, version)
+
+
+def _score_chunk(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fraud probability and decision for each row, exactly as ``/predict`` computes them."""
+    from src.serving.app import _score_matrix
+
+    loaded: LoadedModel = _WORKER["loaded"]
+    probabilities = _score_matrix(features, loaded)
+    return probabilities, probabilities > loaded.threshold
+
+
+def iter_input(path: str | Path, columns: list[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Chunks of ``columns`` from a Parquet file or CSV source, in file order."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        from src.data.preprocessing import iter_data
+
+        yield from iter_data(path, chunksize=chunksize, columns=columns)
+
+
+def _output_table(
+    chunk: pd.DataFrame,
+    keep_columns: list[str],
+    probabilities: np.ndarray,
+    is_fraud: np.ndarray,
+    metadata: dict[str, str],
+) -> pa.Table:
+    columns = {name: pa.array(chunk[name]) for name in keep_columns}
+    columns["fraud_probability"] = pa.array(probabilities)
+    columns["is_fraud"] = pa.array(is_fraud)
+    return pa.table(columns, metadata=metadata)
+
+
+def score_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    config: ServingConfig,
+    n_workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    keep_columns: list[str] | None = None,
+    progress_seconds: float = 5.0,
+) -> dict[str, float]:
+    """Score ``input_path`` into the Parquet file ``output_path`` and return run stats.
+
+    The parent only parses and writes; chunks are scored by ``n_workers``
+    spawned processes (default: one per available CPU), each loading the
+    model once and using its share of the CPUs as XGBoost threads. Results
+    are written in submission order, so output row i is input row i.
+
+    Models with velocity features are rejected: their inputs depend on each
+    entity's earlier transactions, which chunks scored in parallel do not see.
+    """
+    from src.serving.app import FEATURE_COLUMNS
+
+    if VelocitySpec.load(config.model_dir) is not None:
+        raise ValueError("Bulk scoring does not support models with velocity features")
+
+    keep_columns = keep_columns or []
+    n_workers = n_workers or available_cpus()
+    config = dataclasses.replace(config, server_workers=n_workers, inference_workers=1)
+    metadata = {"model_version": directory_fingerprint(Path(config.model_dir)) or "unknown"}
+    columns = list(dict.fromkeys(FEATURE_COLUMNS + keep_columns))
+
+    start = time.perf_counter()
+    last_report = start
+    n_rows = 0
+    pending: deque[tuple[Future, pd.DataFrame]] = deque()
+    writer: pq.ParquetWriter | None = None
+
+    def write_oldest() -> None:
+        nonlocal writer, n_rows, last_report
+        future, chunk = pending.popleft()
+        probabilities, is_fraud = future.result()
+        table = _output_table(chunk, keep_columns, probabilities, is_fraud, metadata)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, table.schema)
+        writer.write_table(table)
+        n_rows += len(chunk)
+        now = time.perf_counter()
+        if now - last_report >= progress_seconds:
+            print(f"scored {n_rows:,} rows ({n_rows / (now - start):,.0f} rows/s)", file=sys.stderr)
+            last_report = now
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config,),
+    ) as pool:
+        try:
+            for chunk in iter_input(input_path, columns, chunksize):
+                features = chunk[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+                pending.append((pool.submit(_score_chunk, features), chunk))
+                if len(pending) >= n_workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                    write_oldest()
+            while pending:
+                write_oldest()
+        finally:
+            if writer is not None:
+                writer.close()
+
+    seconds = time.perf_counter() - start
+    return {"rows": n_rows, "seconds": seconds, "rows_per_second": n_rows / seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="CSV file, directory of CSV parts, or .parquet file")
+    parser.add_argument("output", help="Parquet file to write")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--model-dir", default=None, help="defaults to SERVING_MODEL_DIR")
+    parser.add_argument(
+        "--keep-columns", nargs="*", default=[], help="input columns copied to the output"
+    )
+    args = parser.parse_args()
+
+    config = ServingConfig.from_env()
+    if args.model_dir is not None:
+        config = dataclasses.replace(config, model_dir=args.model_dir)
+
+    stats = score_file(
+        args.input,
+        args.output,
+        config,
+        n_workers=args.workers,
+        chunksize=args.chunksize,
+        keep_columns=args.keep_columns,
+    )
+    print(
+        f"scored {stats['rows']:,.0f} rows in {stats['seconds']:.1f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
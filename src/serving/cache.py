@@ -0,0 +1,86 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+
+def row_key(version: str, row: np.ndarray, decimals: int | None = None) -> tuple[str, bytes]:
+    """Cache key of one model input row: the model version and a hash of its bytes.
+
+    With ``decimals``, values are first quantised to integer multiples of
+    ``10**-decimals``, so rows that differ only beyond that precision share
+    a key (and -0.0 shares one with 0.0). The quantised values stay float64,
+    so infinities, NaN and values beyond the int64 range still get a key.
+    """
+    if decimals is not None:
+        row = np.rint(row.astype(np.float64) * 10.0**decimals) + 0.0  # + 0.0 turns -0.0 into 0.0
+    return version, hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe map holding at most ``max_entries`` values.
+
+    Adding to a full cache evicts the least recently used entry. With
+    ``ttl_seconds``, entries also expire that long after they were added;
+    expired entries are dropped when next looked up. ``on_evict`` is called
+    with a reason ("capacity", "expired" or "cleared") and the number of
+    entries dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        on_evict: Callable[[str, int], None] | None = None,
+    ):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive, got {ttl_seconds}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evicted(self, reason: str, count: int) -> None:
+        if self.on_evict is not None and count:
+            self.on_evict(reason, count)
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self._evicted("expired", 1)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        expires = math.inf if self.ttl_seconds is None else time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                _, (_, oldest_expires) = self._entries.popitem(last=False)
+                self._evicted("expired" if oldest_expires <= time.monotonic() else "capacity", 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._evicted("cleared", count)
@@ -0,0 +1,255 @@
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+MODEL_ENGINES = ("xgboost", "native")
+RELOAD_SOURCES = ("none", "directory", "mlflow")
+ARTIFACT_FORMATS = ("auto", "pickle", "bundle")
+
+
+def cgroup_cpu_limit(root: Path = Path("/sys/fs/cgroup")) -> float | None:
+    """CPU quota of this container in CPUs, or None if it is unlimited.
+
+    Reads cgroup v2 ``cpu.max`` and falls back to the v1 CFS quota files.
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        v1_quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        v1_period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return None if v1_quota <= 0 else v1_quota / v1_period
+
+
+def available_cpus() -> int:
+    """Whole CPUs this process may use: its affinity, capped by the cgroup quota.
+
+    A fractional quota is rounded down (to at least 1) so that workers sized
+    from it are not throttled by the CFS scheduler.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.floor(limit)))
+    return cpus
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment."""
+    value = os.environ.get(name)
+    return default if value is None else int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment."""
+    value = os.environ.get(name)
+    return default if value is None else float(value)
+
+
+def _env_optional_float(name: str, default: float | None) -> float | None:
+    """Read an optional float from the environment; empty means unset."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return float(value) if value.strip() else None
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    """Serving settings, read from SERVING_* environment variables."""
+
+    microbatch_enabled: bool = False
+    microbatch_max_wait_ms: float = 2.0
+    microbatch_max_size: int = 64
+    model_engine: str = "xgboost"
+    inference_workers: int = 2
+    inference_queue_size: int = 64
+    model_dir: str = "models"
+    artifact_format: str = "auto"
+    reload_source: str = "none"
+    reload_interval_seconds: float = 30.0
+    reload_model_alias: str = "champion"
+    warmup_enabled: bool = True
+    server_workers: int = 0
+    decision_threshold: float | None = None
+    target_precision: float | None = None
+    slow_request_ms: float | None = 100.0
+    slow_request_sample_rate: float = 1.0
+    profiling_enabled: bool = False
+    drift_enabled: bool = True
+    drift_interval_seconds: float = 60.0
+    drift_half_life_seconds: float = 3600.0
+    velocity_max_entities: int = 1_000_000
+    explain_workers: int = 1
+    explain_queue_size: int = 8
+    explain_cache_size: int = 10_000
+    prediction_cache_size: int = 0
+    prediction_cache_ttl_seconds: float | None = 300.0
+    prediction_cache_decimals: int = 6
+    shadow_source: str = "none"
+    shadow_model_dir: str = "models-shadow"
+    shadow_model_alias: str = "challenger"
+    shadow_sample_rate: float = 1.0
+    shadow_max_batch_size: int = 256
+    shadow_queue_size: int = 10_000
+    shadow_interval_ms: float = 50.0
+
+    def __post_init__(self) -> None:
+        if self.model_engine not in MODEL_ENGINES:
+            raise ValueError(
+                f"model_engine must be one of {MODEL_ENGINES}, got {self.model_engine}"
+            )
+        if self.artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(
+                f"artifact_format must be one of {ARTIFACT_FORMATS}, got {self.artifact_format}"
+            )
+        for name in ("decision_threshold", "target_precision"):
+            value = getattr(self, name)
+            if value is not None and not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        if self.slow_request_ms is not None and self.slow_request_ms < 0:
+            raise ValueError(f"slow_request_ms must be >= 0, got {self.slow_request_ms}")
+        if not 0 <= self.slow_request_sample_rate <= 1:
+            raise ValueError(
+                f"slow_request_sample_rate must be between 0 and 1, "
+                f"got {self.slow_request_sample_rate}"
+            )
+        for name in ("drift_interval_seconds", "drift_half_life_seconds"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive, got {getattr(self, name)}")
+        if self.velocity_max_entities < 1:
+            raise ValueError(
+                f"velocity_max_entities must be at least 1, got {self.velocity_max_entities}"
+            )
+        if self.explain_workers < 1:
+            raise ValueError(f"explain_workers must be at least 1, got {self.explain_workers}")
+        for name in (
+            "explain_queue_size",
+            "explain_cache_size",
+            "prediction_cache_size",
+            "prediction_cache_decimals",
+        ):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must be >= 0, got {getattr(self, name)}")
+        if self.prediction_cache_ttl_seconds is not None and self.prediction_cache_ttl_seconds <= 0:
+            raise ValueError(
+                f"prediction_cache_ttl_seconds must be positive, "
+                f"got {self.prediction_cache_ttl_seconds}"
+            )
+        if self.shadow_source not in RELOAD_SOURCES:
+            raise ValueError(
+                f"shadow_source must be one of {RELOAD_SOURCES}, got {self.shadow_source}"
+            )
+        if not 0 <= self.shadow_sample_rate <= 1:
+            raise ValueError(
+                f"shadow_sample_rate must be between 0 and 1, got {self.shadow_sample_rate}"
+            )
+        for name in ("shadow_max_batch_size", "shadow_queue_size", "shadow_interval_ms"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive, got {getattr(self, name)}")
+        if self.server_workers < 0:
+            raise ValueError(f"server_workers must be >= 0, got {self.server_workers}")
+        if self.reload_source not in RELOAD_SOURCES:
+            raise ValueError(
+                f"reload_source must be one of {RELOAD_SOURCES}, got {self.reload_source}"
+            )
+
+    @property
+    def server_processes(self) -> int:
+        """Processes forked by the pre-fork server; 0 sizes them from the CPU quota."""
+        return self.server_workers or available_cpus()
+
+    @property
+    def drift_decay(self) -> float:
+        """Factor applied to the live drift counts after each publish."""
+        return 0.5 ** (self.drift_interval_seconds / self.drift_half_life_seconds)
+
+    @property
+    def threads_per_worker(self) -> int:
+        """XGBoost nthread for each inference worker, so workers share the CPUs.
+
+        The pre-fork server exports its process count as SERVING_SERVER_WORKERS,
+        so threads are divided across processes too; under a plain uvicorn
+        process (``server_workers`` unset) the process has the CPUs to itself.
+        """
+        processes = max(1, self.server_workers)
+        return max(1, available_cpus() // (processes * self.inference_workers))
+
+    @classmethod
+    def from_env(cls) -> "ServingConfig":
+        """Build config from the environment, falling back to defaults."""
+        return cls(
+            microbatch_enabled=_env_bool("SERVING_MICROBATCH_ENABLED", cls.microbatch_enabled),
+            microbatch_max_wait_ms=_env_float(
+                "SERVING_MICROBATCH_MAX_WAIT_MS", cls.microbatch_max_wait_ms
+            ),
+            microbatch_max_size=_env_int("SERVING_MICROBATCH_MAX_SIZE", cls.microbatch_max_size),
+            model_engine=os.environ.get("SERVING_MODEL_ENGINE", cls.model_engine),
+            inference_workers=_env_int("SERVING_INFERENCE_WORKERS", cls.inference_workers),
+            inference_queue_size=_env_int("SERVING_INFERENCE_QUEUE_SIZE", cls.inference_queue_size),
+            model_dir=os.environ.get("SERVING_MODEL_DIR", cls.model_dir),
+            artifact_format=os.environ.get("SERVING_ARTIFACT_FORMAT", cls.artifact_format),
+            reload_source=os.environ.get("SERVING_RELOAD_SOURCE", cls.reload_source),
+            reload_interval_seconds=_env_float(
+                "SERVING_RELOAD_INTERVAL_SECONDS", cls.reload_interval_seconds
+            ),
+            reload_model_alias=os.environ.get("SERVING_RELOAD_MODEL_ALIAS", cls.reload_model_alias),
+            warmup_enabled=_env_bool("SERVING_WARMUP_ENABLED", cls.warmup_enabled),
+            server_workers=_env_int("SERVING_SERVER_WORKERS", cls.server_workers),
+            decision_threshold=_env_optional_float(
+                "SERVING_DECISION_THRESHOLD", cls.decision_threshold
+            ),
+            target_precision=_env_optional_float("SERVING_TARGET_PRECISION", cls.target_precision),
+            slow_request_ms=_env_optional_float("SERVING_SLOW_REQUEST_MS", cls.slow_request_ms),
+            slow_request_sample_rate=_env_float(
+                "SERVING_SLOW_REQUEST_SAMPLE_RATE", cls.slow_request_sample_rate
+            ),
+            profiling_enabled=_env_bool("SERVING_PROFILING_ENABLED", cls.profiling_enabled),
+            drift_enabled=_env_bool("SERVING_DRIFT_ENABLED", cls.drift_enabled),
+            drift_interval_seconds=_env_float(
+                "SERVING_DRIFT_INTERVAL_SECONDS", cls.drift_interval_seconds
+            ),
+            drift_half_life_seconds=_env_float(
+                "SERVING_DRIFT_HALF_LIFE_SECONDS", cls.drift_half_life_seconds
+            ),
+            velocity_max_entities=_env_int(
+                "SERVING_VELOCITY_MAX_ENTITIES", cls.velocity_max_entities
+            ),
+            explain_workers=_env_int("SERVING_EXPLAIN_WORKERS", cls.explain_workers),
+            explain_queue_size=_env_int("SERVING_EXPLAIN_QUEUE_SIZE", cls.explain_queue_size),
+            explain_cache_size=_env_int("SERVING_EXPLAIN_CACHE_SIZE", cls.explain_cache_size),
+            prediction_cache_size=_env_int(
+                "SERVING_PREDICTION_CACHE_SIZE", cls.prediction_cache_size
+            ),
+            prediction_cache_ttl_seconds=_env_optional_float(
+                "SERVING_PREDICTION_CACHE_TTL_SECONDS", cls.prediction_cache_ttl_seconds
+            ),
+            prediction_cache_decimals=_env_int(
+                "SERVING_PREDICTION_CACHE_DECIMALS", cls.prediction_cache_decimals
+            ),
+            shadow_source=os.environ.get("SERVING_SHADOW_SOURCE", cls.shadow_source),
+            shadow_model_dir=os.environ.get("SERVING_SHADOW_MODEL_DIR", cls.shadow_model_dir),
+            shadow_model_alias=os.environ.get("SERVING_SHADOW_MODEL_ALIAS", cls.shadow_model_alias),
+            shadow_sample_rate=_env_float("SERVING_SHADOW_SAMPLE_RATE", cls.shadow_sample_rate),
+            shadow_max_batch_size=_env_int(
+                "SERVING_SHADOW_MAX_BATCH_SIZE", cls.shadow_max_batch_size
+            ),
+            shadow_queue_size=_env_int("SERVING_SHADOW_QUEUE_SIZE", cls.shadow_queue_size),
+            shadow_interval_ms=_env_float("SERVING_SHADOW_INTERVAL_MS", cls.shadow_interval_ms),
+        )
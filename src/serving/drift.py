@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from prometheus_client import Gauge
+
+DRIFT_REFERENCE_FILE = "drift_reference.json"
+SCORE_COLUMN = "fraud_probability"
+DEFAULT_BINS = 20
+# Live requests needed (after decay) before drift is published.
+MIN_SAMPLES = 100
+# Probability floor for empty bins, which would make PSI infinite.
+PSI_EPSILON = 1e-4
+# Rows binned per comparison block, bounding the temporary boolean array.
+BIN_BLOCK_ROWS = 4096
+
+DRIFT_PSI = Gauge(
+    "fraud_drift_psi",
+    "Population stability index of live inputs against the training reference",
+    ["feature"],
+    multiprocess_mode="livemax",
+)
+DRIFT_KS = Gauge(
+    "fraud_drift_ks",
+    "Kolmogorov-Smirnov distance of live inputs from the training reference, at bin resolution",
+    ["feature"],
+    multiprocess_mode="livemax",
+)
+DRIFT_SAMPLES = Gauge(
+    "fraud_drift_samples",
+    "Decayed count of scored rows behind the drift gauges",
+    multiprocess_mode="livesum",
+)
+
+
+class Histograms:
+    """Fixed-bin counts of every column of a matrix, in constant memory.
+
+    ``edges`` holds each column's interior bin edges, padded with +inf when a
+    column has fewer distinct edges; a value lands in the bin after the last
+    edge it reaches.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros((len(self.edges), self.edges.shape[1] + 1))
+
+    @classmethod
+    def from_sample(cls, sample: np.ndarray, n_bins: int = DEFAULT_BINS) -> "Histograms":
+        """Empty histograms whose bins are the quantiles of ``sample``'s columns."""
+        levels = np.linspace(0, 1, n_bins + 1)[1:-1]
+        quantiles = np.quantile(np.asarray(sample, dtype=np.float64), levels, axis=0).T
+        edges = np.full_like(quantiles, np.inf)
+        for column, values in enumerate(quantiles):
+            distinct = np.unique(values)
+            edges[column, : len(distinct)] = distinct
+        return cls(edges)
+
+    def bin_counts(self, values: np.ndarray) -> np.ndarray:
+        """Counts of a (n_rows, n_columns) block, shaped like ``counts``."""
+        n_columns, n_bins = self.counts.shape
+        offsets = np.arange(n_columns) * n_bins
+        counts = np.zeros(n_columns * n_bins)
+        for start in range(0, len(values), BIN_BLOCK_ROWS):
+            block = values[start : start + BIN_BLOCK_ROWS, :, None]
+            bins = (block >= self.edges).sum(axis=2) + offsets
+            counts += np.bincount(bins.ravel(), minlength=len(counts))
+        return counts.reshape(n_columns, n_bins)
+
+    def update(self, values: np.ndarray) -> None:
+        self.counts += self.bin_counts(values)
+
+
+def build_reference(
+    feature_names: list[str], features: np.ndarray, scores: np.ndarray, n_bins: int = DEFAULT_BINS
+) -> "DriftReference":
+    """Reference from in-memory training features and test scores, binned at their quantiles."""
+    feature_histograms = Histograms.from_sample(features, n_bins)
+    feature_histograms.update(features)
+    score_histograms = Histograms.from_sample(scores[:, None], n_bins)
+    score_histograms.update(scores[:, None])
+    return DriftReference.from_histograms(feature_names, feature_histograms, score_histograms)
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Population stability index of each row of ``actual`` against ``expected``."""
+    p = np.maximum(actual / actual.sum(axis=1, keepdims=True), PSI_EPSILON)
+    q = np.maximum(expected / expected.sum(axis=1, keepdims=True), PSI_EPSILON)
+    return ((p - q) * np.log(p / q)).sum(axis=1)
+
+
+def ks(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Largest gap between the binned CDFs of each row."""
+    p = np.cumsum(actual, axis=1) / actual.sum(axis=1, keepdims=True)
+    q = np.cumsum(expected, axis=1) / expected.sum(axis=1, keepdims=True)
+    return np.abs(p - q).max(axis=1)
+
+
+@dataclass(frozen=True)
+class DriftReference:
+    """Training-time binned distribution of each model input and of the score.
+
+    The last of ``names`` is ``fraud_probability``, binned on the test split;
+    the features are binned on the training split.
+    """
+
+    names: list[str]
+    edges: np.ndarray
+    proportions: np.ndarray
+
+    @classmethod
+    def from_histograms(
+        cls, feature_names: list[str], features: Histograms, scores: Histograms
+    ) -> "DriftReference":
+        counts = np.vstack([features.counts, scores.counts])
+        return cls(
+            names=[*feature_names, SCORE_COLUMN],
+            edges=np.vstack([features.edges, scores.edges]),
+            proportions=counts / counts.sum(axis=1, keepdims=True),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "names": self.names,
+            # JSON has no infinity; padding edges are stored as null.
+            "edges": [[None if np.isinf(e) else e for e in row] for row in self.edges.tolist()],
+            "proportions": self.proportions.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftReference":
+        edges = np.array(
+            [[np.inf if e is None else e for e in row] for row in data["edges"]], dtype=np.float64
+        )
+        return cls(names=data["names"], edges=edges, proportions=np.asarray(data["proportions"]))
+
+    def save(self, model_dir: str | Path) -> Path:
+        path = Path(model_dir) / DRIFT_REFERENCE_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, model_dir: str | Path) -> "DriftReference | None":
+        """Read the reference stored with a model, or None for models trained without one."""
+        path = Path(model_dir) / DRIFT_REFERENCE_FILE
+        if not path.exists():
+            return None
+        return cls.from_dict(json.loads(path.read_text()))
+
+
+class DriftMonitor:
+    """Live histograms of one model's inputs and scores, compared to its reference.
+
+    ``observe`` is the only call on the request path: it bins the rows and
+    adds them to fixed-size counts under a lock. ``publish`` computes PSI and
+    KS from the counts on a schedule, then decays them so that the gauges
+    follow recent traffic with the given half-life.
+    """
+
+    def __init__(self, reference: DriftReference, decay: float = 1.0):
+        self.reference = reference
+        self.decay = decay
+        self._live = Histograms(reference.edges)
+        self._lock = threading.Lock()
+
+    def observe(self, features: np.ndarray, scores: np.ndarray) -> None:
+        """Add raw (n_rows, n_features) inputs and their (n_rows,) scores."""
+        values = np.column_stack([features, scores])
+        counts = self._live.bin_counts(values)
+        with self._lock:
+            self._live.counts += counts
+
+    def publish(self) -> dict[str, tuple[float, float]]:
+        """Set the drift gauges and return ``{name: (psi, ks)}``; empty below MIN_SAMPLES."""
+        with self._lock:
+            live = self._live.counts.copy()
+            self._live.counts *= self.decay
+        samples = float(live[-1].sum())
+        DRIFT_SAMPLES.set(samples)
+        if samples < MIN_SAMPLES:
+            return {}
+        expected = self.reference.proportions
+        results = dict(
+            zip(
+                self.reference.names,
+                zip(psi(expected, live).tolist(), ks(expected, live).tolist(), strict=True),
+                strict=True,
+            )
+        )
+        for name, (psi_value, ks_value) in results.items():
+            DRIFT_PSI.labels(feature=name).set(psi_value)
+            DRIFT_KS.labels(feature=name).set(ks_value)
+        return results
@@ -0,0 +1,182 @@
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterator, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from prometheus_client import Histogram
+
+logger = structlog.get_logger(__name__)
+
+# Sub-millisecond resolution: single-row stages take tens of microseconds.
+STAGE_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+STAGE_LATENCY = Histogram(
+    "fraud_request_stage_seconds",
+    "Time spent in each stage of a scoring request",
+    ["endpoint", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+# Paths timed by StageTimingMiddleware, and their endpoint label.
+INSTRUMENTED_PATHS = {"/predict": "predict", "/predict/batch": "predict_batch"}
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+@dataclass
+class RequestTimings:
+    """Stage durations of one request (or one micro-batch), in seconds."""
+
+    endpoint: str
+    started: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+    fields: dict[str, Any] = field(default_factory=dict)
+    handler_done: float | None = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        STAGE_LATENCY.labels(endpoint=self.endpoint, stage=stage).observe(seconds)
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def request_timings(endpoint: str) -> Iterator[RequestTimings]:
+    """Collect stages timed in this context, including worker threads it runs on."""
+    timings = RequestTimings(endpoint)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as stage ``name`` of the current request; a no-op outside one."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, time.perf_counter() - start)
+
+
+@contextmanager
+def queued(*work_stages: str) -> Iterator[None]:
+    """Time the block as stage ``queue``, less the ``work_stages`` recorded inside it.
+
+    Wraps an await on the inference pool or micro-batcher: what is left after
+    the scoring work itself is time spent waiting for a worker or a batch.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    worked_before = sum(timings.stages.get(name, 0.0) for name in work_stages)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        worked = sum(timings.stages.get(name, 0.0) for name in work_stages) - worked_before
+        timings.record("queue", max(0.0, time.perf_counter() - start - worked))
+
+
+def handler_started(**fields: Any) -> None:
+    """Mark the endpoint body starting: everything before it was parsing and validation."""
+    timings = _current.get()
+    if timings is not None:
+        timings.record("validate", time.perf_counter() - timings.started)
+        timings.fields.update(fields)
+
+
+def handler_finished() -> None:
+    """Mark the endpoint body returning: everything after it is response serialization."""
+    timings = _current.get()
+    if timings is not None:
+        timings.handler_done = time.perf_counter()
+
+
+@dataclass
+class SlowRequestLog:
+    """Log a sample of the requests slower than ``threshold_seconds``.
+
+    Configured by the app at startup; ``threshold_seconds`` of None disables it.
+    """
+
+    threshold_seconds: float | None = None
+    sample_rate: float = 1.0
+
+    def observe(self, timings: RequestTimings, status: int, seconds: float) -> None:
+        if self.threshold_seconds is None or seconds < self.threshold_seconds:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        logger.warning(
+            "slow_request",
+            endpoint=timings.endpoint,
+            status=status,
+            total_ms=round(seconds * 1e3, 3),
+            **timings.fields,
+            **{f"{name}_ms": round(value * 1e3, 3) for name, value in timings.stages.items()},
+        )
+
+
+class StageTimingMiddleware:
+    """ASGI middleware timing the scoring endpoints stage by stage.
+
+    Starts a ``RequestTimings`` when a scoring request arrives, records the
+    serialization stage when the response starts, and hands the finished
+    timings to ``slow_log``. Other paths pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, slow_log: SlowRequestLog):
+        self.app = app
+        self.slow_log = slow_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        endpoint = INSTRUMENTED_PATHS.get(scope["path"]) if scope["type"] == "http" else None
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings.handler_done is not None:
+                    timings.record("serialize", time.perf_counter() - timings.handler_done)
+            await send(message)
+
+        with request_timings(endpoint) as timings:
+            try:
+                await self.app(scope, receive, send_timed)
+            finally:
+                self.slow_log.observe(timings, status, time.perf_counter() - timings.started)
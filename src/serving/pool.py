@@ -0,0 +1,104 @@
+import asyncio
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+T = TypeVar("T")
+
+POOL_WORKERS = Gauge(
+    "fraud_inference_pool_workers",
+    "Worker threads in the inference pool",
+    multiprocess_mode="livesum",
+)
+POOL_UTILIZATION = Gauge(
+    "fraud_inference_pool_utilization",
+    "Fraction of inference workers busy",
+    multiprocess_mode="liveall",
+)
+POOL_QUEUED = Gauge(
+    "fraud_inference_pool_queued",
+    "Inference calls waiting for a free worker",
+    multiprocess_mode="livesum",
+)
+POOL_REJECTED = Counter(
+    "fraud_inference_pool_rejected_total",
+    "Inference calls rejected because the pool queue was full",
+)
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the inference pool has no room for another call."""
+
+
+class InferencePool:
+    """Bounded thread pool that keeps blocking inference off the event loop.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a worker; anything beyond that is rejected immediately so the
+    caller can shed load instead of queueing without bound. The pool gauges
+    describe the main inference pool; side pools pass ``report_metrics=False``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        thread_name_prefix: str = "inference",
+        report_metrics: bool = True,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be non-negative")
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.report_metrics = report_metrics
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=thread_name_prefix)
+        self._in_flight = 0
+        if report_metrics:
+            POOL_WORKERS.set(max_workers)
+        self._update_gauges()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on a worker, or raise PoolSaturatedError if full.
+
+        Must be called from the event loop thread, which owns the counters.
+        ``fn`` runs in a copy of the caller's context, as with asyncio.to_thread.
+        A cancelled caller stops waiting, but the slot stays taken until the
+        worker has actually finished with ``fn``.
+        """
+        if self._in_flight >= self.capacity:
+            if self.report_metrics:
+                POOL_REJECTED.inc()
+            raise PoolSaturatedError("Inference queue is full")
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, fn, *args)
+        self._in_flight += 1
+        self._update_gauges()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._update_gauges()
+
+    def shutdown(self) -> None:
+        """Wait for running calls and release the worker threads."""
+        self._executor.shutdown(wait=True)
+        if not self.report_metrics:
+            return
+        POOL_WORKERS.set(0)
+        POOL_UTILIZATION.set(0)
+        POOL_QUEUED.set(0)
+
+    def _update_gauges(self) -> None:
+        if not self.report_metrics:
+            return
+        busy = min(self._in_flight, self.max_workers)
+        POOL_UTILIZATION.set(busy / self.max_workers)
+        POOL_QUEUED.set(self._in_flight - busy)
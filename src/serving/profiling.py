@@ -0,0 +1,44 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_INTERVAL_SECONDS = 0.005
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_INTERVAL_SECONDS) -> Counter[str]:
+    """Sample the Python stack of every other thread every ``interval`` seconds.
+
+    Returns how often each stack was seen, keyed root-first as
+    ``thread;outer;...;inner``. Reading ``sys._current_frames`` holds the GIL
+    only briefly, so the worker keeps serving while it is profiled.
+    """
+    own = threading.get_ident()
+    counts: Counter[str] = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            current: FrameType | None = frame
+            while current is not None:
+                stack.append(_frame_label(current))
+                current = current.f_back
+            counts[";".join([names.get(ident, str(ident)), *reversed(stack)])] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapsed(counts: Counter[str]) -> str:
+    """Collapsed-stack text, one ``stack count`` line per stack, as read by flamegraph tools."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
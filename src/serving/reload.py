@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+from prometheus_client import Counter
+
+from src.features.compiled import CompiledFeatureEngineer
+from src.features.velocity import VelocityStore
+from src.serving.artifacts import has_bundle, read_manifest
+from src.serving.drift import DriftMonitor
+from src.serving.thresholds import DEFAULT_THRESHOLD
+from src.serving.tree_engine import TreeEnsemble
+
+logger = structlog.get_logger(__name__)
+
+REGISTERED_MODEL_NAME = "fraud-detection-model"
+ARTIFACT_FILES = ("model.pkl", "feature_engineer.pkl")
+
+MODEL_RELOADS = Counter(
+    "fraud_model_reloads_total",
+    "Background model reload attempts",
+    ["outcome"],
+)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """An artifact pair ready to serve; swapped as a single reference."""
+
+    model: Any
+    feature_engineer: Any
+    version: str
+    compiled_features: CompiledFeatureEngineer | None = None
+    tree_engine: TreeEnsemble | None = None
+    threshold: float = DEFAULT_THRESHOLD
+    drift: DriftMonitor | None = None
+    velocity: VelocityStore | None = None
+
+
+def canary_batch(n_features: int, n_rows: int = 32) -> np.ndarray:
+    """Deterministic synthetic rows used to warm and sanity-check a model."""
+    rng = np.random.default_rng(0)
+    batch = rng.normal(size=(n_rows, n_features)).astype(np.float32)
+    batch[:, -1] = rng.lognormal(3, 1.5, size=n_rows)  # Amount
+    return batch
+
+
+def validate_canary(score_fn: Callable[[np.ndarray], np.ndarray], n_features: int) -> None:
+    """Score the canary batch and raise if the output is not usable probabilities."""
+    batch = canary_batch(n_features)
+    scores = np.asarray(score_fn(batch))
+    if scores.shape != (len(batch),):
+        raise ValueError(f"Canary produced shape {scores.shape}, expected ({len(batch)},)")
+    if not np.all(np.isfinite(scores)) or np.any((scores < 0) | (scores > 1)):
+        raise ValueError("Canary produced scores outside [0, 1]")
+
+
+def directory_fingerprint(model_dir: Path) -> str | None:
+    """Version id of the artifacts in model_dir.
+
+    Bundles carry a content-derived version in their manifest; for bare
+    pickles it is derived from file sizes and modification times.
+    """
+    if has_bundle(model_dir):
+        return read_manifest(model_dir)["version"]
+
+    digest = hashlib.sha256()
+    for name in ARTIFACT_FILES:
+        path = model_dir / name
+        if not path.exists():
+            return None
+        stat = path.stat()
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def mlflow_alias_version(alias: str) -> str:
+    """Registry version currently behind ``alias``; raises if the alias is unset."""
+    from mlflow import MlflowClient
+
+    version = MlflowClient().get_model_version_by_alias(REGISTERED_MODEL_NAME, alias)
+    return f"mlflow-{version.version}"
+
+
+def download_mlflow_artifacts(version: str) -> Path:
+    """Download the artifacts logged with a registry version to a temp dir."""
+    import mlflow
+    from mlflow import MlflowClient
+
+    number = version.removeprefix("mlflow-")
+    run_id = MlflowClient().get_model_version(REGISTERED_MODEL_NAME, number).run_id
+    target = Path(tempfile.mkdtemp(prefix=f"{REGISTERED_MODEL_NAME}-{number}-"))
+    mlflow.artifacts.download_artifacts(run_id=run_id, dst_path=str(target))
+    return target
+
+
+class ModelWatcher:
+    """Poll for a new model version, load and validate it off-loop, then swap.
+
+    ``fingerprint_fn`` returns the current source version (or None if it is
+    not available), ``load_fn`` loads that version, ``validate_fn`` raises if
+    it is unfit to serve and ``swap_fn`` installs it. A failed reload keeps
+    the current model and that version is not retried.
+    """
+
+    def __init__(
+        self,
+        fingerprint_fn: Callable[[], str | None],
+        load_fn: Callable[[str], LoadedModel],
+        validate_fn: Callable[[LoadedModel], None],
+        swap_fn: Callable[[LoadedModel], None],
+        current_version: str,
+        interval_seconds: float = 30.0,
+    ):
+        self.fingerprint_fn = fingerprint_fn
+        self.load_fn = load_fn
+        self.validate_fn = validate_fn
+        self.swap_fn = swap_fn
+        self.current_version = current_version
+        self.interval_seconds = interval_seconds
+        self._failed_version: str | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Start polling in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check(self) -> bool:
+        """Reload if the source version changed; return True if a swap happened."""
+        try:
+            version = await asyncio.to_thread(self.fingerprint_fn)
+        except Exception:
+            logger.exception("model_version_check_failed")
+            return False
+        if version is None or version in (self.current_version, self._failed_version):
+            return False
+
+        try:
+            loaded = await asyncio.to_thread(self.load_fn, version)
+            await asyncio.to_thread(self.validate_fn, loaded)
+        except Exception:
+            self._failed_version = version
+            MODEL_RELOADS.labels(outcome="failed").inc()
+            logger.exception("model_reload_failed", version=version)
+            return False
+
+        if await asyncio.to_thread(self.fingerprint_fn) != version:
+            # Artifacts changed while loading (e.g. a half-written pair); retry next poll.
+            return False
+
+        previous = self.current_version
+        self.swap_fn(loaded)
+        self.current_version = version
+        MODEL_RELOADS.labels(outcome="success").inc()
+        logger.info("model_reloaded", version=version, previous_version=previous)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.check()
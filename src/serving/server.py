@@ -0,0 +1,158 @@
+"""Pre-fork serving entry point: load the model once, fork workers that share it.
+
+The parent loads the artifacts, binds the listening socket and forks
+SERVING_SERVER_WORKERS uvicorn workers (by default one per CPU of the
+container's cgroup quota). Workers inherit the loaded model copy-on-write
+instead of each loading their own, and report metrics through
+prometheus_client's multiprocess mode so /metrics covers the whole pod. The
+parent restarts workers that die and forwards SIGTERM/SIGINT for a graceful
+shutdown.
+
+Run with: python -m src.serving.server [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import tempfile
+import time
+from pathlib import Path
+from types import FrameType
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# A worker exiting sooner than this after its fork is treated as crash-looping
+# and restarted with a delay rather than immediately.
+MIN_WORKER_UPTIME_SECONDS = 1.0
+
+
+def prepare_multiprocess_metrics() -> Path:
+    """Point prometheus_client at a clean multiprocess directory.
+
+    Must run before prometheus_client is imported. Metric files left by a
+    previous run in the same directory are removed.
+    """
+    path = Path(
+        os.environ.get("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="fraud-metrics-")
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+    return path
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket shared by all workers."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Fork and supervise uvicorn workers serving one shared app."""
+
+    def __init__(self, sock: socket.socket, n_workers: int):
+        self.sock = sock
+        self.n_workers = n_workers
+        self._workers: dict[int, float] = {}  # pid -> fork time
+        self._stopping = False
+
+    def serve(self) -> None:
+        """Fork the workers and supervise them until stopped."""
+        from prometheus_client import multiprocess
+
+        # Objects allocated so far (the model included) are never touched by
+        # the cyclic GC in the workers, so its passes don't dirty shared pages.
+        gc.freeze()
+        # The parent never serves; drop its (idle) gauges so live-mode
+        # aggregations only cover workers.
+        multiprocess.mark_process_dead(os.getpid())
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.n_workers):
+            self._spawn()
+        logger.info("server_started", workers=self.n_workers, pids=sorted(self._workers))
+
+        while self._workers:
+            pid, status = os.wait()
+            started = self._workers.pop(pid, None)
+            if started is None:
+                continue
+            multiprocess.mark_process_dead(pid)
+            if self._stopping:
+                continue
+            logger.warning("worker_exited", pid=pid, exit_status=os.waitstatus_to_exitcode(status))
+            if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+                time.sleep(MIN_WORKER_UPTIME_SECONDS)
+            if not self._stopping:
+                self._spawn()
+
+        self.sock.close()
+        logger.info("server_stopped")
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                _run_worker(self.sock)
+                exit_code = 0
+            except BaseException:
+                logger.exception("worker_failed")
+            finally:
+                os._exit(exit_code)
+        self._workers[pid] = time.monotonic()
+
+    def _stop(self, signum: int, frame: FrameType | None) -> None:
+        self._stopping = True
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def _run_worker(sock: socket.socket) -> None:
+    """Serve the app on the inherited socket until uvicorn is told to exit."""
+    import uvicorn
+
+    from src.serving.app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on", access_log=False))
+    server.run(sockets=[sock])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="0.0.0.0")  # nosec B104 - container entry point
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    prepare_multiprocess_metrics()
+
+    from src.serving.app import preload_model
+    from src.serving.config import ServingConfig
+
+    config = ServingConfig.from_env()
+    n_workers = config.server_processes
+    # Workers read their config again; pinning the count lets each one size
+    # its XGBoost threads to its share of the CPUs.
+    os.environ["SERVING_SERVER_WORKERS"] = str(n_workers)
+    loaded = preload_model(ServingConfig.from_env())
+    logger.info("model_preloaded", model_version=loaded.version)
+
+    PreforkServer(bind_socket(args.host, args.port), n_workers).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import structlog
+from prometheus_client import Counter, Histogram
+
+logger = structlog.get_logger(__name__)
+
+SHADOW_DECISIONS = Counter(
+    "fraud_shadow_decisions_total",
+    "Rows scored by both models, by each model's decision",
+    ["primary", "shadow"],
+)
+SHADOW_SCORE_DELTA = Histogram(
+    "fraud_shadow_score_delta",
+    "Shadow minus primary fraud probability of each row",
+    buckets=(-0.5, -0.1, -0.05, -0.01, -0.001, 0.001, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+SHADOW_BATCH_LATENCY = Histogram(
+    "fraud_shadow_batch_seconds",
+    "Time the shadow model takes to score one background batch",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+SHADOW_DROPPED = Counter(
+    "fraud_shadow_dropped_total",
+    "Rows not shadow-scored because the queue was full or the input schema differs",
+    ["reason"],
+)
+
+
+def _decision(is_fraud: bool) -> str:
+    return "fraud" if is_fraud else "not_fraud"
+
+
+class ShadowScorer:
+    """Scores a sample of live traffic with a second model, off the request path.
+
+    Request handlers call ``submit`` with the raw inputs and the primary
+    model's scores; it samples, appends to a bounded queue and returns. A
+    background task drains the queue every ``interval_seconds`` in batches
+    of about ``max_batch_size`` rows (whole submitted chunks), scores them
+    on its own thread, and records only aggregates: decision agreement,
+    score deltas and the shadow model's batch latency. Rows arriving while
+    ``max_queue`` rows wait are dropped rather than queued without bound.
+
+    ``submit`` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], np.ndarray],
+        n_features: int,
+        threshold: float,
+        sample_rate: float = 1.0,
+        max_batch_size: int = 256,
+        max_queue: int = 10_000,
+        interval_seconds: float = 0.05,
+    ):
+        self.score_fn = score_fn
+        self.n_features = n_features
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.max_batch_size = max_batch_size
+        self.max_queue = max_queue
+        self.interval_seconds = interval_seconds
+        self._queue: deque[tuple[np.ndarray, np.ndarray, np.ndarray]] = deque()
+        self._queued_rows = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="shadow")
+        self._task: asyncio.Task | None = None
+
+    def submit(self, features: np.ndarray, scores: np.ndarray, decisions: np.ndarray) -> None:
+        """Queue a sample of scored rows: raw (n_rows, n_features) inputs and primary results."""
+        if features.shape[1] != self.n_features:
+            SHADOW_DROPPED.labels(reason="schema").inc(len(features))
+            return
+        if self.sample_rate < 1.0:
+            if len(features) == 1:
+                if random.random() >= self.sample_rate:
+                    return
+            else:
+                keep = np.random.random(len(features)) < self.sample_rate
+                features, scores, decisions = features[keep], scores[keep], decisions[keep]
+        n_rows = len(features)
+        if not n_rows:
+            return
+        with self._lock:
+            if self._queued_rows + n_rows > self.max_queue:
+                SHADOW_DROPPED.labels(reason="queue_full").inc(n_rows)
+                return
+            self._queued_rows += n_rows
+            self._queue.append((features, scores, decisions))
+
+    def _take_batch(self) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """Pop queued chunks until the batch holds at least ``max_batch_size`` rows."""
+        chunks = []
+        n_rows = 0
+        with self._lock:
+            while self._queue and n_rows < self.max_batch_size:
+                chunk = self._queue.popleft()
+                chunks.append(chunk)
+                n_rows += len(chunk[0])
+            self._queued_rows -= n_rows
+        if not chunks:
+            return None
+        features, scores, decisions = zip(*chunks, strict=True)
+        return np.concatenate(features), np.concatenate(scores), np.concatenate(decisions)
+
+    def _score(self, features: np.ndarray, scores: np.ndarray, decisions: np.ndarray) -> None:
+        start = time.perf_counter()
+        shadow_scores = np.asarray(self.score_fn(features))
+        SHADOW_BATCH_LATENCY.observe(time.perf_counter() - start)
+
+        shadow_decisions = shadow_scores > self.threshold
+        for primary in (False, True):
+            for shadow in (False, True):
+                n = int(np.count_nonzero((decisions == primary) & (shadow_decisions == shadow)))
+                if n:
+                    SHADOW_DECISIONS.labels(
+                        primary=_decision(primary), shadow=_decision(shadow)
+                    ).inc(n)
+        for delta in (shadow_scores - scores).tolist():
+            SHADOW_SCORE_DELTA.observe(delta)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                await asyncio.sleep(self.interval_seconds)
+                continue
+            try:
+                await loop.run_in_executor(self._executor, self._score, *batch)
+            except Exception:
+                logger.exception("shadow_scoring_failed", rows=len(batch[0]))
+
+    async def start(self) -> None:
+        """Start the background scoring loop on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task; rows still queued are discarded."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
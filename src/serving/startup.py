@@ -0,0 +1,74 @@
+"""Cold-start profile of the serving app.
+
+Run with: python -m src.serving.startup
+to start the app once (imports, model load and warmup, without serving) and
+print how long each phase took and which heavy dependencies were imported.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Dependencies the scoring hot path should not need; reported so regressions
+# in lazy importing are visible.
+HEAVY_MODULES = ("pandas", "sklearn", "xgboost", "mlflow")
+
+
+class StartupProfile:
+    """Wall-clock seconds spent in each cold-start phase."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a phase measured elsewhere."""
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> dict[str, float]:
+        """Phase durations in seconds, plus their total."""
+        return {**self.phases, "total": sum(self.phases.values())}
+
+
+def imported_heavy_modules() -> list[str]:
+    """Heavy dependencies currently imported in this process."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+async def _start_once() -> dict:
+    from src.serving.app import STARTUP, app
+
+    async with app.router.lifespan_context(app):
+        pass
+    return {"phases": STARTUP.report(), "heavy_modules": imported_heavy_modules()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(_start_once())
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    for name, seconds in result["phases"].items():
+        print(f"{name:>8} {seconds * 1e3:>9.1f} ms")
+    print(f"heavy modules imported: {', '.join(result['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
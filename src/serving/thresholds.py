@@ -0,0 +1,134 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.training.evaluate import Evaluation
+
+OPERATING_POINTS_FILE = "operating_points.json"
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MAX_POINTS = 201
+
+
+@dataclass(frozen=True)
+class OperatingPoints:
+    """Test-set precision, recall and expected cost at sampled decision thresholds.
+
+    Rows run from the highest threshold (flag nothing) to the lowest; a row's
+    ``threshold`` flags scores strictly above it. ``chosen`` is the threshold
+    with the lowest expected cost under ``fn_cost`` and ``fp_cost``.
+    """
+
+    threshold: np.ndarray
+    precision: np.ndarray
+    recall: np.ndarray
+    expected_cost: np.ndarray
+    chosen: float
+    fn_cost: float
+    fp_cost: float
+
+    def for_precision(self, target: float) -> float:
+        """Lowest threshold, so highest recall, whose precision reaches ``target``.
+
+        Falls back to the most precise point when none does.
+        """
+        reaching = np.flatnonzero(self.precision >= target)
+        if not len(reaching):
+            return float(self.threshold[np.argmax(self.precision)])
+        return float(self.threshold[reaching[-1]])
+
+    def to_dict(self) -> dict:
+        return {
+            "chosen": self.chosen,
+            "fn_cost": self.fn_cost,
+            "fp_cost": self.fp_cost,
+            "points": {
+                name: getattr(self, name).tolist()
+                for name in ("threshold", "precision", "recall", "expected_cost")
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OperatingPoints":
+        points = {name: np.asarray(values) for name, values in data["points"].items()}
+        return cls(
+            chosen=data["chosen"], fn_cost=data["fn_cost"], fp_cost=data["fp_cost"], **points
+        )
+
+    def save(self, model_dir: str | Path) -> Path:
+        path = Path(model_dir) / OPERATING_POINTS_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2))
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, model_dir: str | Path) -> "OperatingPoints | None":
+        """Read the table stored with a model, or None for models trained without one."""
+        path = Path(model_dir) / OPERATING_POINTS_FILE
+        if not path.exists():
+            return None
+        return cls.from_dict(json.loads(path.read_text()))
+
+
+def build_operating_points(
+    evaluation: "Evaluation",
+    fn_cost: float,
+    fp_cost: float,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> OperatingPoints:
+    """Cost curve over every distinct test score, kept to a compact table.
+
+    The expected cost of flagging everything above a threshold is
+    ``fp_cost * false positives + fn_cost * missed frauds``. It is computed
+    at every distinct score from the evaluation's cumulative counts, then
+    sampled at ``max_points`` evenly spaced recall levels (plus the
+    cheapest point) for the stored table.
+    """
+    scores = evaluation.thresholds.astype(np.float64)
+    # Flagging scores >= scores[i] is flagging those above the midpoint to the
+    # next distinct score, which keeps thresholds clear of float rounding.
+    cutoffs = np.concatenate([[1.0], (scores + np.append(scores[1:], 0.0)) / 2])
+    tp = np.concatenate([[0], evaluation.tp])
+    fp = np.concatenate([[0], evaluation.fp])
+    flagged = tp + fp
+    precision = np.divide(tp, flagged, out=np.ones(len(tp)), where=flagged > 0)
+    recall = tp / max(evaluation.n_pos, 1)
+    cost = fp_cost * fp + fn_cost * (evaluation.n_pos - tp)
+    best = int(np.argmin(cost))
+
+    levels = np.ceil(np.linspace(0, 1, max_points) * evaluation.n_pos)
+    rows = np.union1d(np.searchsorted(tp, levels), [best])
+    return OperatingPoints(
+        threshold=cutoffs[rows],
+        precision=precision[rows],
+        recall=recall[rows],
+        expected_cost=cost[rows].astype(np.float64),
+        chosen=float(cutoffs[best]),
+        fn_cost=fn_cost,
+        fp_cost=fp_cost,
+    )
+
+
+def resolve_threshold(
+    points: OperatingPoints | None,
+    threshold: float | None = None,
+    target_precision: float | None = None,
+) -> float:
+    """Decision threshold to serve a model with.
+
+    In order of precedence: the point reaching ``target_precision``, an
+    explicit ``threshold``, the model's cost-optimal threshold, then 0.5.
+    Resolved once per model load, so requests only compare against a float.
+    """
+    if target_precision is not None and points is not None:
+        return points.for_precision(target_precision)
+    if threshold is not None:
+        return threshold
+    if points is not None:
+        return points.chosen
+    return DEFAULT_THRESHOLD
@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+_ARRAYS = ("feature", "threshold", "left", "right", "value", "default_left", "roots")
+_META_FILE = "ensemble.json"
+# Rows walked together; keeps the (rows, trees) temporaries cache-resident.
+_CHUNK_ROWS = 512
+
+
+def _parse_base_score(raw: str) -> float:
+    """Parse base_score, stored as "5E-1" or "[5E-1]" depending on XGBoost version."""
+    return float(raw.strip("[]"))
+
+
+class TreeEnsemble:
+    """Array-backed binary:logistic tree ensemble evaluated with NumPy.
+
+    All trees are flattened into shared node tables. Leaves point to
+    themselves, so every row can walk every tree for ``max_depth`` steps
+    at once and end on its leaf. Index tables are stored as intp so NumPy
+    can gather with them without converting on every step.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        default_left: np.ndarray,
+        roots: np.ndarray,
+        base_margin: float,
+        max_depth: int,
+        n_features: int,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.roots = roots
+        self.base_margin = base_margin
+        self.max_depth = max_depth
+        self.n_features = n_features
+        split = left != np.arange(len(left))
+        # XGBoost allocates sibling pairs, so right == left + 1 and a single
+        # gather plus a comparison selects the child.
+        self._right_is_next = bool(np.all(right[split] == left[split] + 1))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_booster(
+        cls, booster: Any, iteration_range: tuple[int, int] | None = None
+    ) -> "TreeEnsemble":
+        """Flatten an xgboost.Booster trained with binary:logistic into node tables."""
+        learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported objective: {objective}")
+
+        trees = learner["gradient_booster"]["model"]["trees"]
+        if iteration_range is not None:
+            trees = trees[iteration_range[0] : iteration_range[1]]
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        n_features = int(learner["learner_model_param"]["num_feature"])
+
+        tables: dict[str, list] = {name: [] for name in _ARRAYS}
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            n_nodes = len(left)
+            is_leaf = left == -1
+            own = np.arange(n_nodes, dtype=np.int32)
+
+            tables["feature"].append(np.where(is_leaf, 0, tree["split_indices"]))
+            tables["threshold"].append(np.where(is_leaf, np.inf, tree["split_conditions"]))
+            tables["left"].append(np.where(is_leaf, own, left) + offset)
+            tables["right"].append(np.where(is_leaf, own, right) + offset)
+            tables["value"].append(np.where(is_leaf, tree["split_conditions"], 0.0))
+            tables["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+            tables["roots"].append([offset])
+
+            depth = np.zeros(n_nodes, dtype=np.int32)
+            for node in range(n_nodes):
+                if not is_leaf[node]:
+                    depth[left[node]] = depth[right[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(tables["feature"]).astype(np.intp),
+            threshold=np.concatenate(tables["threshold"]).astype(np.float32),
+            left=np.concatenate(tables["left"]).astype(np.intp),
+            right=np.concatenate(tables["right"]).astype(np.intp),
+            value=np.concatenate(tables["value"]).astype(np.float32),
+            default_left=np.concatenate(tables["default_left"]),
+            roots=np.concatenate(tables["roots"]).astype(np.intp),
+            base_margin=float(np.log(base_score / (1.0 - base_score))),
+            max_depth=max_depth,
+            n_features=n_features,
+        )
+
+    def save(self, directory: str | Path) -> None:
+        """Write node tables as .npy files plus a JSON header."""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        meta = {
+            "base_margin": self.base_margin,
+            "max_depth": self.max_depth,
+            "n_features": self.n_features,
+        }
+        (path / _META_FILE).write_text(json.dumps(meta))
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, mmap_mode: Literal["r", "c"] | None = None
+    ) -> "TreeEnsemble":
+        """Load node tables written by save, optionally memory-mapped."""
+        path = Path(directory)
+        meta = json.loads((path / _META_FILE).read_text())
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in _ARRAYS}
+        return cls(**arrays, **meta)
+
+    def predict_margin(self, x: np.ndarray) -> np.ndarray:
+        """Raw margin for each row of a (n_rows, n_features) matrix."""
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if x.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {x.shape[1]}")
+
+        x = np.ascontiguousarray(x)
+        margin = np.empty(x.shape[0], dtype=np.float64)
+        for start in range(0, x.shape[0], _CHUNK_ROWS):
+            leaves = self._walk(x[start : start + _CHUNK_ROWS])
+            margin[start : start + _CHUNK_ROWS] = self.value[leaves].sum(axis=1, dtype=np.float64)
+        return margin + self.base_margin
+
+    def _walk(self, x: np.ndarray) -> np.ndarray:
+        """Leaf index reached in every tree for each row of a C-contiguous chunk."""
+        flat = x.ravel()
+        row_offsets = np.arange(0, x.size, self.n_features, dtype=np.intp).reshape(-1, 1)
+        # The fast path relies on leaves' +inf threshold never being reached,
+        # so rows with NaN or +-inf take the general path.
+        fast = self._right_is_next and np.isfinite(flat).all()
+
+        nodes = np.broadcast_to(self.roots, (x.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            values = flat[row_offsets + self.feature[nodes]]
+            threshold = self.threshold[nodes]
+            if fast:
+                nodes = self.left[nodes] + (values >= threshold)
+            else:
+                go_left = np.where(np.isnan(values), self.default_left[nodes], values < threshold)
+                nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """Class probabilities with the same (n_rows, 2) layout as XGBClassifier."""
+        positive = 1.0 / (1.0 + np.exp(-self.predict_margin(x)))
+        return np.column_stack([1.0 - positive, positive])
@@ -1,44 +1,318 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TypeAlias
+
+import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
+
+from src.serving.config import available_cpus
+
+CLASS_NAMES = ("Not Fraud", "Fraud")
+BOOTSTRAP_METRICS = ("precision", "recall", "f1", "roc_auc", "pr_auc")
+# Replicate x segment counts drawn per block: bounds a worker's memory and is
+# the unit of work spread across the pool.
+BOOTSTRAP_BLOCK_ELEMENTS = 4_000_000
+
+# Per-worker state set by _init_bootstrap_worker.
+_WORKER: dict[str, np.ndarray] = {}
+
+ArrayLike: TypeAlias = pd.Series | np.ndarray
+
+
+def _labels(y_true: ArrayLike) -> np.ndarray:
+    labels = np.asarray(y_true)
+    if labels.dtype != bool and not np.isin(labels, (0, 1)).all():
+        raise ValueError("Labels must be binary 0/1")
+    return labels.astype(bool, copy=False)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, 0 where the denominator is 0 (as sklearn reports it)."""
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _trapezoid(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Trapezoidal integral of y over x along the last axis (np.trapezoid needs NumPy 2)."""
+    return np.sum(np.diff(x) * (y[..., 1:] + y[..., :-1]) / 2, axis=-1)
+
+
+def confusion_counts(y_true: ArrayLike, y_pred: ArrayLike) -> np.ndarray:
+    """2x2 confusion matrix (rows actual, columns predicted) in one bincount."""
+    cells = 2 * _labels(y_true).astype(np.intp) + _labels(y_pred)
+    return np.bincount(cells, minlength=4).reshape(2, 2)
+
+
+def _threshold_metrics(cm: np.ndarray) -> dict[str, float]:
+    (tn, fp), (fn, tp) = cm
+    precision = float(_safe_divide(np.array(tp), np.array(tp + fp)))
+    recall = float(_safe_divide(np.array(tp), np.array(tp + fn)))
+    return {
+        "accuracy": float((tp + tn) / cm.sum()),
+        "precision": precision,
+        "recall": recall,
+        "f1": float(_safe_divide(np.array(2 * tp), np.array(2 * tp + fp + fn))),
+    }
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """Classification metrics of a set of scores at every threshold.
+
+    ``thresholds`` are the distinct scores in descending order; ``tp[i]`` and
+    ``fp[i]`` count the positives and negatives scoring at least
+    ``thresholds[i]``. Every threshold metric is a lookup into these
+    cumulative counts.
+    """
+
+    thresholds: np.ndarray
+    tp: np.ndarray
+    fp: np.ndarray
+    n_pos: int
+    n_neg: int
+
+    @property
+    def precision(self) -> np.ndarray:
+        return _safe_divide(self.tp, self.tp + self.fp)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return _safe_divide(self.tp, np.array(self.n_pos))
+
+    @property
+    def f1(self) -> np.ndarray:
+        return _safe_divide(2 * self.tp, self.tp + self.fp + self.n_pos)
+
+    @property
+    def fpr(self) -> np.ndarray:
+        return _safe_divide(self.fp, np.array(self.n_neg))
+
+    @property
+    def roc_auc(self) -> float:
+        """Area under the ROC curve, by the trapezoidal rule over every threshold."""
+        if self.n_pos == 0 or self.n_neg == 0:
+            raise ValueError("ROC AUC is undefined when y_true holds a single class")
+        tpr = np.concatenate([[0.0], self.recall])
+        fpr = np.concatenate([[0.0], self.fpr])
+        return float(_trapezoid(tpr, fpr))
+
+    @property
+    def pr_auc(self) -> float:
+        """Area under the precision-recall curve, as step-wise average precision."""
+        recall = np.concatenate([[0.0], self.recall])
+        return float(np.sum(np.diff(recall) * self.precision))
+
+    def flagged_groups(self, threshold: float) -> int:
+        """Number of distinct scores strictly above ``threshold``.
+
+        Compared in the scores' dtype, as ``scores > threshold`` would.
+        """
+        cutoff = np.asarray(threshold, dtype=self.thresholds.dtype)
+        return int(np.searchsorted(-self.thresholds, -cutoff, side="left"))
+
+    def confusion_matrix(self, threshold: float = 0.5) -> np.ndarray:
+        """2x2 confusion matrix when scores above ``threshold`` are predicted positive."""
+        k = self.flagged_groups(threshold)
+        tp = int(self.tp[k - 1]) if k else 0
+        fp = int(self.fp[k - 1]) if k else 0
+        return np.array([[self.n_neg - fp, fp], [self.n_pos - tp, tp]])
+
+    def metrics(self, threshold: float = 0.5) -> dict[str, float]:
+        """Accuracy, precision, recall and F1 at ``threshold``, plus ROC-AUC and PR-AUC."""
+        return {
+            **_threshold_metrics(self.confusion_matrix(threshold)),
+            "roc_auc": self.roc_auc,
+            "pr_auc": self.pr_auc,
+        }
+
+
+def evaluate_scores(y_true: ArrayLike, y_score: ArrayLike) -> Evaluation:
+    """Sort the scores once and accumulate the counts behind every metric."""
+    labels = _labels(y_true)
+    scores = np.asarray(y_score)
+    if labels.shape != scores.shape or labels.ndim != 1 or not len(labels):
+        raise ValueError(
+            f"Expected two equal, non-empty 1-d arrays, got {labels.shape} and {scores.shape}"
+        )
+
+    order = np.argsort(scores)[::-1]
+    sorted_scores = scores[order]
+    tp = np.cumsum(labels[order], dtype=np.int64)
+    # Last position of each run of equal scores: tied rows flip together.
+    ends = np.append(np.flatnonzero(np.diff(sorted_scores)), len(scores) - 1)
+    tp = tp[ends]
+    return Evaluation(
+        thresholds=sorted_scores[ends],
+        tp=tp,
+        fp=ends + 1 - tp,
+        n_pos=int(labels.sum()),
+        n_neg=int(len(labels) - labels.sum()),
+    )
+
+
+def _bootstrap_cells(evaluation: Evaluation, k: int) -> tuple[np.ndarray, int]:
+    """Row counts of the coarsest score segments every bootstrap metric can see.
+
+    Groups of tied scores holding a positive stay separate, as does the
+    threshold boundary ``k``; runs of negative-only groups between them merge,
+    since no metric depends on how negatives are ordered among themselves.
+    Returns the positive counts then the negative counts of each segment, and
+    the number of segments above the threshold.
+    """
+    positives = np.diff(evaluation.tp, prepend=0)
+    negatives = np.diff(evaluation.fp, prepend=0)
+    has_positive = positives > 0
+    starts = has_positive | np.concatenate([[True], has_positive[:-1]])
+    if k < len(starts):
+        starts[k] = True
+    segment = np.cumsum(starts) - 1
+    n_segments = int(segment[-1]) + 1
+    cells = np.concatenate(
+        [
+            np.bincount(segment, positives, minlength=n_segments),
+            np.bincount(segment, negatives, minlength=n_segments),
+        ]
+    )
+    k_segments = int(segment[k]) if k < len(segment) else n_segments
+    return cells, k_segments
+
+
+def _init_bootstrap_worker(cells: np.ndarray, k: int) -> None:
+    _WORKER["cells"] = cells
+    _WORKER["k"] = np.array(k)
+
+
+def _bootstrap_block(seed: np.random.SeedSequence, n_replicates: int) -> np.ndarray:
+    """Metrics of ``n_replicates`` resamples, one row each (columns: BOOTSTRAP_METRICS).
+
+    Resampling n rows with replacement puts a multinomial number of them in
+    each segment, so a whole block is drawn with one multinomial call rather
+    than n indices per replicate, and scored with cumulative sums along the
+    segments.
+    """
+    cells = _WORKER["cells"]
+    k = int(_WORKER["k"])
+    n_groups = len(cells) // 2
+    n = int(cells.sum())
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(n, cells / n, size=n_replicates)
+
+    tp = np.cumsum(counts[:, :n_groups], axis=1)
+    fp = np.cumsum(counts[:, n_groups:], axis=1)
+    n_pos = tp[:, -1]
+    n_neg = fp[:, -1]
+    tp_k = tp[:, k - 1] if k else np.zeros(n_replicates, dtype=np.int64)
+    fp_k = fp[:, k - 1] if k else np.zeros(n_replicates, dtype=np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpr = np.concatenate([np.zeros((n_replicates, 1)), tp / n_pos[:, None]], axis=1)
+        fpr = np.concatenate([np.zeros((n_replicates, 1)), fp / n_neg[:, None]], axis=1)
+        precision_curve = tp / (tp + fp)
+        roc_auc = _trapezoid(tpr, fpr)
+        pr_auc = np.sum(np.diff(tpr, axis=1) * precision_curve, axis=1)
+    return np.column_stack(
+        [
+            _safe_divide(tp_k, tp_k + fp_k),
+            _safe_divide(tp_k, n_pos),
+            _safe_divide(2 * tp_k, tp_k + fp_k + n_pos),
+            roc_auc,
+            pr_auc,
+        ]
+    )
+
+
+def bootstrap_intervals(
+    evaluation: Evaluation,
+    threshold: float = 0.5,
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    n_workers: int | None = None,
+    random_state: int = 42,
+) -> dict[str, tuple[float, float]]:
+    """Percentile bootstrap confidence intervals for BOOTSTRAP_METRICS.
+
+    Test rows are resampled with replacement ``n_replicates`` times and each
+    metric's ``(1 - confidence) / 2`` and ``(1 + confidence) / 2`` quantiles
+    are returned. Replicates are drawn in blocks from independent seeds, so
+    results do not depend on ``n_workers``. Blocks are scored on a process
+    pool, one worker per available CPU by default. Workers are spawned, since
+    forking after XGBoost has started OpenMP threads is unsafe. Replicates
+    with a single class have no ROC-AUC and are skipped for it.
+    """
+    cells, k = _bootstrap_cells(evaluation, evaluation.flagged_groups(threshold))
+
+    block = max(1, BOOTSTRAP_BLOCK_ELEMENTS // len(cells))
+    sizes = [min(block, n_replicates - start) for start in range(0, n_replicates, block)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    n_workers = min(n_workers or available_cpus(), len(sizes))
+
+    if n_workers == 1:
+        _init_bootstrap_worker(cells, k)
+        blocks = [_bootstrap_block(seed, size) for seed, size in zip(seeds, sizes, strict=True)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_bootstrap_worker,
+            initargs=(cells, k),
+        ) as pool:
+            blocks = list(pool.map(_bootstrap_block, seeds, sizes))
+
+    replicates = np.concatenate(blocks)
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+    return {name: (float(low[i]), float(high[i])) for i, name in enumerate(BOOTSTRAP_METRICS)}
 
 
 def evaluate_model(
-    y_true: pd.Series,
-    y_pred: pd.Series,
-    y_pred_proba: pd.Series | None = None,
+    y_true: ArrayLike,
+    y_pred: ArrayLike,
+    y_pred_proba: ArrayLike | None = None,
 ) -> dict:
-    """Calculate evaluation metrics."""
-    metrics = {
-        "accuracy": accuracy_score(y_true, y_pred),
-        "precision": precision_score(y_true, y_pred),
-        "recall": recall_score(y_true, y_pred),
-        "f1": f1_score(y_true, y_pred),
-    }
+    """Calculate evaluation metrics.
+
+    Threshold metrics come from ``y_pred``; with scores, ROC-AUC and PR-AUC
+    are added. Use evaluate_scores directly to get metrics at any threshold.
+    """
+    metrics = _threshold_metrics(confusion_counts(y_true, y_pred))
 
     if y_pred_proba is not None:
-        metrics["roc_auc"] = roc_auc_score(y_true, y_pred_proba)
+        evaluation = evaluate_scores(y_true, y_pred_proba)
+        metrics["roc_auc"] = evaluation.roc_auc
+        metrics["pr_auc"] = evaluation.pr_auc
 
     return metrics
 
 
-def get_classification_report(y_true: pd.Series, y_pred: pd.Series) -> str:
-    """Generate classification report."""
-    return classification_report(y_true, y_pred, target_names=["Not Fraud", "Fraud"])
+def get_classification_report(y_true: ArrayLike, y_pred: ArrayLike) -> str:
+    """Generate classification report, laid out like sklearn's."""
+    cm = confusion_counts(y_true, y_pred)
+    support = cm.sum(axis=1)
+    precision = _safe_divide(np.diag(cm), cm.sum(axis=0))
+    recall = _safe_divide(np.diag(cm), support)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    total = int(support.sum())
+
+    width = max(len(name) for name in (*CLASS_NAMES, "weighted avg"))
+    lines = [f"{'':>{width}}  {'precision':>9} {'recall':>9} {'f1-score':>9} {'support':>9}", ""]
+    for i, name in enumerate(CLASS_NAMES):
+        lines.append(
+            f"{name:>{width}}  {precision[i]:>9.2f} {recall[i]:>9.2f} {f1[i]:>9.2f} {support[i]:>9}"
+        )
+    lines.append("")
+    lines.append(f"{'accuracy':>{width}}  {'':>9} {'':>9} {np.trace(cm) / total:>9.2f} {total:>9}")
+    for name, weights in [("macro avg", None), ("weighted avg", support)]:
+        p, r, f = (np.average(values, weights=weights) for values in (precision, recall, f1))
+        lines.append(f"{name:>{width}}  {p:>9.2f} {r:>9.2f} {f:>9.2f} {total:>9}")
+    return "\n".join(lines) + "\n"
 
 
-def get_confusion_matrix(y_true: pd.Series, y_pred: pd.Series) -> pd.DataFrame:
+def get_confusion_matrix(y_true: ArrayLike, y_pred: ArrayLike) -> pd.DataFrame:
     """Generate confusion matrix as DataFrame."""
-    cm = confusion_matrix(y_true, y_pred)
     return pd.DataFrame(
-        cm,
-        index=["Actual Not Fraud", "Actual Fraud"],
-        columns=["Predicted Not Fraud", "Predicted Fraud"],
+        confusion_counts(y_true, y_pred),
+        index=[f"Actual {name}" for name in CLASS_NAMES],
+        columns=[f"Predicted {name}" for name in CLASS_NAMES],
     )
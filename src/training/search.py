@@ -0,0 +1,196 @@
+import itertools
+import math
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.data.preprocessing import split_data
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.config import available_cpus
+from src.training.evaluate import evaluate_scores
+
+STRATEGIES = ("grid", "random", "halving")
+
+# Per-worker state set by _init_worker: the shared matrices, quantised once.
+_WORKER: dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class TrialResult:
+    """Outcome of training one candidate for a given number of rounds."""
+
+    trial: int
+    params: dict
+    num_boost_round: int
+    metrics: dict
+    seconds: float
+
+
+def _sample(spec: Any, rng: np.random.Generator) -> Any:
+    """Draw one value: a list is a set of choices, a dict a numeric range."""
+    if isinstance(spec, list):
+        return spec[rng.integers(len(spec))]
+    low, high = spec["low"], spec["high"]
+    if spec.get("log"):
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    return int(round(value)) if isinstance(low, int) and isinstance(high, int) else float(value)
+
+
+def candidates(search_config: dict, random_state: int = 42) -> list[dict]:
+    """Parameter sets to try, from the search ``space`` and ``strategy``."""
+    strategy = search_config["strategy"]
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy}")
+    space = search_config["space"]
+
+    if strategy == "grid":
+        if not all(isinstance(values, list) for values in space.values()):
+            raise ValueError("grid search needs a list of values for every parameter")
+        return [
+            dict(zip(space, values, strict=True)) for values in itertools.product(*space.values())
+        ]
+
+    rng = np.random.default_rng(random_state)
+    return [
+        {name: _sample(spec, rng) for name, spec in space.items()}
+        for _ in range(search_config["n_trials"])
+    ]
+
+
+def prepare_search_data(config: dict, df: pd.DataFrame, output_dir: Path) -> list[str]:
+    """Write the search's fit/validation matrices as .npy files for the workers.
+
+    Candidates are scored on a validation split of the training set, so the
+    test set stays untouched for the final model. Returns the feature names.
+    """
+    target = config["features"]["target"]
+    x_train, _, y_train, _ = split_data(
+        df,
+        target_col=target,
+        test_size=config["data"]["test_size"],
+        random_state=config["data"]["random_state"],
+    )
+    x_fit, x_valid, y_fit, y_valid = split_data(
+        pd.concat([x_train, y_train], axis=1),
+        target_col=target,
+        test_size=config["search"].get("validation_size", 0.2),
+        random_state=config["data"]["random_state"],
+    )
+    feature_engineer = FeatureEngineer(scale_features=["Amount"])
+    x_fit = feature_engineer.fit_transform(x_fit)
+    x_valid = feature_engineer.transform(x_valid)
+
+    for name, values in [
+        ("x_fit", x_fit),
+        ("y_fit", y_fit),
+        ("x_valid", x_valid),
+        ("y_valid", y_valid),
+    ]:
+        np.save(output_dir / f"{name}.npy", values.to_numpy(dtype=np.float32))
+    return list(x_fit.columns)
+
+
+def _init_worker(data_dir: str, feature_names: list[str], nthread: int) -> None:
+    """Map the shared matrices and quantise them once for every trial in this worker."""
+    path = Path(data_dir)
+    x_fit = np.load(path / "x_fit.npy", mmap_mode="r")
+    x_valid = np.load(path / "x_valid.npy", mmap_mode="r")
+    _WORKER["nthread"] = nthread
+    _WORKER["dfit"] = xgb.QuantileDMatrix(
+        x_fit, label=np.load(path / "y_fit.npy"), feature_names=feature_names, nthread=nthread
+    )
+    _WORKER["x_valid"] = x_valid
+    _WORKER["y_valid"] = np.load(path / "y_valid.npy")
+
+
+def _run_trial(trial: int, base_params: dict, params: dict, num_boost_round: int) -> TrialResult:
+    start = time.perf_counter()
+    train_params = {
+        "objective": "binary:logistic",
+        "tree_method": "hist",
+        **base_params,
+        **params,
+        "nthread": _WORKER["nthread"],
+    }
+    booster = xgb.train(train_params, _WORKER["dfit"], num_boost_round=num_boost_round)
+    proba = booster.inplace_predict(_WORKER["x_valid"])
+    return TrialResult(
+        trial=trial,
+        params=params,
+        num_boost_round=num_boost_round,
+        metrics=evaluate_scores(_WORKER["y_valid"], proba).metrics(),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def run_search(config: dict, df: pd.DataFrame) -> list[TrialResult]:
+    """Evaluate the configured candidates on a process pool and return every trial.
+
+    Workers are spawned (forking after XGBoost has started OpenMP threads is
+    unsafe) and each is capped at its share of the CPUs, so parallel trials do
+    not oversubscribe cores. The prepared matrices are written once and
+    memory-mapped by every worker instead of being rebuilt per trial.
+
+    With the ``halving`` strategy, all candidates first train for
+    ``min_estimators`` rounds; the best 1/``factor`` go on to ``factor``
+    times as many rounds, until ``n_estimators`` is reached.
+    """
+    search_config = config["search"]
+    metric = search_config.get("metric", "roc_auc")
+    base_params = dict(config["model"]["params"])
+    max_rounds = base_params.pop("n_estimators", 100)
+    for name in search_config["space"]:
+        base_params.pop(name, None)
+
+    n_workers = search_config.get("n_workers") or available_cpus()
+    nthread = max(1, available_cpus() // n_workers)
+    pending = list(enumerate(candidates(search_config, config["data"]["random_state"])))
+
+    if search_config["strategy"] == "halving":
+        factor = search_config.get("factor", 3)
+        rounds = min(search_config.get("min_estimators", max_rounds), max_rounds)
+    else:
+        factor, rounds = 1, max_rounds
+
+    results: list[TrialResult] = []
+    with tempfile.TemporaryDirectory(prefix="search-") as data_dir:
+        feature_names = prepare_search_data(config, df, Path(data_dir))
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(data_dir, feature_names, nthread),
+        ) as pool:
+            while pending:
+                futures = [
+                    pool.submit(_run_trial, trial, base_params, params, rounds)
+                    for trial, params in pending
+                ]
+                round_results = sorted(
+                    (future.result() for future in futures),
+                    key=lambda r: (-r.metrics[metric], r.trial),
+                )
+                results.extend(round_results)
+                if factor == 1 or rounds >= max_rounds or len(round_results) == 1:
+                    break
+                keep = max(1, len(round_results) // factor)
+                pending = [(r.trial, r.params) for r in round_results[:keep]]
+                rounds = min(rounds * factor, max_rounds)
+    return results
+
+
+def best_trial(results: list[TrialResult], metric: str = "roc_auc") -> TrialResult:
+    """Best result at the largest budget any candidate reached."""
+    max_rounds = max(r.num_boost_round for r in results)
+    finalists = [r for r in results if r.num_boost_round == max_rounds]
+    return min(finalists, key=lambda r: (-r.metrics[metric], r.trial))
@@ -0,0 +1,169 @@
+import tempfile
+from collections.abc import Callable, Iterator
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.data.cache import build_cache, iter_cache
+from src.data.preprocessing import iter_data
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.drift import DEFAULT_BINS, DriftReference, Histograms
+from src.training.evaluate import Evaluation, evaluate_scores
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser: spreads any change in x across all 64 bits."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_split(features: pd.DataFrame, test_size: float, random_state: int) -> np.ndarray:
+    """Boolean test-set mask derived from a hash of each row's feature values.
+
+    A row lands on the same side however the data is chunked or ordered, and
+    duplicate rows never straddle the split. The hash ignores the label, so
+    every class is split at ``test_size`` in expectation.
+    """
+    hashes = pd.util.hash_pandas_object(features, index=False).to_numpy()
+    seed = _mix64(np.array([random_state], dtype=np.uint64))
+    uniform = (_mix64(hashes ^ seed) >> np.uint64(11)).astype(np.float64) * 2.0**-53
+    return uniform < test_size
+
+
+class ChunkIter(xgb.DataIter):
+    """XGBoost data iterator over (features, label) chunks.
+
+    ``make_batches`` is called on every pass, since XGBoost iterates the data
+    more than once while building a quantised matrix.
+    """
+
+    def __init__(
+        self,
+        make_batches: Callable[[], Iterator[tuple[pd.DataFrame, pd.Series]]],
+        cache_prefix: str | None = None,
+    ):
+        self._make_batches = make_batches
+        self._batches: Iterator[tuple[pd.DataFrame, pd.Series]] | None = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._batches is None:
+            self._batches = self._make_batches()
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        features, label = batch
+        input_data(data=features, label=label)
+        return True
+
+    def reset(self) -> None:
+        self._batches = None
+
+
+def _iter_chunks(data_config: dict, columns: list[str]) -> Iterator[pd.DataFrame]:
+    """Stream the training source, from its columnar cache when one is configured."""
+    if data_config.get("cache_dir"):
+        yield from iter_cache(build_cache(data_config["source"], data_config["cache_dir"]), columns)
+    else:
+        chunksize = data_config.get("chunksize") or DEFAULT_CHUNKSIZE
+        yield from iter_data(data_config["source"], chunksize=chunksize, columns=columns)
+
+
+def _split_batches(
+    chunks: Callable[[], Iterator[pd.DataFrame]],
+    target: str,
+    split: Callable[[pd.DataFrame], np.ndarray],
+    feature_engineer: FeatureEngineer,
+    test: bool,
+) -> Iterator[tuple[pd.DataFrame, pd.Series]]:
+    """Transformed (features, label) batches of one side of the split."""
+    for chunk in chunks():
+        features = chunk.drop(columns=[target])
+        mask = split(features)
+        if not test:
+            mask = ~mask
+        if mask.any():
+            yield feature_engineer.transform(features[mask]), chunk[target][mask]
+
+
+def train_model_streaming(
+    config: dict, columns: list[str]
+) -> tuple[xgb.XGBClassifier, FeatureEngineer, dict, Evaluation, DriftReference]:
+    """Train without materialising the dataset.
+
+    One pass over the chunks fits the FeatureEngineer on the training side of
+    a hash split; XGBoost then builds its quantised matrix from a DataIter that
+    scales each chunk as it is read, in memory or, with
+    ``training.external_memory``, spilled to disk. A final pass scores the
+    test side. Peak memory is bounded by the chunk size and XGBoost's
+    compressed matrix rather than the raw data.
+
+    The drift reference is counted during the first pass, with bins taken
+    from the quantiles of the first chunk.
+    """
+    external_memory = config["training"].get("external_memory", False)
+    if external_memory and not hasattr(xgb, "ExtMemQuantileDMatrix"):
+        raise RuntimeError(
+            "training.external_memory needs xgboost>=3.0 (ExtMemQuantileDMatrix), "
+            f"found {xgb.__version__}; upgrade xgboost or disable external_memory"
+        )
+    target = config["features"]["target"]
+    chunks = partial(_iter_chunks, config["data"], columns)
+    split = partial(
+        hash_split,
+        test_size=config["data"]["test_size"],
+        random_state=config["data"]["random_state"],
+    )
+
+    n_bins = config.get("drift", {}).get("n_bins", DEFAULT_BINS)
+    feature_engineer = FeatureEngineer(scale_features=["Amount"])
+    feature_histograms = None
+    for chunk in chunks():
+        features = chunk.drop(columns=[target])
+        train_features = features[~split(features)]
+        feature_engineer.partial_fit(train_features)
+        values = train_features.to_numpy(dtype=np.float64)
+        if feature_histograms is None:
+            feature_names = list(train_features.columns)
+            feature_histograms = Histograms.from_sample(values, n_bins)
+        feature_histograms.update(values)
+
+    params = dict(config["model"]["params"])
+    num_boost_round = params.pop("n_estimators", 100)
+    train_params = {"objective": "binary:logistic", "tree_method": "hist", **params}
+    batches = partial(_split_batches, chunks, target, split, feature_engineer)
+
+    with tempfile.TemporaryDirectory(prefix="xgb-extmem-") as cache_dir:
+        if external_memory:
+            train_iter = ChunkIter(partial(batches, test=False), cache_prefix=f"{cache_dir}/train")
+            dtrain: xgb.DMatrix = xgb.ExtMemQuantileDMatrix(train_iter)
+        else:
+            dtrain = xgb.QuantileDMatrix(ChunkIter(partial(batches, test=False)))
+        booster = xgb.train(train_params, dtrain, num_boost_round=num_boost_round)
+        del dtrain
+
+    model = xgb.XGBClassifier(**config["model"]["params"])
+    model.load_model(bytearray(booster.save_raw("ubj")))
+
+    y_test = []
+    y_pred_proba = []
+    for x, y in batches(test=True):
+        y_test.append(y.to_numpy())
+        y_pred_proba.append(booster.inplace_predict(x))
+    scores = np.concatenate(y_pred_proba)
+    evaluation = evaluate_scores(np.concatenate(y_test), scores)
+    metrics = {**evaluation.metrics(), "trees_added": booster.num_boosted_rounds()}
+
+    assert feature_histograms is not None
+    score_histograms = Histograms.from_sample(scores[:, None], n_bins)
+    score_histograms.update(scores[:, None])
+    reference = DriftReference.from_histograms(feature_names, feature_histograms, score_histograms)
+
+    return model, feature_engineer, metrics, evaluation, reference
@@ -1,19 +1,32 @@
 import pickle
+import resource
+import shutil
+import time
 from pathlib import Path
 
 import mlflow
+import numpy as np
+import pandas as pd
 import xgboost as xgb
 import yaml
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
+from mlflow import MlflowClient
+from mlflow.exceptions import MlflowException
 
-from src.data.preprocessing import load_data, split_data
+from src.data.preprocessing import SCHEMA, LoadStats, load_data, split_data
 from src.features.feature_engineering import FeatureEngineer
+from src.features.velocity import VELOCITY_FILE, VelocitySpec, add_velocity_features
+from src.serving.artifacts import BOOSTER_FILE, save_bundle
+from src.serving.drift import DEFAULT_BINS, DRIFT_REFERENCE_FILE, DriftReference, build_reference
+from src.serving.reload import REGISTERED_MODEL_NAME, download_mlflow_artifacts
+from src.serving.thresholds import (
+    DEFAULT_MAX_POINTS,
+    OPERATING_POINTS_FILE,
+    OperatingPoints,
+    build_operating_points,
+)
+from src.training.evaluate import Evaluation, bootstrap_intervals, evaluate_scores
+from src.training.search import best_trial, run_search
+from src.training.streaming import train_model_streaming
 
 
 def load_config(config_path: str = "configs/model_config.yaml") -> dict:
@@ -22,79 +35,364 @@ def load_config(config_path: str = "configs/model_config.yaml") -> dict:
         return yaml.safe_load(f)
 
 
-def train_model(config: dict) -> tuple[xgb.XGBClassifier, FeatureEngineer, dict]:
-    """Train the fraud detection model."""
-    df = load_data(config["data"]["source"])
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far, in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def training_columns(config: dict) -> list[str]:
+    """Schema columns training reads: the features it uses and the target."""
+    target = config["features"]["target"]
+    return [col for col in SCHEMA if col not in config["features"]["exclude"]] + [target]
+
+
+def load_training_data(config: dict, source: str | None = None) -> pd.DataFrame:
+    """Load ``source`` (default: the configured training source) and print its load stats.
+
+    With ``features.entity_column`` set, the entity and ``Time`` columns are
+    read too, the velocity features are computed by replaying the whole
+    source in time order (before any split, as the history would have been
+    seen in production), and the two columns are then dropped unless they
+    are training columns themselves.
+    """
+    columns = training_columns(config)
+    spec = VelocitySpec.from_config(config["features"])
+    if spec is not None:
+        columns = list(dict.fromkeys([*columns, "Time", spec.entity_column]))
+
+    load_stats = LoadStats()
+    df = load_data(
+        source or config["data"]["source"],
+        chunksize=config["data"].get("chunksize"),
+        stats=load_stats,
+        columns=columns,
+        cache_dir=config["data"].get("cache_dir"),
+    )
+    print(f"Loaded {load_stats.summary()}")
+
+    if spec is not None:
+        df = add_velocity_features(df, spec)
+        extra = [col for col in ("Time", spec.entity_column) if col not in training_columns(config)]
+        df = df.drop(columns=extra)
+    return df
+
+
+def load_registered_model(
+    alias: str | None = None,
+) -> tuple[xgb.XGBClassifier, FeatureEngineer, str]:
+    """Download a registered model version: the one behind ``alias``, else the latest.
+
+    Returns the classifier, the FeatureEngineer it was trained with and the
+    version number.
+    """
+    client = MlflowClient()
+    if alias:
+        version = client.get_model_version_by_alias(REGISTERED_MODEL_NAME, alias).version
+    else:
+        versions = client.search_model_versions(f"name='{REGISTERED_MODEL_NAME}'")
+        if not versions:
+            raise ValueError(f"No registered versions of {REGISTERED_MODEL_NAME}")
+        version = max(versions, key=lambda v: int(v.version)).version
+
+    model_dir = download_mlflow_artifacts(f"mlflow-{version}")
+    try:
+        model = xgb.XGBClassifier()
+        model.load_model(model_dir / BOOSTER_FILE)
+        with open(model_dir / "feature_engineer.pkl", "rb") as f:
+            feature_engineer = pickle.load(f)
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+    return model, feature_engineer, str(version)
+
+
+def train_model(
+    config: dict, base: tuple[xgb.XGBClassifier, FeatureEngineer] | None = None
+) -> tuple[xgb.XGBClassifier, FeatureEngineer, dict, Evaluation, DriftReference]:
+    """Train the fraud detection model.
+
+    With ``training.streaming`` the data is never loaded whole; see
+    train_model_streaming.
+
+    With ``training.early_stopping_rounds`` a ``training.validation_size``
+    share of the training split is held out and boosting stops once its AUC
+    has not improved for that many rounds; the model is cut back to its best
+    iteration. Given a ``base`` model and its FeatureEngineer, training is
+    incremental: ``training.incremental_rounds`` trees are boosted on top of
+    the base trees from ``training.incremental_source`` only, reusing the
+    base scaler so the existing trees see the features they were built on.
+
+    Besides the test metrics, ``trees_added`` (and ``best_iteration`` when
+    stopping early) are returned, with the test-set Evaluation they came from
+    and the drift reference: ``drift.n_bins`` quantile bins of each training
+    feature and of the test scores, which serving compares live traffic to.
+    """
+    training = config["training"]
+    if training.get("streaming"):
+        if (
+            base is not None
+            or training.get("early_stopping_rounds")
+            or config["features"].get("entity_column")
+        ):
+            raise ValueError(
+                "Streaming training supports none of incremental, early stopping "
+                "or velocity features"
+            )
+        return train_model_streaming(config, training_columns(config))
+
+    target = config["features"]["target"]
+    df = load_training_data(config, training.get("incremental_source") if base else None)
 
     x_train, x_test, y_train, y_test = split_data(
         df=df,
-        target_col=config["features"]["target"],
+        target_col=target,
         test_size=config["data"]["test_size"],
         random_state=config["data"]["random_state"],
     )
 
-    feature_engineer = FeatureEngineer(scale_features=["Amount"])
-    x_train_processed = feature_engineer.fit_transform(x_train)
+    params = dict(config["model"]["params"])
+    fit_kwargs: dict = {}
+    early_stopping_rounds = training.get("early_stopping_rounds")
+    if early_stopping_rounds:
+        x_train, x_valid, y_train, y_valid = split_data(
+            pd.concat([x_train, y_train], axis=1),
+            target_col=target,
+            test_size=training.get("validation_size", 0.1),
+            random_state=config["data"]["random_state"],
+        )
+        params["early_stopping_rounds"] = early_stopping_rounds
+
+    if base is None:
+        feature_engineer = FeatureEngineer(scale_features=["Amount"])
+        x_train_processed = feature_engineer.fit_transform(x_train)
+        base_rounds = 0
+    else:
+        base_model, feature_engineer = base
+        x_train_processed = feature_engineer.transform(x_train)
+        fit_kwargs["xgb_model"] = base_model.get_booster()
+        base_rounds = base_model.get_booster().num_boosted_rounds()
+        params["n_estimators"] = training.get("incremental_rounds", 20)
     x_test_processed = feature_engineer.transform(x_test)
+    if early_stopping_rounds:
+        fit_kwargs["eval_set"] = [(feature_engineer.transform(x_valid), y_valid)]
+        fit_kwargs["verbose"] = False
 
-    model = xgb.XGBClassifier(**config["model"]["params"])
-    model.fit(x_train_processed, y_train)
+    model = xgb.XGBClassifier(**params)
+    model.fit(x_train_processed, y_train, **fit_kwargs)
+    best_iteration = None
+    if early_stopping_rounds:
+        # Drop the trees boosted after the best iteration, so every consumer
+        # of the saved booster (including the native engine) scores the same.
+        best_iteration = model.best_iteration
+        booster = model.get_booster()[: best_iteration + 1]
+        model = xgb.XGBClassifier(**config["model"]["params"])
+        model.load_model(bytearray(booster.save_raw("ubj")))
 
-    y_pred = model.predict(x_test_processed)
     y_pred_proba = model.predict_proba(x_test_processed)[:, 1]
 
+    evaluation = evaluate_scores(y_test, y_pred_proba)
     metrics = {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred),
-        "recall": recall_score(y_test, y_pred),
-        "f1": f1_score(y_test, y_pred),
-        "roc_auc": roc_auc_score(y_test, y_pred_proba),
+        **evaluation.metrics(),
+        "trees_added": model.get_booster().num_boosted_rounds() - base_rounds,
     }
+    if best_iteration is not None:
+        metrics["best_iteration"] = best_iteration
 
-    return model, feature_engineer, metrics
+    reference = build_reference(
+        list(x_train.columns),
+        x_train.to_numpy(dtype=np.float64),
+        y_pred_proba,
+        n_bins=config.get("drift", {}).get("n_bins", DEFAULT_BINS),
+    )
+
+    return model, feature_engineer, metrics, evaluation, reference
 
 
 def save_artifacts(
     model: xgb.XGBClassifier,
     feature_engineer: FeatureEngineer,
     output_dir: str = "models",
+    operating_points: OperatingPoints | None = None,
+    drift_reference: DriftReference | None = None,
+    velocity: VelocitySpec | None = None,
 ) -> None:
-    """Save model and feature engineer locally."""
+    """Save model and feature engineer locally, as pickles and as a versioned bundle.
+
+    The operating-point table, drift reference and velocity spec, if given,
+    are written first so the bundle version covers them.
+    """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
 
+    if operating_points is not None:
+        operating_points.save(output_path)
+    else:
+        (output_path / OPERATING_POINTS_FILE).unlink(missing_ok=True)
+    if drift_reference is not None:
+        drift_reference.save(output_path)
+    else:
+        (output_path / DRIFT_REFERENCE_FILE).unlink(missing_ok=True)
+    if velocity is not None:
+        velocity.save(output_path)
+    else:
+        (output_path / VELOCITY_FILE).unlink(missing_ok=True)
+
     with open(output_path / "model.pkl", "wb") as f:
         pickle.dump(model, f)
 
     with open(output_path / "feature_engineer.pkl", "wb") as f:
         pickle.dump(feature_engineer, f)
 
+    save_bundle(model, feature_engineer, output_path)
+
+
+def search_with_mlflow(config: dict) -> dict:
+    """Run the hyperparameter search, logging each trial as a nested run.
+
+    Returns the model params with the best trial's values filled in.
+    """
+    metric = config["search"].get("metric", "roc_auc")
+    results = run_search(config, load_training_data(config))
+    best = best_trial(results, metric)
+
+    for result in results:
+        with mlflow.start_run(
+            run_name=f"trial-{result.trial}-{result.num_boost_round}", nested=True
+        ):
+            mlflow.log_params({**result.params, "n_estimators": result.num_boost_round})
+            mlflow.log_metrics({**result.metrics, "trial_seconds": result.seconds})
+            mlflow.set_tag("best_trial", str(result is best).lower())
+
+    print(f"Best trial {best.trial}: {best.params} ({metric}={best.metrics[metric]:.4f})")
+    return {**config["model"]["params"], **best.params}
+
+
+def promote_if_better(version: str, metrics: dict, metric: str, alias: str) -> bool:
+    """Point ``alias`` at ``version`` unless the current holder scores at least as well."""
+    client = MlflowClient()
+    try:
+        current = client.get_model_version_by_alias(REGISTERED_MODEL_NAME, alias)
+    except MlflowException:
+        current = None
+    current_value = None
+    if current is not None and current.run_id:
+        current_value = client.get_run(current.run_id).data.metrics.get(metric)
+
+    if current_value is not None and current_value >= metrics[metric]:
+        print(f"Kept {alias}: {metric} {current_value:.4f} >= {metrics[metric]:.4f}")
+        return False
+    client.set_registered_model_alias(REGISTERED_MODEL_NAME, alias, version)
+    print(f"Promoted version {version} to {alias}")
+    return True
+
 
 def train_with_mlflow(config_path: str = "configs/model_config.yaml") -> None:
-    """Train model with MLflow tracking."""
+    """Train model with MLflow tracking.
+
+    With ``search.enabled`` a hyperparameter search runs first, the final
+    model is trained with the best trial's params and, if it beats the current
+    holder of ``search.promote_alias``, promoted to it.
+
+    Test metrics are logged with ``<metric>_ci_low``/``_ci_high`` bootstrap
+    bounds when ``evaluation.bootstrap_replicates`` is set.
+
+    With ``training.incremental`` the registered model behind
+    ``training.base_alias`` is boosted further instead of training from
+    scratch. Every run logs ``train_seconds`` and ``trees_added`` so the
+    compute of each retrain mode can be compared.
+    """
     config = load_config(config_path)
+    search_config = config.get("search", {})
+    training = config["training"]
 
-    mlflow.set_experiment(config["training"]["experiment_name"])
+    mlflow.set_experiment(training["experiment_name"])
 
     with mlflow.start_run():
+        if search_config.get("enabled"):
+            config["model"]["params"] = search_with_mlflow(config)
         mlflow.log_params(config["model"]["params"])
+        mlflow.log_param("training_mode", "streaming" if training.get("streaming") else "in_memory")
+
+        base = None
+        if training.get("incremental"):
+            base_model, base_feature_engineer, base_version = load_registered_model(
+                training.get("base_alias")
+            )
+            base = (base_model, base_feature_engineer)
+            mlflow.log_params(
+                {
+                    "base_version": base_version,
+                    "base_trees": base_model.get_booster().num_boosted_rounds(),
+                    "incremental_rounds": training.get("incremental_rounds", 20),
+                }
+            )
+        if training.get("early_stopping_rounds"):
+            mlflow.log_param("early_stopping_rounds", training["early_stopping_rounds"])
 
-        model, feature_engineer, metrics = train_model(config)
+        start = time.perf_counter()
+        model, feature_engineer, metrics, evaluation, reference = train_model(config, base)
+        metrics["train_seconds"] = time.perf_counter() - start
+
+        decision = config.get("decision", {})
+        points = build_operating_points(
+            evaluation,
+            fn_cost=decision.get("fn_cost", 1.0),
+            fp_cost=decision.get("fp_cost", 1.0),
+            max_points=decision.get("max_points", DEFAULT_MAX_POINTS),
+        )
+        at_threshold = evaluation.metrics(points.chosen)
+        metrics["decision_threshold"] = points.chosen
+        metrics["decision_expected_cost"] = float(points.expected_cost.min())
+        for name in ("precision", "recall", "f1"):
+            metrics[f"decision_{name}"] = at_threshold[name]
+
+        bootstrap = config.get("evaluation", {})
+        if bootstrap.get("bootstrap_replicates"):
+            # Once at the default 0.5 used for the plain metrics, and once at
+            # the threshold serving decides with, for the decision_* metrics.
+            for prefix, threshold in (("", 0.5), ("decision_", points.chosen)):
+                intervals = bootstrap_intervals(
+                    evaluation,
+                    threshold=threshold,
+                    n_replicates=bootstrap["bootstrap_replicates"],
+                    confidence=bootstrap.get("confidence", 0.95),
+                    n_workers=bootstrap.get("n_workers"),
+                    random_state=config["data"]["random_state"],
+                )
+                for name, (low, high) in intervals.items():
+                    if prefix and name not in ("precision", "recall", "f1"):
+                        continue  # threshold-free, already logged
+                    metrics[f"{prefix}{name}_ci_low"] = low
+                    metrics[f"{prefix}{name}_ci_high"] = high
 
         mlflow.log_metrics(metrics)
+        mlflow.log_metric("peak_rss_mb", peak_rss_mb())
 
-        save_artifacts(model, feature_engineer)
+        save_artifacts(
+            model,
+            feature_engineer,
+            operating_points=points,
+            drift_reference=reference,
+            velocity=VelocitySpec.from_config(config["features"]),
+        )
         mlflow.log_artifacts("models")
 
         # Use sklearn flavor instead of xgboost
-        mlflow.sklearn.log_model(
+        model_info = mlflow.sklearn.log_model(
             model,
             name="model",
-            registered_model_name="fraud-detection-model",
+            registered_model_name=REGISTERED_MODEL_NAME,
         )
 
         print(f"Metrics: {metrics}")
 
+        if search_config.get("enabled") and search_config.get("promote_alias"):
+            promote_if_better(
+                str(model_info.registered_model_version),
+                metrics,
+                search_config.get("metric", "roc_auc"),
+                search_config["promote_alias"],
+            )
+
 
 if __name__ == "__main__":
     train_with_mlflow()
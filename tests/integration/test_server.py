@@ -0,0 +1,94 @@
+# tests/integration/test_server.py
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Generator
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.artifacts import save_bundle
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+COLUMNS = [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.fixture
+def prefork_server(tmp_path: Path) -> Generator[tuple[str, subprocess.Popen], None, None]:
+    """Run the pre-fork server with two workers on a small native bundle."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, len(COLUMNS))), columns=COLUMNS)
+    fe = FeatureEngineer(scale_features=["Amount"])
+    model = xgb.XGBClassifier(n_estimators=10, max_depth=3)
+    model.fit(fe.fit_transform(df), (df["V1"] > 0).astype(int))
+    save_bundle(model, fe, tmp_path / "model")
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "SERVING_MODEL_DIR": str(tmp_path / "model"),
+        "SERVING_MODEL_ENGINE": "native",
+        "SERVING_SERVER_WORKERS": "2",
+        "PROMETHEUS_MULTIPROC_DIR": str(tmp_path / "metrics"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.serving.server", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            httpx.get(f"{base_url}/health").raise_for_status()
+            break
+        except httpx.HTTPError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                raise
+            time.sleep(0.1)
+
+    yield base_url, process
+
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_prefork_workers_share_metrics_and_stop_cleanly(
+    prefork_server: tuple[str, subprocess.Popen],
+) -> None:
+    """Test /metrics aggregates every worker and SIGTERM stops the pod."""
+    base_url, process = prefork_server
+    transaction = dict.fromkeys(COLUMNS, 0.1)
+
+    with httpx.Client(base_url=base_url) as client:
+        for _ in range(10):
+            assert client.post("/predict", json=transaction).status_code == 200
+        metrics = client.get("/metrics/").text
+
+    totals = [
+        float(line.rsplit(" ", 1)[1])
+        for line in metrics.splitlines()
+        if line.startswith("fraud_predictions_total{")
+    ]
+    assert sum(totals) == 10
+    assert "fraud_inference_pool_workers 4.0" in metrics
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15) == 0
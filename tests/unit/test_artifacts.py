@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.artifacts import MANIFEST_FILE, load_bundle, read_manifest, save_bundle
+
+COLUMNS = [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+
+@pytest.fixture(scope="module")
+def trained() -> tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame]:
+    """Train a small model and feature engineer on synthetic transactions."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(1000, len(COLUMNS))), columns=COLUMNS)
+    df["Amount"] = rng.lognormal(3, 1.5, size=len(df))
+    y = (df["V1"] + df["Amount"] / 100 > 1).astype(int)
+
+    fe = FeatureEngineer(scale_features=["Amount"])
+    model = xgb.XGBClassifier(n_estimators=10, max_depth=3)
+    model.fit(fe.fit_transform(df), y)
+    return model, fe, df
+
+
+def test_bundle_roundtrip_matches_pickled_objects(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame], tmp_path: Path
+) -> None:
+    """Test a loaded bundle scores like the in-memory model and feature engineer."""
+    model, fe, df = trained
+    version = save_bundle(model, fe, tmp_path)
+
+    bundle = load_bundle(tmp_path)
+    rows = df.head(50).to_numpy(dtype=np.float32)
+    expected = model.predict_proba(fe.transform(df.head(50)))
+
+    assert bundle.version == version
+    assert isinstance(bundle.trees.feature, np.memmap)
+    np.testing.assert_allclose(
+        bundle.classifier.predict_proba(bundle.features.transform(rows.copy())), expected, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        bundle.trees.predict_proba(bundle.features.transform(rows.copy())), expected, atol=1e-6
+    )
+
+
+def test_bundle_version_is_content_derived(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame], tmp_path: Path
+) -> None:
+    """Test saving the same model twice yields the same version."""
+    model, fe, _ = trained
+
+    assert save_bundle(model, fe, tmp_path / "a") == save_bundle(model, fe, tmp_path / "b")
+    assert read_manifest(tmp_path / "a")["features"]["input_columns"] == COLUMNS
+
+
+def test_native_bundle_skips_classifier(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame], tmp_path: Path
+) -> None:
+    """Test the booster is not loaded when only node tables are needed."""
+    model, fe, _ = trained
+    save_bundle(model, fe, tmp_path)
+
+    assert load_bundle(tmp_path, load_classifier=False).classifier is None
+
+
+def test_unsupported_format_version(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame], tmp_path: Path
+) -> None:
+    """Test bundles from an unknown format version are rejected."""
+    model, fe, _ = trained
+    save_bundle(model, fe, tmp_path)
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    manifest["format_version"] = 99
+    (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError, match="Unsupported bundle format"):
+        load_bundle(tmp_path)
+
+
+@pytest.mark.parametrize("engine", ["xgboost", "native"])
+def test_serving_loads_bundle(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    engine: str,
+) -> None:
+    """Test the API serves from a bundle and reports its version."""
+    model, fe, df = trained
+    version = save_bundle(model, fe, tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    monkeypatch.setenv("SERVING_MODEL_ENGINE", engine)
+
+    from src.serving import app as app_module
+
+    payload = df.iloc[0].to_dict()
+    with TestClient(app_module.app) as client:
+        health = client.get("/health").json()
+        response = client.post("/predict", json=payload)
+
+    expected = model.predict_proba(fe.transform(df.head(1)))[0, 1]
+    assert health["model_version"] == version
+    assert response.json()["fraud_probability"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_directory_reload_swaps_bundle(
+    trained: tuple[xgb.XGBClassifier, FeatureEngineer, pd.DataFrame],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a new bundle written to the watched directory is swapped in."""
+    model, fe, df = trained
+    save_bundle(model, fe, tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    monkeypatch.setenv("SERVING_RELOAD_SOURCE", "directory")
+    monkeypatch.setenv("SERVING_RELOAD_INTERVAL_SECONDS", "3600")
+
+    retrained = xgb.XGBClassifier(n_estimators=5, max_depth=2)
+    retrained.fit(fe.transform(df), (df["V2"] > 0).astype(int))
+
+    from src.serving import app as app_module
+
+    with TestClient(app_module.app) as client:
+        new_version = save_bundle(retrained, fe, tmp_path)
+        assert client.portal.call(app_module.state.watcher.check) is True
+        health = client.get("/health").json()
+        response = client.post("/predict", json=df.iloc[0].to_dict())
+
+    expected = retrained.predict_proba(fe.transform(df.head(1)))[0, 1]
+    assert health["model_version"] == new_version
+    assert response.json()["fraud_probability"] == pytest.approx(expected, abs=1e-6)
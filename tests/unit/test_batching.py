@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from prometheus_client import REGISTRY
+
+from src.serving.batching import MicroBatcher
+
+
+def _row(value: float) -> np.ndarray:
+    """Create a single feature row."""
+    return np.full(29, value, dtype=np.float32)
+
+
+def test_concurrent_requests_share_one_call() -> None:
+    """Test that concurrent submissions are scored in a single batch."""
+    score_fn = AsyncMock(side_effect=lambda x, _: x[:, 0] / 10)
+
+    async def run() -> list[float]:
+        batcher = MicroBatcher(score_fn, max_batch_size=16, max_wait_seconds=0.05)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(_row(i)) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert score_fn.call_count == 1
+    assert score_fn.call_args[0][0].shape == (5, 29)
+
+
+def test_max_batch_size_splits_batches() -> None:
+    """Test that a full batch is flushed without waiting for the deadline."""
+    batch_sizes: list[int] = []
+
+    async def score_fn(x: np.ndarray, _: object) -> np.ndarray:
+        batch_sizes.append(len(x))
+        return np.zeros(len(x))
+
+    async def run() -> None:
+        batcher = MicroBatcher(score_fn, max_batch_size=4, max_wait_seconds=10.0)
+        await batcher.start()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(_row(i)) for i in range(8))), timeout=1.0
+            )
+        finally:
+            await batcher.stop()
+
+    asyncio.run(run())
+
+    assert batch_sizes == [4, 4]
+
+
+def test_rows_are_scored_per_context() -> None:
+    """Test that rows submitted under different contexts never share a call."""
+    calls: list[tuple[str, int]] = []
+
+    async def score_fn(x: np.ndarray, context: str) -> np.ndarray:
+        calls.append((context, x.shape[1]))
+        return np.full(len(x), 0.9 if context == "new" else 0.1)
+
+    async def run() -> list[float]:
+        batcher = MicroBatcher(score_fn, max_batch_size=16, max_wait_seconds=0.05)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit(_row(0.0), "old"),
+                batcher.submit(np.zeros(31, dtype=np.float32), "new"),
+                batcher.submit(_row(1.0), "old"),
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == pytest.approx([0.1, 0.9, 0.1])
+    assert sorted(calls) == [("new", 31), ("old", 29)]
+
+
+def test_scoring_error_propagates_to_callers() -> None:
+    """Test that a failing batch raises in every waiting caller."""
+
+    async def run() -> None:
+        batcher = MicroBatcher(AsyncMock(side_effect=RuntimeError("boom")), max_wait_seconds=0.001)
+        await batcher.start()
+        try:
+            with pytest.raises(RuntimeError, match="boom"):
+                await batcher.submit(_row(1.0))
+        finally:
+            await batcher.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_fails_rows_being_collected() -> None:
+    """Test stopping mid-collection fails rows already taken off the queue."""
+
+    def depth() -> float:
+        return REGISTRY.get_sample_value("fraud_microbatch_queue_depth") or 0.0
+
+    async def run() -> list[BaseException | float]:
+        batcher = MicroBatcher(AsyncMock(), max_batch_size=16, max_wait_seconds=10.0)
+        await batcher.start()
+        submitted = [asyncio.create_task(batcher.submit(_row(i))) for i in range(3)]
+        await asyncio.sleep(0.01)  # the loop now holds the rows, waiting for more
+        await batcher.stop()
+        return await asyncio.wait_for(
+            asyncio.gather(*submitted, return_exceptions=True), timeout=1.0
+        )
+
+    before = depth()
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) and "stopped" in str(r) for r in results)
+    assert depth() == before
+
+
+def test_submit_requires_start() -> None:
+    """Test that submitting to a stopped batcher fails fast."""
+    batcher = MicroBatcher(AsyncMock())
+
+    with pytest.raises(RuntimeError, match="not running"):
+        asyncio.run(batcher.submit(_row(1.0)))
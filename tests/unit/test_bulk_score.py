@@ -0,0 +1,83 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.artifacts import save_bundle
+from src.serving.bulk_score import score_file
+from src.serving.config import ServingConfig
+
+COLUMNS = [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+
+@pytest.fixture
+def model_dir(tmp_path: Path) -> Path:
+    """Pickles and bundle of a small model, as training writes them."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(1000, len(COLUMNS))), columns=COLUMNS)
+    df["Amount"] = rng.lognormal(3, 1.5, size=len(df))
+    fe = FeatureEngineer(scale_features=["Amount"])
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=4)
+    model.fit(fe.fit_transform(df), (df["V1"] + df["Amount"] / 100 > 1).astype(int))
+
+    path = tmp_path / "models"
+    path.mkdir()
+    (path / "model.pkl").write_bytes(pickle.dumps(model))
+    (path / "feature_engineer.pkl").write_bytes(pickle.dumps(fe))
+    save_bundle(model, fe, path)
+    return path
+
+
+@pytest.fixture
+def transactions(tmp_path: Path) -> pd.DataFrame:
+    """Transactions with full-precision values, written to CSV and Parquet."""
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(300, len(COLUMNS))), columns=COLUMNS)
+    df["Amount"] = rng.lognormal(3, 1.5, size=len(df))
+    df.insert(0, "Time", np.arange(len(df), dtype=float))
+    df.to_csv(tmp_path / "transactions.csv", index=False)
+    df.to_parquet(tmp_path / "transactions.parquet", index=False)
+    return pd.read_csv(tmp_path / "transactions.csv")
+
+
+@pytest.mark.parametrize(("engine", "suffix"), [("xgboost", ".csv"), ("native", ".parquet")])
+def test_bulk_scores_match_predict_endpoint(
+    model_dir: Path,
+    transactions: pd.DataFrame,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    engine: str,
+    suffix: str,
+) -> None:
+    """Test sharded bulk scores are in input order and bit-identical to /predict."""
+    config = ServingConfig(model_dir=str(model_dir), model_engine=engine)
+    output = tmp_path / "scores.parquet"
+
+    stats = score_file(
+        tmp_path / f"transactions{suffix}",
+        output,
+        config,
+        n_workers=2,
+        chunksize=64,
+        keep_columns=["Time"],
+    )
+
+    scored = pq.read_table(output).to_pandas()
+    assert stats["rows"] == len(scored) == len(transactions)
+    assert scored["Time"].tolist() == transactions["Time"].tolist()
+
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(model_dir))
+    monkeypatch.setenv("SERVING_MODEL_ENGINE", engine)
+    from src.serving import app as app_module
+
+    with TestClient(app_module.app) as client:
+        for i in range(0, len(transactions), 7):
+            response = client.post("/predict", json=transactions.loc[i, COLUMNS].to_dict()).json()
+            assert response["fraud_probability"] == float(scored.loc[i, "fraud_probability"])
+            assert response["is_fraud"] == scored.loc[i, "is_fraud"]
@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.cache import build_cache, read_cache
+from src.data.preprocessing import LoadStats, load_data
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """A small extract with the training schema."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(40, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(40, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1, size=40).round(2)
+    df["Class"] = [0, 1] * 20
+    path = tmp_path / "creditcard.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("cache_format", ["arrow", "parquet"])
+def test_cached_load_matches_csv(source: Path, tmp_path: Path, cache_format: str) -> None:
+    """Test the cache returns the same typed, projected data as the CSV."""
+    columns = ["V1", "Amount", "Class"]
+
+    cached = load_data(
+        source, columns=columns, cache_dir=tmp_path / "cache", cache_format=cache_format
+    )
+
+    pd.testing.assert_frame_equal(cached, load_data(source, columns=columns))
+
+
+def test_arrow_cache_is_zero_copy(source: Path, tmp_path: Path) -> None:
+    """Test single-part Arrow caches are read as views of the memory map."""
+    df = read_cache(build_cache(source, tmp_path / "cache"), columns=["V1"])
+
+    values = df["V1"].to_numpy()
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+
+
+def test_cache_partitions_and_reuses(source: Path, tmp_path: Path) -> None:
+    """Test parts are split by rows and an unchanged source reuses the cache."""
+    cache_path = build_cache(source, tmp_path / "cache", part_rows=16)
+    mtime = (cache_path / "part-00000.arrow").stat().st_mtime_ns
+
+    assert build_cache(source, tmp_path / "cache", part_rows=16) == cache_path
+    assert sorted(p.name for p in cache_path.glob("part-*")) == [
+        "part-00000.arrow",
+        "part-00001.arrow",
+        "part-00002.arrow",
+    ]
+    assert (cache_path / "part-00000.arrow").stat().st_mtime_ns == mtime
+    assert len(read_cache(cache_path)) == 40
+
+
+def test_cache_invalidates_when_source_changes(source: Path, tmp_path: Path) -> None:
+    """Test editing the source rebuilds the cache and drops the stale one."""
+    cache_dir = tmp_path / "cache"
+    before = build_cache(source, cache_dir)
+
+    df = pd.read_csv(source)
+    df.loc[0, "Amount"] = 12345.0
+    df.to_csv(source, index=False)
+    os.utime(source, ns=(0, 1))
+    stats = LoadStats()
+    reloaded = load_data(source, cache_dir=cache_dir, stats=stats)
+    after = build_cache(source, cache_dir)
+
+    assert after != before
+    assert not before.exists()
+    assert reloaded.loc[0, "Amount"] == 12345.0
+    assert stats.rows == 40
@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+
+from src.serving import config as config_module
+from src.serving.config import ServingConfig, cgroup_cpu_limit
+
+
+def test_cgroup_v2_quota(tmp_path: Path) -> None:
+    """Test cpu.max is read as CPUs, with "max" meaning unlimited."""
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_limit(tmp_path) == 1.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path: Path) -> None:
+    """Test the v1 CFS quota files are used when cpu.max is absent."""
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_limit(tmp_path) == 2.0
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_no_cgroup_files(tmp_path: Path) -> None:
+    """Test a missing cgroup hierarchy means no limit."""
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_worker_sizing_follows_cpu_quota(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test processes and threads are sized from the quota, not host cores."""
+    monkeypatch.setattr(config_module.os, "sched_getaffinity", lambda pid: set(range(16)))
+    monkeypatch.setattr(config_module, "cgroup_cpu_limit", lambda: 4.5)
+
+    assert ServingConfig().server_processes == 4
+    assert ServingConfig(server_workers=2, inference_workers=2).threads_per_worker == 1
+    assert ServingConfig(inference_workers=2).threads_per_worker == 2
+
+
+def test_negative_server_workers_rejected() -> None:
+    """Test an invalid worker count fails fast."""
+    with pytest.raises(ValueError, match="server_workers"):
+        ServingConfig(server_workers=-1)
+
+
+def test_decision_threshold_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test threshold settings are optional, with an empty value meaning unset."""
+    monkeypatch.setenv("SERVING_DECISION_THRESHOLD", "0.35")
+    monkeypatch.setenv("SERVING_TARGET_PRECISION", "")
+
+    config = ServingConfig.from_env()
+
+    assert config.decision_threshold == 0.35
+    assert config.target_precision is None
+    with pytest.raises(ValueError, match="target_precision"):
+        ServingConfig(target_precision=1.5)
+
+
+def test_model_dir_and_reload_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the model directory and hot-reload settings are read from the environment."""
+    monkeypatch.setenv("SERVING_MODEL_DIR", "/srv/models")
+    monkeypatch.setenv("SERVING_RELOAD_SOURCE", "mlflow")
+    monkeypatch.setenv("SERVING_RELOAD_INTERVAL_SECONDS", "5")
+    monkeypatch.setenv("SERVING_RELOAD_MODEL_ALIAS", "challenger")
+
+    config = ServingConfig.from_env()
+
+    assert config.model_dir == "/srv/models"
+    assert config.reload_source == "mlflow"
+    assert config.reload_interval_seconds == 5.0
+    assert config.reload_model_alias == "challenger"
+    monkeypatch.setenv("SERVING_RELOAD_SOURCE", "s3")
+    with pytest.raises(ValueError, match="reload_source"):
+        ServingConfig.from_env()
+
+
+def test_slow_request_and_profiling_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the slow-request log can be disabled and profiling is opt-in."""
+    monkeypatch.setenv("SERVING_SLOW_REQUEST_MS", "")
+    monkeypatch.setenv("SERVING_SLOW_REQUEST_SAMPLE_RATE", "0.1")
+    monkeypatch.setenv("SERVING_PROFILING_ENABLED", "true")
+
+    config = ServingConfig.from_env()
+
+    assert config.slow_request_ms is None
+    assert config.slow_request_sample_rate == 0.1
+    assert config.profiling_enabled is True
+    assert ServingConfig().profiling_enabled is False
+    with pytest.raises(ValueError, match="slow_request_sample_rate"):
+        ServingConfig(slow_request_sample_rate=2.0)
+
+
+def test_drift_decay_follows_half_life(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the drift settings are read from the environment and validated."""
+    monkeypatch.setenv("SERVING_DRIFT_INTERVAL_SECONDS", "30")
+    monkeypatch.setenv("SERVING_DRIFT_HALF_LIFE_SECONDS", "60")
+
+    config = ServingConfig.from_env()
+
+    assert config.drift_enabled is True
+    assert config.drift_decay == pytest.approx(0.5**0.5)
+    with pytest.raises(ValueError, match="drift_interval_seconds"):
+        ServingConfig(drift_interval_seconds=0)
+
+
+def test_explain_settings_are_validated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the explanation pool and cache sizes are read from the environment."""
+    monkeypatch.setenv("SERVING_EXPLAIN_CACHE_SIZE", "0")
+
+    assert ServingConfig.from_env().explain_cache_size == 0
+    with pytest.raises(ValueError, match="explain_workers"):
+        ServingConfig(explain_workers=0)
+    with pytest.raises(ValueError, match="explain_queue_size"):
+        ServingConfig(explain_queue_size=-1)
+
+
+def test_prediction_cache_is_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the prediction cache is off by default and an empty TTL disables expiry."""
+    assert ServingConfig().prediction_cache_size == 0
+
+    monkeypatch.setenv("SERVING_PREDICTION_CACHE_SIZE", "1000")
+    monkeypatch.setenv("SERVING_PREDICTION_CACHE_TTL_SECONDS", "")
+    config = ServingConfig.from_env()
+
+    assert config.prediction_cache_size == 1000
+    assert config.prediction_cache_ttl_seconds is None
+    with pytest.raises(ValueError, match="prediction_cache_ttl_seconds"):
+        ServingConfig(prediction_cache_ttl_seconds=0)
+
+
+def test_shadow_settings_are_validated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test shadow scoring is off by default and its settings are checked."""
+    monkeypatch.setenv("SERVING_SHADOW_SOURCE", "mlflow")
+    monkeypatch.setenv("SERVING_SHADOW_SAMPLE_RATE", "0.25")
+
+    config = ServingConfig.from_env()
+
+    assert ServingConfig().shadow_source == "none"
+    assert config.shadow_source == "mlflow"
+    assert config.shadow_sample_rate == 0.25
+    with pytest.raises(ValueError, match="shadow_source"):
+        ServingConfig(shadow_source="s3")
+    with pytest.raises(ValueError, match="shadow_sample_rate"):
+        ServingConfig(shadow_sample_rate=1.5)
@@ -0,0 +1,81 @@
+# tests/unit/test_drift.py
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.serving.drift import (
+    MIN_SAMPLES,
+    DriftMonitor,
+    DriftReference,
+    Histograms,
+    build_reference,
+)
+
+
+@pytest.fixture
+def reference() -> DriftReference:
+    """Reference over two standard-normal features and uniform scores."""
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(50_000, 2))
+    return build_reference(["a", "b"], features, rng.uniform(size=50_000), n_bins=10)
+
+
+def test_histograms_bin_at_quantiles_and_pad_repeated_edges() -> None:
+    """Test values land after the last edge they reach and constant columns get one bin."""
+    sample = np.column_stack([np.arange(100.0), np.zeros(100)])
+    histograms = Histograms.from_sample(sample, n_bins=4)
+
+    np.testing.assert_allclose(histograms.edges[0], [24.75, 49.5, 74.25])
+    np.testing.assert_array_equal(histograms.edges[1], [0.0, np.inf, np.inf])
+
+    histograms.update(sample)
+    np.testing.assert_array_equal(histograms.counts[0], [25, 25, 25, 25])
+    np.testing.assert_array_equal(histograms.counts[1], [0, 100, 0, 0])
+
+
+def test_reference_round_trips_through_json(reference: DriftReference, tmp_path: Path) -> None:
+    """Test a saved reference, including its infinite padding, loads back unchanged."""
+    padded = DriftReference(
+        names=reference.names,
+        edges=np.where(np.arange(9) > 6, np.inf, reference.edges),
+        proportions=reference.proportions,
+    )
+    padded.save(tmp_path)
+    loaded = DriftReference.load(tmp_path)
+
+    assert loaded is not None
+    assert loaded.names == ["a", "b", "fraud_probability"]
+    np.testing.assert_array_equal(loaded.edges, padded.edges)
+    np.testing.assert_array_equal(loaded.proportions, padded.proportions)
+    assert DriftReference.load(tmp_path / "missing") is None
+
+
+def test_monitor_flags_shifted_feature_only(reference: DriftReference) -> None:
+    """Test PSI and KS stay near zero for matching traffic and rise for a shifted feature."""
+    rng = np.random.default_rng(1)
+    monitor = DriftMonitor(reference)
+    features = np.column_stack([rng.normal(size=5000), rng.normal(loc=1.0, size=5000)])
+    for start in range(0, 5000, 500):
+        monitor.observe(features[start : start + 500], rng.uniform(size=500))
+
+    results = monitor.publish()
+
+    assert results["a"][0] < 0.01
+    assert results["fraud_probability"][0] < 0.01
+    assert results["b"][0] > 0.5
+    assert results["b"][1] == pytest.approx(0.38, abs=0.03)  # max |Phi(x) - Phi(x - 1)|
+
+
+def test_monitor_decays_counts_and_waits_for_samples(reference: DriftReference) -> None:
+    """Test publishing decays the live counts and skips gauges below MIN_SAMPLES."""
+    rng = np.random.default_rng(2)
+    monitor = DriftMonitor(reference, decay=0.5)
+    n_rows = 2 * MIN_SAMPLES
+
+    monitor.observe(rng.normal(size=(n_rows, 2)), rng.uniform(size=n_rows))
+
+    assert monitor.publish()  # n_rows samples
+    assert monitor.publish()  # decayed to exactly MIN_SAMPLES
+    assert monitor.publish() == {}
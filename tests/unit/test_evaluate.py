@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn import metrics
+
+from src.training import evaluate as evaluate_module
+from src.training.evaluate import (
+    bootstrap_intervals,
+    evaluate_model,
+    evaluate_scores,
+    get_classification_report,
+    get_confusion_matrix,
+)
+
+
+@pytest.fixture
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    """Imbalanced labels with rounded (heavily tied) scores."""
+    rng = np.random.default_rng(0)
+    y = (rng.random(5000) < 0.05).astype(int)
+    scores = np.round(0.6 * rng.random(5000) + 0.35 * y, 2).astype(np.float32)
+    return y, scores
+
+
+def test_metrics_match_sklearn(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test every metric agrees with sklearn at several thresholds, ties included."""
+    y, scores = scored
+    evaluation = evaluate_scores(pd.Series(y), scores)
+
+    for threshold in (0.0, 0.3, 0.5, 0.62, 1.0):
+        y_pred = (scores > threshold).astype(int)
+        expected = {
+            "accuracy": metrics.accuracy_score(y, y_pred),
+            "precision": metrics.precision_score(y, y_pred, zero_division=0),
+            "recall": metrics.recall_score(y, y_pred),
+            "f1": metrics.f1_score(y, y_pred),
+            "roc_auc": metrics.roc_auc_score(y, scores),
+            "pr_auc": metrics.average_precision_score(y, scores),
+        }
+        assert evaluation.metrics(threshold) == pytest.approx(expected)
+        np.testing.assert_array_equal(
+            evaluation.confusion_matrix(threshold), metrics.confusion_matrix(y, y_pred)
+        )
+
+
+def test_curves_cover_every_distinct_score(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test the per-threshold arrays match sklearn's precision-recall curve."""
+    y, scores = scored
+    evaluation = evaluate_scores(y, scores)
+    precision, recall, thresholds = metrics.precision_recall_curve(y, scores)
+
+    np.testing.assert_array_equal(evaluation.thresholds, thresholds[::-1])
+    np.testing.assert_allclose(evaluation.precision, precision[-2::-1])
+    np.testing.assert_allclose(evaluation.recall, recall[-2::-1])
+
+
+def test_label_reports_match_sklearn(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test the label-based helpers agree with sklearn."""
+    y, scores = scored
+    y_pred = (scores > 0.5).astype(int)
+
+    assert evaluate_model(y, y_pred, scores)["f1"] == pytest.approx(metrics.f1_score(y, y_pred))
+    assert get_confusion_matrix(y, y_pred).to_numpy().tolist() == (
+        metrics.confusion_matrix(y, y_pred).tolist()
+    )
+    assert get_classification_report(y, y_pred) == metrics.classification_report(
+        y, y_pred, target_names=["Not Fraud", "Fraud"]
+    )
+
+
+def test_invalid_inputs_raise() -> None:
+    """Test non-binary labels, mismatched shapes and single-class AUC are rejected."""
+    with pytest.raises(ValueError, match="binary"):
+        evaluate_scores(np.array([0, 2]), np.array([0.1, 0.2]))
+    with pytest.raises(ValueError, match="equal"):
+        evaluate_scores(np.array([0, 1]), np.array([0.1]))
+    with pytest.raises(ValueError, match="single class"):
+        _ = evaluate_scores(np.array([1, 1]), np.array([0.1, 0.2])).roc_auc
+
+
+def test_bootstrap_matches_resampling_rows(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test intervals agree with naively resampling rows and recomputing with sklearn."""
+    y, scores = scored
+    rng = np.random.default_rng(1)
+    naive = []
+    for _ in range(300):
+        idx = rng.integers(0, len(y), len(y))
+        naive.append(
+            [
+                metrics.f1_score(y[idx], scores[idx] > 0.5),
+                metrics.roc_auc_score(y[idx], scores[idx]),
+            ]
+        )
+    naive_low, naive_high = np.quantile(naive, [0.05, 0.95], axis=0)
+
+    intervals = bootstrap_intervals(evaluate_scores(y, scores), n_replicates=2000, confidence=0.9)
+
+    point = evaluate_scores(y, scores).metrics()
+    for i, name in enumerate(["f1", "roc_auc"]):
+        low, high = intervals[name]
+        assert low < point[name] < high
+        assert low == pytest.approx(naive_low[i], abs=0.01)
+        assert high == pytest.approx(naive_high[i], abs=0.01)
+
+
+def test_bootstrap_is_independent_of_workers(
+    scored: tuple[np.ndarray, np.ndarray], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test replicate blocks scored on a process pool give the same intervals."""
+    y, scores = scored
+    evaluation = evaluate_scores(y, scores)
+    monkeypatch.setattr(evaluate_module, "BOOTSTRAP_BLOCK_ELEMENTS", 50_000)
+
+    inline = bootstrap_intervals(evaluation, n_replicates=500, n_workers=1)
+    pooled = bootstrap_intervals(evaluation, n_replicates=500, n_workers=2)
+
+    assert pooled == inline
@@ -0,0 +1,30 @@
+# tests/unit/test_explain.py
+
+import numpy as np
+import xgboost as xgb
+
+from src.serving.explain import feature_contributions, margin_probabilities, top_features
+
+
+def test_contributions_add_up_to_the_model_score() -> None:
+    """Test each row's contributions plus bias reproduce predict_proba."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(300, 4)).astype(np.float32)
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(x, (x[:, 1] > 0).astype(int))
+
+    contributions = feature_contributions(model.get_booster(), x[:50])
+
+    assert contributions.shape == (50, 5)
+    np.testing.assert_allclose(
+        margin_probabilities(contributions), model.predict_proba(x[:50])[:, 1], atol=1e-5
+    )
+    # The label only depends on the second feature, which dominates every row.
+    np.testing.assert_array_equal(top_features(contributions, 1)[:, 0], 1)
+
+
+def test_top_features_orders_by_magnitude_and_ignores_bias() -> None:
+    """Test indices come largest |contribution| first, capped at the feature count."""
+    contributions = np.array([[0.1, -3.0, 2.0, 9.0], [0.5, 0.2, -0.4, -9.0]])
+
+    np.testing.assert_array_equal(top_features(contributions, 2), [[1, 2], [0, 2]])
+    np.testing.assert_array_equal(top_features(contributions, 10), [[1, 2, 0], [0, 2, 1]])
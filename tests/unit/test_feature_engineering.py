@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -40,3 +41,46 @@ def test_feature_engineer_scaling(sample_data: pd.DataFrame) -> None:
     result = fe.fit_transform(sample_data)
 
     assert abs(result["Amount"].mean()) < 0.1
+
+
+def test_compiled_matches_dataframe_path(sample_data: pd.DataFrame) -> None:
+    """Test the NumPy fast path matches DataFrame transform."""
+    fe = FeatureEngineer(scale_features=["Amount"]).fit(sample_data)
+    compiled = fe.compile(["V1", "Amount", "Time"])
+
+    expected = fe.transform(sample_data)
+    result = compiled.transform(sample_data[["V1", "Amount", "Time"]].to_numpy())
+
+    assert compiled.output_columns == list(expected.columns)
+    np.testing.assert_allclose(result, expected.to_numpy(), rtol=1e-6, atol=1e-6)
+    assert result.dtype == np.float32
+
+
+def test_compiled_transforms_in_place(sample_data: pd.DataFrame) -> None:
+    """Test a float32 buffer is scaled in place and single rows are accepted."""
+    fe = FeatureEngineer(scale_features=["Amount"]).fit(sample_data)
+    compiled = fe.compile(["V1", "Amount"])
+
+    buffer = np.array(sample_data[["V1", "Amount"]], dtype=np.float32)
+    result = compiled.transform(buffer)
+    row = compiled.transform(np.array([2.0, 200.0], dtype=np.float32))
+
+    assert result is buffer
+    assert row.shape == (1, 2)
+    assert abs(row[0, 1]) < 1e-6
+
+
+def test_compile_without_fit() -> None:
+    """Test that compile raises error if not fitted."""
+    with pytest.raises(ValueError, match="must be fitted"):
+        FeatureEngineer().compile(["Amount"])
+
+
+def test_partial_fit_matches_fit(sample_data: pd.DataFrame) -> None:
+    """Test fitting chunk by chunk gives the same scaling as one fit."""
+    fe = FeatureEngineer(scale_features=["Amount"]).fit(sample_data)
+    streamed = FeatureEngineer(scale_features=["Amount"])
+    for start in range(0, len(sample_data), 2):
+        streamed.partial_fit(sample_data.iloc[start : start + 2])
+
+    pd.testing.assert_frame_equal(streamed.transform(sample_data), fe.transform(sample_data))
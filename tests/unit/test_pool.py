@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.serving.pool import POOL_REJECTED, InferencePool, PoolSaturatedError
+
+
+def test_runs_off_event_loop_thread() -> None:
+    """Test that work runs on a pool thread, not the event loop thread."""
+    pool = InferencePool(max_workers=1, max_queue=0)
+
+    async def run() -> int:
+        return await pool.run(threading.get_ident)
+
+    try:
+        worker_thread = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert worker_thread != threading.get_ident()
+
+
+def test_rejects_when_full() -> None:
+    """Test that calls beyond workers plus queue are rejected immediately."""
+    pool = InferencePool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    rejected_before = POOL_REJECTED._value.get()
+
+    async def run() -> list:
+        running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait)
+        release.set()
+        return await asyncio.gather(*running)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert results == [True, True]
+    assert POOL_REJECTED._value.get() == rejected_before + 1
+
+
+def test_cancelled_call_holds_its_slot_until_done() -> None:
+    """Test a cancelled caller's slot is released only when the worker finishes."""
+    pool = InferencePool(max_workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def work() -> None:
+        started.set()
+        release.wait()
+
+    async def run() -> None:
+        task = asyncio.create_task(pool.run(work))
+        await asyncio.to_thread(started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        with pytest.raises(PoolSaturatedError):
+            await asyncio.wait_for(pool.run(work), timeout=1.0)
+        release.set()
+        for _ in range(100):
+            if pool._in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await pool.run(threading.get_ident) != threading.get_ident()
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_invalid_sizes() -> None:
+    """Test that pool sizes are validated."""
+    with pytest.raises(ValueError, match="max_workers"):
+        InferencePool(max_workers=0, max_queue=1)
+    with pytest.raises(ValueError, match="max_queue"):
+        InferencePool(max_workers=1, max_queue=-1)
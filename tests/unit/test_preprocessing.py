@@ -1,7 +1,17 @@
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.data.preprocessing import get_feature_columns, split_data
+from src.data.preprocessing import (
+    SCHEMA,
+    LoadStats,
+    get_feature_columns,
+    iter_data,
+    load_data,
+    split_data,
+)
 
 
 @pytest.fixture
@@ -51,3 +61,51 @@ def test_get_feature_columns(sample_data: pd.DataFrame) -> None:
 ## smoke test for pytest coverage
 def test_training_imports() -> None:
     pass
+
+
+@pytest.fixture
+def transactions() -> pd.DataFrame:
+    """Rows matching the declared schema."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(25, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(25, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1, size=25).round(2)
+    df["Class"] = [0, 1] * 12 + [0]
+    return df
+
+
+def test_load_data_uses_schema_dtypes(transactions: pd.DataFrame, tmp_path: Path) -> None:
+    """Test columns are parsed straight into float32 features and an int8 label."""
+    transactions.to_csv(tmp_path / "data.csv", index=False)
+    stats = LoadStats()
+
+    df = load_data(tmp_path / "data.csv", stats=stats)
+
+    assert df.dtypes.to_dict() == {col: np.dtype(dtype) for col, dtype in SCHEMA.items()}
+    np.testing.assert_allclose(df.to_numpy(), transactions.to_numpy(), rtol=1e-6)
+    assert stats.rows == 25
+    assert stats.files == 1
+    assert stats.memory_bytes == df.memory_usage(deep=True).sum()
+    assert stats.bytes_read == (tmp_path / "data.csv").stat().st_size
+
+
+def test_load_data_chunked_directory_of_parts(transactions: pd.DataFrame, tmp_path: Path) -> None:
+    """Test part files are read in name order and chunking does not change the result."""
+    transactions.iloc[:10].to_csv(tmp_path / "part-000.csv", index=False)
+    transactions.iloc[10:].to_csv(tmp_path / "part-001.csv.gz", index=False)
+    (tmp_path / "_SUCCESS").touch()
+
+    whole = load_data(tmp_path)
+    chunked = load_data(tmp_path, chunksize=4)
+
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert [len(chunk) for chunk in iter_data(tmp_path, chunksize=4)] == [4, 4, 2, 4, 4, 4, 3]
+    np.testing.assert_allclose(whole["V1"], transactions["V1"], rtol=1e-6)
+
+
+def test_load_data_missing_schema_column(transactions: pd.DataFrame, tmp_path: Path) -> None:
+    """Test files without a declared column are rejected."""
+    transactions.drop(columns=["Amount"]).to_csv(tmp_path / "data.csv", index=False)
+
+    with pytest.raises(ValueError, match="Amount"):
+        load_data(tmp_path / "data.csv")
@@ -0,0 +1,95 @@
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.serving.reload import (
+    LoadedModel,
+    ModelWatcher,
+    directory_fingerprint,
+    validate_canary,
+)
+
+
+def _loaded(version: str) -> LoadedModel:
+    """Create a LoadedModel around mock artifacts."""
+    return LoadedModel(model=MagicMock(), feature_engineer=MagicMock(), version=version)
+
+
+def _watcher(
+    versions: list[str | None], validate_fn: MagicMock | None = None
+) -> tuple[ModelWatcher, MagicMock]:
+    """Watcher whose fingerprint walks through ``versions``."""
+    swap_fn = MagicMock()
+    watcher = ModelWatcher(
+        fingerprint_fn=MagicMock(side_effect=versions),
+        load_fn=_loaded,
+        validate_fn=validate_fn or MagicMock(),
+        swap_fn=swap_fn,
+        current_version="v1",
+    )
+    return watcher, swap_fn
+
+
+def test_swaps_on_new_version() -> None:
+    """Test a new, valid version is loaded and swapped in."""
+    watcher, swap_fn = _watcher(["v2", "v2"])
+
+    assert asyncio.run(watcher.check()) is True
+    assert swap_fn.call_args[0][0].version == "v2"
+    assert watcher.current_version == "v2"
+
+
+def test_unchanged_version_is_ignored() -> None:
+    """Test nothing is loaded when the version is unchanged or unavailable."""
+    watcher, swap_fn = _watcher(["v1", None])
+
+    assert asyncio.run(watcher.check()) is False
+    assert asyncio.run(watcher.check()) is False
+    swap_fn.assert_not_called()
+
+
+def test_failed_validation_keeps_current_model() -> None:
+    """Test a version failing validation is not swapped in or retried."""
+    validate_fn = MagicMock(side_effect=ValueError("bad canary"))
+    watcher, swap_fn = _watcher(["v2", "v2"], validate_fn=validate_fn)
+
+    assert asyncio.run(watcher.check()) is False
+    assert asyncio.run(watcher.check()) is False
+    swap_fn.assert_not_called()
+    assert validate_fn.call_count == 1
+    assert watcher.current_version == "v1"
+
+
+def test_artifacts_changing_during_load_defers_swap() -> None:
+    """Test a version that changes mid-load is not swapped in."""
+    watcher, swap_fn = _watcher(["v2", "v3"])
+
+    assert asyncio.run(watcher.check()) is False
+    swap_fn.assert_not_called()
+
+
+def test_directory_fingerprint(tmp_path: Path) -> None:
+    """Test the fingerprint changes when an artifact is rewritten."""
+    assert directory_fingerprint(tmp_path) is None
+
+    (tmp_path / "model.pkl").write_bytes(b"model")
+    (tmp_path / "feature_engineer.pkl").write_bytes(b"fe")
+    before = directory_fingerprint(tmp_path)
+    os.utime(tmp_path / "model.pkl", ns=(0, 1))
+
+    assert before is not None
+    assert directory_fingerprint(tmp_path) != before
+
+
+def test_validate_canary() -> None:
+    """Test the canary check accepts probabilities and rejects bad output."""
+    validate_canary(lambda x: np.full(len(x), 0.5), n_features=29)
+
+    with pytest.raises(ValueError, match="shape"):
+        validate_canary(lambda x: np.array([0.5]), n_features=29)
+    with pytest.raises(ValueError, match=r"outside \[0, 1\]"):
+        validate_canary(lambda x: np.full(len(x), np.nan), n_features=29)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.training.search import best_trial, candidates, run_search
+
+
+@pytest.fixture
+def config() -> dict:
+    """Search config over a small space."""
+    return {
+        "data": {"test_size": 0.2, "random_state": 42},
+        "features": {"target": "Class"},
+        "model": {"params": {"n_estimators": 27, "max_depth": 3, "random_state": 42}},
+        "search": {
+            "strategy": "halving",
+            "n_trials": 6,
+            "n_workers": 2,
+            "min_estimators": 3,
+            "factor": 3,
+            "space": {
+                "max_depth": [2, 4],
+                "learning_rate": {"low": 0.05, "high": 0.5, "log": True},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    """Synthetic transactions with a learnable label."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(1500, 4)), columns=["V1", "V2", "V3", "Amount"])
+    df["Class"] = (df["V1"] + 0.5 * df["V2"] > 1).astype(int)
+    return df
+
+
+def test_grid_candidates_cover_the_space() -> None:
+    """Test grid search enumerates every combination."""
+    space = {"max_depth": [4, 6], "scale_pos_weight": [10, 50, 100]}
+
+    grid = candidates({"strategy": "grid", "space": space})
+
+    assert len(grid) == 6
+    assert {"max_depth": 6, "scale_pos_weight": 100} in grid
+
+
+def test_random_candidates_are_reproducible() -> None:
+    """Test random draws respect ranges, types and the seed."""
+    search = {
+        "strategy": "random",
+        "n_trials": 20,
+        "space": {"max_depth": {"low": 3, "high": 9}, "learning_rate": {"low": 0.01, "high": 0.3}},
+    }
+
+    drawn = candidates(search, random_state=1)
+
+    assert drawn == candidates(search, random_state=1)
+    assert all(isinstance(c["max_depth"], int) and 3 <= c["max_depth"] <= 9 for c in drawn)
+    assert all(0.01 <= c["learning_rate"] <= 0.3 for c in drawn)
+    with pytest.raises(ValueError, match="list of values"):
+        candidates({**search, "strategy": "grid"})
+
+
+def test_halving_search_narrows_candidates(config: dict, df: pd.DataFrame) -> None:
+    """Test each halving rung keeps the best third and triples the rounds."""
+    results = run_search(config, df)
+
+    rungs = [sum(r.num_boost_round == rounds for r in results) for rounds in (3, 9, 27)]
+    best = best_trial(results)
+    first_rung = sorted(
+        (r for r in results if r.num_boost_round == 3), key=lambda r: -r.metrics["roc_auc"]
+    )
+
+    assert rungs == [6, 2, 1]
+    assert best.num_boost_round == 27
+    assert best.trial in {r.trial for r in first_rung[:2]}
+    assert 0.5 < best.metrics["roc_auc"] <= 1.0
@@ -1,7 +1,10 @@
 # tests/unit/test_serving.py
 
+import threading
+import time
 from collections.abc import Generator
-from unittest.mock import MagicMock, mock_open, patch
+from pathlib import Path
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 import numpy as np
 import pytest
@@ -219,3 +222,544 @@ def test_prediction_below_threshold(mock_feature_engineer: MagicMock) -> None:
                 data = response.json()
                 assert data["is_fraud"] is False
                 assert data["fraud_probability"] == 0.3
+
+
+@pytest.mark.parametrize(
+    ("env", "expected_threshold", "is_fraud"),
+    [
+        ({}, 0.65, True),
+        ({"SERVING_DECISION_THRESHOLD": "0.8"}, 0.8, False),
+        ({"SERVING_TARGET_PRECISION": "0.95"}, 0.75, False),
+    ],
+)
+def test_decision_threshold_from_operating_points(
+    mock_model: MagicMock,
+    mock_feature_engineer: MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    env: dict,
+    expected_threshold: float,
+    is_fraud: bool,
+) -> None:
+    """Test the served threshold comes from the model's table unless configured."""
+    from src.serving import app as app_module
+    from src.serving.thresholds import OperatingPoints
+
+    OperatingPoints(
+        threshold=np.array([1.0, 0.75, 0.65, 0.2]),
+        precision=np.array([1.0, 0.96, 0.9, 0.4]),
+        recall=np.array([0.0, 0.5, 0.7, 0.95]),
+        expected_cost=np.array([100.0, 52.0, 40.0, 60.0]),
+        chosen=0.65,
+        fn_cost=100.0,
+        fp_cost=1.0,
+    ).save(tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                health = client.get("/health").json()
+                response = client.post("/predict", json=_transaction(10.0))
+
+    assert health["decision_threshold"] == expected_threshold
+    assert response.json()["is_fraud"] is is_fraud
+
+
+def _transaction(amount: float) -> dict:
+    """Build a valid transaction payload with the given amount."""
+    payload: dict = {f"V{i}": 0.1 * i for i in range(1, 29)}
+    payload["Amount"] = amount
+    return payload
+
+
+def test_predict_batch_preserves_order(
+    client: TestClient, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test batch scores come back in input order from one predict_proba call."""
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    mock_model.predict_proba.side_effect = lambda x: np.column_stack(
+        [1.0 - np.linspace(0.1, 0.9, len(x)), np.linspace(0.1, 0.9, len(x))]
+    )
+    mock_model.predict_proba.reset_mock()
+
+    payload = {"transactions": [_transaction(float(i)) for i in range(5)]}
+    response = client.post("/predict/batch", json=payload)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["n_scored"] == 5
+    assert data["n_failed"] == 0
+    assert [p["index"] for p in data["predictions"]] == [0, 1, 2, 3, 4]
+    assert data["predictions"][0]["fraud_probability"] == pytest.approx(0.1)
+    assert data["predictions"][4]["fraud_probability"] == pytest.approx(0.9)
+    assert data["predictions"][4]["is_fraud"] is True
+    assert mock_model.predict_proba.call_count == 1
+
+
+def test_predict_batch_row_errors_do_not_fail_batch(
+    client: TestClient, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test invalid rows are reported in place while valid rows are scored."""
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+
+    bad_row = _transaction(1.0)
+    bad_row["V3"] = "not_a_number"
+    payload = {"transactions": [_transaction(1.0), bad_row, {"V1": 1.0}]}
+
+    response = client.post("/predict/batch", json=payload)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["n_scored"] == 1
+    assert data["n_failed"] == 2
+    assert data["predictions"][0]["fraud_probability"] == pytest.approx(0.7)
+    assert data["predictions"][0]["error"] is None
+    assert "V3" in data["predictions"][1]["error"]
+    assert data["predictions"][1]["fraud_probability"] is None
+    assert "V2" in data["predictions"][2]["error"]
+
+    features = mock_feature_engineer.transform.call_args[0][0]
+    assert features.shape == (1, 29)
+    assert (features.dtypes == np.float32).all()
+
+
+def test_predict_batch_rejects_empty_batch(client: TestClient) -> None:
+    """Test that an empty batch is a request-level validation error."""
+    response = client.post("/predict/batch", json={"transactions": []})
+    assert response.status_code == 422
+
+
+def test_predict_batch_metrics(
+    client: TestClient, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test batch latency and row-count histograms are labelled by size bucket."""
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.9, 0.1], (len(x), 1))
+
+    client.post("/predict/batch", json={"transactions": [_transaction(1.0)] * 20})
+    metrics = client.get("/metrics").text
+
+    assert 'fraud_batch_prediction_latency_seconds_count{size_bucket="le_100"}' in metrics
+    assert 'fraud_batch_prediction_rows_sum{size_bucket="le_100"}' in metrics
+
+
+def test_predict_with_microbatching(
+    monkeypatch: pytest.MonkeyPatch, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test that /predict is served through the micro-batcher when enabled."""
+    monkeypatch.setenv("SERVING_MICROBATCH_ENABLED", "true")
+    monkeypatch.setenv("SERVING_MICROBATCH_MAX_WAIT_MS", "1")
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+
+    from src.serving import app as app_module
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+
+            with TestClient(app_module.app) as client:
+                assert app_module.state.batcher is not None
+                response = client.post("/predict", json=_transaction(10.0))
+                metrics = client.get("/metrics").text
+
+    assert response.status_code == 200
+    assert response.json()["fraud_probability"] == pytest.approx(0.7)
+    assert app_module.state.batcher is None
+    assert "fraud_microbatch_size_count" in metrics
+    assert "fraud_microbatch_queue_wait_seconds_bucket" in metrics
+
+
+def test_predict_records_stages_and_logs_slow_requests(
+    monkeypatch: pytest.MonkeyPatch, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test /predict times each stage and logs requests over the slow threshold."""
+    from structlog.testing import capture_logs
+
+    monkeypatch.setenv("SERVING_SLOW_REQUEST_MS", "0")
+    from src.serving import app as app_module
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                with capture_logs() as logs:
+                    response = client.post("/predict", json=_transaction(10.0))
+                    client.get("/health")
+                metrics = client.get("/metrics").text
+
+    assert response.status_code == 200
+    stages = ["validate", "features", "queue", "dataframe", "transform", "predict", "serialize"]
+    for stage in stages:
+        assert f'fraud_request_stage_seconds_count{{endpoint="predict",stage="{stage}"}}' in metrics
+    (slow,) = [log for log in logs if log["event"] == "slow_request"]
+    assert slow["endpoint"] == "predict"
+    assert slow["status"] == 200
+    assert slow["model_version"] == app_module.directory_fingerprint(Path("models"))
+    assert slow["total_ms"] >= slow["predict_ms"] > 0
+    assert {f"{stage}_ms" for stage in stages} <= set(slow)
+
+
+def test_predict_feeds_the_drift_monitor(
+    mock_model: MagicMock,
+    mock_feature_engineer: MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test both endpoints add raw inputs and scores to the model's drift histograms."""
+    from src.serving import app as app_module
+    from src.serving.drift import build_reference
+
+    rng = np.random.default_rng(0)
+    n_features = len(app_module.FEATURE_COLUMNS)
+    build_reference(
+        app_module.FEATURE_COLUMNS, rng.normal(size=(1000, n_features)), rng.uniform(size=1000)
+    ).save(tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                client.post("/predict", json=_transaction(10.0))
+                client.post("/predict/batch", json={"transactions": [_transaction(5.0)] * 3})
+                monitor = app_module.state.active.drift
+                assert monitor is not None
+                counts = monitor._live.counts.copy()
+
+    np.testing.assert_array_equal(counts.sum(axis=1), 4)
+    score_bin = (0.7 >= monitor.reference.edges[-1]).sum()
+    assert counts[-1, score_bin] == 4
+
+
+def test_predict_appends_velocity_features_per_entity(
+    mock_model: MagicMock,
+    mock_feature_engineer: MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test both endpoints score with the entity's earlier transactions appended."""
+    from src.features.velocity import VelocitySpec
+    from src.serving import app as app_module
+
+    VelocitySpec("card", windows=(3600.0,)).save(tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    monkeypatch.setenv("SERVING_WARMUP_ENABLED", "false")
+    seen = []
+    mock_feature_engineer.transform.side_effect = lambda df: seen.append(df.copy()) or df
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                client.post("/predict", json={**_transaction(10.0), "entity_id": "c1"})
+                rows = [
+                    {**_transaction(20.0), "entity_id": "c1"},
+                    {**_transaction(30.0), "entity_id": "c2"},
+                    _transaction(40.0),
+                ]
+                response = client.post("/predict/batch", json={"transactions": rows})
+
+    assert response.json()["n_scored"] == 3
+    single, batch = seen
+    assert list(single.columns[-4:]) == ["Amount", *VelocitySpec("card", (3600.0,)).feature_names]
+    assert single["txn_count_3600s"].tolist() == [0.0]
+    assert batch["txn_count_3600s"].tolist() == [1.0, 0.0, 0.0]
+    assert batch["amount_sum_3600s"].tolist() == [10.0, 0.0, 0.0]
+
+
+def test_predict_records_velocity_only_for_scored_transactions(
+    mock_model: MagicMock,
+    mock_feature_engineer: MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a shed or failed /predict leaves the entity's history unchanged."""
+    from src.features.velocity import VelocitySpec
+    from src.serving import app as app_module
+
+    VelocitySpec("card", windows=(3600.0,)).save(tmp_path)
+    monkeypatch.setenv("SERVING_MODEL_DIR", str(tmp_path))
+    monkeypatch.setenv("SERVING_WARMUP_ENABLED", "false")
+    monkeypatch.setenv("SERVING_INFERENCE_WORKERS", "1")
+    monkeypatch.setenv("SERVING_INFERENCE_QUEUE_SIZE", "0")
+    seen = []
+    mock_feature_engineer.transform.side_effect = lambda df: seen.append(df.copy()) or df
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+    transaction = {**_transaction(10.0), "entity_id": "c1"}
+    release = threading.Event()
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app, raise_server_exceptions=False) as client:
+                pool = app_module.state.pool
+                assert pool is not None
+                try:
+                    client.portal.start_task_soon(pool.run, release.wait)
+                    while pool._in_flight < pool.capacity:
+                        time.sleep(0.001)
+                    shed = client.post("/predict", json=transaction)
+                finally:
+                    release.set()
+                while pool._in_flight:
+                    time.sleep(0.001)
+
+                mock_model.predict_proba.side_effect = RuntimeError("boom")
+                failed = client.post("/predict", json=transaction)
+                mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+                client.post("/predict", json=transaction)
+                client.post("/predict", json=transaction)
+
+    assert shed.status_code == 503
+    assert failed.status_code == 500
+    assert [df["txn_count_3600s"].item() for df in seen] == [0.0, 0.0, 1.0]
+    assert seen[-1]["amount_sum_3600s"].item() == 10.0
+
+
+def test_profile_endpoint_is_opt_in(
+    monkeypatch: pytest.MonkeyPatch, mock_model: MagicMock, mock_feature_engineer: MagicMock
+) -> None:
+    """Test /debug/profile is off by default and returns collapsed stacks when enabled.
+
+    Sampling intervals under a millisecond are rejected.
+    """
+    from src.serving import app as app_module
+
+    responses = []
+    for enabled in ("false", "true"):
+        monkeypatch.setenv("SERVING_PROFILING_ENABLED", enabled)
+        with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+            with patch.object(app_module.pickle, "load") as mock_pickle:
+                mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+                with TestClient(app_module.app) as client:
+                    responses.append(client.get("/debug/profile", params={"seconds": 0.05}))
+                    too_fine = client.get(
+                        "/debug/profile", params={"seconds": 0.05, "interval_ms": 0.5}
+                    )
+
+    disabled, enabled_response = responses
+    assert too_fine.status_code == 422
+    assert disabled.status_code == 404
+    assert enabled_response.status_code == 200
+    lines = enabled_response.text.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+
+
+def test_predict_with_native_engine(
+    monkeypatch: pytest.MonkeyPatch, mock_feature_engineer: MagicMock, tmp_path: Path
+) -> None:
+    """Test that the native tree engine serves predictions matching the booster."""
+    import xgboost as xgb
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(500, 29)).astype(np.float32)
+    model = xgb.XGBClassifier(n_estimators=10, max_depth=3).fit(x, (x[:, 0] > 0.5).astype(int))
+
+    monkeypatch.setenv("SERVING_MODEL_ENGINE", "native")
+    monkeypatch.chdir(tmp_path)
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+
+    from src.serving import app as app_module
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [model, mock_feature_engineer]
+
+            with TestClient(app_module.app) as client:
+                assert app_module.state.active.tree_engine is not None
+                payload = _transaction(10.0)
+                response = client.post("/predict", json=payload)
+
+    expected = model.predict_proba(np.array([list(payload.values())], dtype=np.float32))[0, 1]
+    assert response.status_code == 200
+    assert response.json()["fraud_probability"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_explain_returns_top_contributions_and_caches_rows(
+    mock_feature_engineer: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test explanations add up to the model's score and repeated rows come from the cache."""
+    import xgboost as xgb
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(500, 29)).astype(np.float32)
+    model = xgb.XGBClassifier(n_estimators=10, max_depth=3).fit(x, (x[:, 0] > 0.5).astype(int))
+    monkeypatch.chdir(tmp_path)
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+
+    from src.serving import app as app_module
+
+    payload = {**_transaction(10.0), "V1": 2.0}
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                single = client.post("/explain", json=payload, params={"top_k": 3}).json()
+                batch = client.post(
+                    "/explain/batch", json={"transactions": [payload, {"V1": "x"}]}
+                ).json()
+                cached = len(app_module.state.explanations)
+                metrics = client.get("/metrics").text
+
+    expected = model.predict_proba(np.array([list(payload.values())], dtype=np.float32))[0, 1]
+    assert single["fraud_probability"] == pytest.approx(expected, abs=1e-6)
+    assert len(single["contributions"]) == 3
+    assert single["contributions"][0]["feature"] == "V1"
+    assert single["contributions"][0]["value"] == 2.0
+    magnitudes = [abs(c["contribution"]) for c in single["contributions"]]
+    assert magnitudes == sorted(magnitudes, reverse=True)
+
+    assert batch["n_explained"] == 1
+    assert batch["n_failed"] == 1
+    assert batch["explanations"][0]["explanation"] == single | {"contributions": ANY}
+    assert "V1" in batch["explanations"][1]["error"]
+    assert cached == 1
+    assert 'fraud_explain_cache_total{result="hit"} 1.0' in metrics
+    assert 'fraud_explain_latency_seconds_count{endpoint="explain"} 1.0' in metrics
+
+
+def test_predict_sheds_load_when_pool_full(client: TestClient) -> None:
+    """Test that a saturated inference pool returns a fast 503 and health stays up."""
+    from src.serving import app as app_module
+
+    pool = app_module.state.pool
+    assert pool is not None
+    pool._in_flight = pool.capacity
+    try:
+        response = client.post("/predict", json=_transaction(10.0))
+        health = client.get("/health")
+    finally:
+        pool._in_flight = 0
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert "fraud_inference_pool_rejected_total" in client.get("/metrics").text
+
+
+def test_health_reports_model_version(client: TestClient) -> None:
+    """Test the active model version is exposed on /health and /metrics."""
+    from src.serving import app as app_module
+
+    version = client.get("/health").json()["model_version"]
+
+    assert version == app_module.state.active.version
+    assert f'fraud_model_info{{version="{version}"}} 1.0' in client.get("/metrics").text
+
+
+def test_model_swap_serves_new_version(client: TestClient) -> None:
+    """Test that activating a new model swaps predictions and the reported version."""
+    from src.serving import app as app_module
+    from src.serving.reload import LoadedModel
+
+    new_model = MagicMock()
+    new_model.predict_proba.return_value = np.array([[0.9, 0.1]])
+    current = app_module.state.active
+    app_module._activate(
+        LoadedModel(model=new_model, feature_engineer=current.feature_engineer, version="v2")
+    )
+
+    response = client.post("/predict", json=_transaction(10.0))
+
+    assert response.json()["fraud_probability"] == pytest.approx(0.1)
+    assert client.get("/health").json()["model_version"] == "v2"
+    assert 'fraud_predictions_total{model_version="v2",result="not_fraud"}' in (
+        client.get("/metrics").text
+    )
+
+
+def test_prediction_cache_serves_repeats_until_the_model_changes(
+    mock_model: MagicMock, mock_feature_engineer: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test repeated payloads skip scoring and a model swap empties the cache."""
+    from src.serving import app as app_module
+    from src.serving.reload import LoadedModel
+
+    monkeypatch.setenv("SERVING_PREDICTION_CACHE_SIZE", "100")
+    monkeypatch.setenv("SERVING_WARMUP_ENABLED", "false")
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [mock_model, mock_feature_engineer]
+            with TestClient(app_module.app) as client:
+                first = client.post("/predict", json=_transaction(10.0)).json()
+                second = client.post("/predict", json=_transaction(10.0)).json()
+                client.post("/predict", json=_transaction(11.0))
+                scored = mock_model.predict_proba.call_count
+
+                app_module._activate(
+                    LoadedModel(
+                        model=mock_model, feature_engineer=mock_feature_engineer, version="v2"
+                    )
+                )
+                cached_after_swap = len(app_module.state.predictions)
+                client.post("/predict", json=_transaction(10.0))
+                metrics = client.get("/metrics").text
+
+    assert second == first
+    assert scored == 2
+    assert cached_after_swap == 0
+    assert mock_model.predict_proba.call_count == 3
+    assert 'fraud_prediction_cache_total{result="hit"} 1.0' in metrics
+    assert 'fraud_prediction_cache_total{result="miss"} 3.0' in metrics
+    assert 'fraud_prediction_cache_evictions_total{reason="cleared"} 2.0' in metrics
+
+
+def test_shadow_model_scores_traffic_in_the_background(
+    mock_model: MagicMock,
+    mock_feature_engineer: MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a shadow model's decisions are compared with the primary's after responding."""
+    import time
+
+    from prometheus_client import REGISTRY
+
+    from src.serving import app as app_module
+
+    monkeypatch.setenv("SERVING_SHADOW_SOURCE", "directory")
+    monkeypatch.setenv("SERVING_SHADOW_MODEL_DIR", str(tmp_path))
+    monkeypatch.setenv("SERVING_SHADOW_INTERVAL_MS", "5")
+    shadow_model = MagicMock()
+    shadow_model.predict_proba.side_effect = lambda x: np.tile([0.8, 0.2], (len(x), 1))
+    mock_model.predict_proba.side_effect = lambda x: np.tile([0.3, 0.7], (len(x), 1))
+    mock_feature_engineer.transform.side_effect = lambda df: df.to_numpy()
+    labels = {"primary": "fraud", "shadow": "not_fraud"}
+    before = REGISTRY.get_sample_value("fraud_shadow_decisions_total", labels) or 0.0
+
+    with patch.object(app_module, "open", mock_open(read_data=b"mock_pickle_data")):
+        with patch.object(app_module.pickle, "load") as mock_pickle:
+            mock_pickle.side_effect = [
+                mock_model,
+                mock_feature_engineer,
+                shadow_model,
+                mock_feature_engineer,
+            ]
+            with TestClient(app_module.app) as client:
+                response = client.post("/predict", json=_transaction(10.0))
+                client.post("/predict/batch", json={"transactions": [_transaction(5.0)] * 2})
+                health = client.get("/health").json()
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    after = REGISTRY.get_sample_value("fraud_shadow_decisions_total", labels)
+                    if after == before + 3:
+                        break
+                    time.sleep(0.01)
+
+    assert response.json()["fraud_probability"] == pytest.approx(0.7)
+    assert health["shadow_model_version"] == "unknown"
+    assert after == before + 3
+    assert app_module.state.shadow is None
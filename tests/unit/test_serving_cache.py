@@ -0,0 +1,78 @@
+# tests/unit/test_serving_cache.py
+
+import time
+import warnings
+
+import numpy as np
+
+from src.serving.cache import LRUCache, row_key
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Test a full cache drops the entry that was read or written longest ago."""
+    cache: LRUCache[int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_row_key_depends_on_version_and_values() -> None:
+    """Test keys match for equal rows of one version only."""
+    row = np.arange(29, dtype=np.float32)
+
+    assert row_key("v1", row) == row_key("v1", row.copy())
+    assert row_key("v1", row) != row_key("v2", row)
+    assert row_key("v1", row) != row_key("v1", row + 1)
+
+
+def test_row_key_rounds_to_the_given_decimals() -> None:
+    """Test rows equal after rounding, including signed zeros, share a key."""
+    row = np.array([0.1234561, -0.0000001], dtype=np.float32)
+    close = np.array([0.1234559, 0.0], dtype=np.float32)
+
+    assert row_key("v1", row, decimals=6) == row_key("v1", close, decimals=6)
+    assert row_key("v1", row) != row_key("v1", close)
+
+
+def test_row_key_handles_non_finite_and_huge_values() -> None:
+    """Test quantised keys stay distinct for infinities, NaN and out-of-int64 values."""
+    rows = [
+        np.array([np.inf, 1.0], dtype=np.float32),
+        np.array([-np.inf, 1.0], dtype=np.float32),
+        np.array([np.nan, 1.0], dtype=np.float32),
+        np.array([3e38, 1.0], dtype=np.float32),
+        np.array([-3e38, 1.0], dtype=np.float32),
+    ]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        keys = [row_key("v1", row, decimals=6) for row in rows]
+
+    assert len(set(keys)) == len(rows)
+    assert keys[0] == row_key("v1", rows[0].copy(), decimals=6)
+
+
+def test_lru_cache_expires_entries_and_reports_evictions() -> None:
+    """Test entries older than the TTL miss and every drop reaches on_evict."""
+    evicted: list[tuple[str, int]] = []
+    cache: LRUCache[int] = LRUCache(
+        max_entries=2, ttl_seconds=0.05, on_evict=lambda reason, n: evicted.append((reason, n))
+    )
+    cache.put("a", 1)
+    time.sleep(0.06)
+    cache.put("b", 2)
+    assert cache.get("a") is None
+    cache.put("c", 3)
+    cache.put("d", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("d") == 4
+    cache.clear()
+
+    assert evicted == [("expired", 1), ("capacity", 1), ("cleared", 2)]
@@ -0,0 +1,75 @@
+# tests/unit/test_shadow.py
+
+import asyncio
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from src.serving.shadow import ShadowScorer
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _decisions(primary: str, shadow: str) -> float:
+    return _sample("fraud_shadow_decisions_total", primary=primary, shadow=shadow)
+
+
+def test_queued_rows_are_scored_together_in_the_background() -> None:
+    """Test submissions return at once and are scored later as one batch of aggregates."""
+    batches: list[int] = []
+
+    def score_fn(x: np.ndarray) -> np.ndarray:
+        batches.append(len(x))
+        return x[:, 0]
+
+    before = {
+        key: _decisions(*key)
+        for key in [("fraud", "fraud"), ("fraud", "not_fraud"), ("not_fraud", "not_fraud")]
+    }
+    deltas_before = _sample("fraud_shadow_score_delta_count")
+
+    async def run() -> None:
+        scorer = ShadowScorer(score_fn, n_features=2, threshold=0.5, interval_seconds=0.01)
+        await scorer.start()
+        try:
+            features = np.array([[0.9, 0.0], [0.2, 0.0], [0.1, 0.0]], dtype=np.float32)
+            scorer.submit(features[:1], np.array([0.8]), np.array([True]))
+            scorer.submit(features[1:], np.array([0.9, 0.1]), np.array([True, False]))
+            assert batches == []
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if batches:
+                    break
+        finally:
+            await scorer.stop()
+
+    asyncio.run(run())
+
+    assert batches == [3]
+    assert _decisions("fraud", "fraud") == before[("fraud", "fraud")] + 1
+    assert _decisions("fraud", "not_fraud") == before[("fraud", "not_fraud")] + 1
+    assert _decisions("not_fraud", "not_fraud") == before[("not_fraud", "not_fraud")] + 1
+    assert _sample("fraud_shadow_score_delta_count") == deltas_before + 3
+
+
+def test_submit_drops_rows_beyond_the_queue_or_schema_and_samples() -> None:
+    """Test the queue is bounded, mismatched inputs are dropped and sampling thins rows."""
+    scorer = ShadowScorer(lambda x: x[:, 0], n_features=2, threshold=0.5, max_queue=2)
+    full_before = _sample("fraud_shadow_dropped_total", reason="queue_full")
+    schema_before = _sample("fraud_shadow_dropped_total", reason="schema")
+    rows = np.zeros((3, 2), dtype=np.float32)
+    scores, decisions = np.zeros(3), np.zeros(3, dtype=bool)
+
+    scorer.submit(rows[:2], scores[:2], decisions[:2])
+    scorer.submit(rows[:1], scores[:1], decisions[:1])
+    scorer.submit(np.zeros((1, 5), dtype=np.float32), scores[:1], decisions[:1])
+
+    assert _sample("fraud_shadow_dropped_total", reason="queue_full") == full_before + 1
+    assert _sample("fraud_shadow_dropped_total", reason="schema") == schema_before + 1
+
+    unsampled = ShadowScorer(lambda x: x[:, 0], n_features=2, threshold=0.5, sample_rate=0.0)
+    unsampled.submit(rows, scores, decisions)
+    unsampled.submit(rows[:1], scores[:1], decisions[:1])
+    assert unsampled._take_batch() is None
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.features.feature_engineering import FeatureEngineer
+from src.serving.artifacts import save_bundle
+from src.serving.startup import StartupProfile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+COLUMNS = [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+# Import + load + warmup for the bundle and native engine, measured in a fresh
+# interpreter. Locally this takes well under a second; the budget leaves
+# headroom for slow CI runners while still catching an eager heavy import.
+COLD_START_BUDGET_SECONDS = 2.0
+
+
+def test_profile_records_phases() -> None:
+    """Test phases are timed and summed into the total."""
+    profile = StartupProfile()
+    profile.record("import", 0.25)
+    with profile.phase("load"):
+        pass
+
+    report = profile.report()
+
+    assert list(report) == ["import", "load", "total"]
+    assert report["total"] == report["import"] + report["load"]
+
+
+def test_native_bundle_cold_start_within_budget(tmp_path: Path) -> None:
+    """Test a cold start serves without heavy imports and within budget."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, len(COLUMNS))), columns=COLUMNS)
+    fe = FeatureEngineer(scale_features=["Amount"])
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=4)
+    model.fit(fe.fit_transform(df), (df["V1"] > 0).astype(int))
+    save_bundle(model, fe, tmp_path)
+
+    env = {
+        **os.environ,
+        "SERVING_MODEL_DIR": str(tmp_path),
+        "SERVING_MODEL_ENGINE": "native",
+    }
+    result = subprocess.run(
+        [sys.executable, "-m", "src.serving.startup", "--json"],
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["heavy_modules"] == []
+    assert set(report["phases"]) == {"import", "load", "warmup", "total"}
+    assert report["phases"]["total"] < COLD_START_BUDGET_SECONDS
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.preprocessing import SCHEMA, load_data
+from src.training.streaming import hash_split, train_model_streaming
+
+COLUMNS = [col for col in SCHEMA if col != "Time"]
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> dict:
+    """Training config over a small synthetic extract split into part files."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(2000, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(2000, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1, size=2000).round(2)
+    df["Class"] = (df["V1"] + df["V2"] > 1.5).astype(int)
+    (tmp_path / "data").mkdir()
+    for i in range(4):
+        df.iloc[i * 500 : (i + 1) * 500].to_csv(tmp_path / "data" / f"part-{i}.csv", index=False)
+
+    return {
+        "data": {
+            "source": str(tmp_path / "data"),
+            "chunksize": 300,
+            "test_size": 0.2,
+            "random_state": 42,
+        },
+        "features": {"exclude": ["Time", "Class"], "target": "Class"},
+        "model": {"params": {"n_estimators": 20, "max_depth": 3, "random_state": 42}},
+        "training": {"streaming": True},
+    }
+
+
+def test_hash_split_is_chunking_independent() -> None:
+    """Test a row's side does not depend on how the data is chunked."""
+    rng = np.random.default_rng(1)
+    features = pd.DataFrame(rng.normal(size=(10_000, 3)), columns=["a", "b", "c"])
+
+    whole = hash_split(features, test_size=0.2, random_state=42)
+    chunked = np.concatenate(
+        [hash_split(features.iloc[i : i + 999], 0.2, 42) for i in range(0, 10_000, 999)]
+    )
+
+    np.testing.assert_array_equal(whole, chunked)
+    assert whole.mean() == pytest.approx(0.2, abs=0.02)
+    assert not np.array_equal(whole, hash_split(features, test_size=0.2, random_state=7))
+
+
+@pytest.mark.parametrize("external_memory", [False, True])
+def test_streaming_training(config: dict, external_memory: bool) -> None:
+    """Test streaming training fits on the train side and scores the test side."""
+    config["training"]["external_memory"] = external_memory
+
+    model, fe, metrics, _, reference = train_model_streaming(config, COLUMNS)
+
+    df = load_data(config["data"]["source"], columns=COLUMNS)
+    features = df.drop(columns=["Class"])
+    is_test = hash_split(features, test_size=0.2, random_state=42)
+    x_test = fe.transform(features[is_test])
+    assert list(model.get_booster().feature_names) == list(x_test.columns)
+    assert fe.scaler.n_samples_seen_ == (~is_test).sum()
+    assert fe.scaler.mean_[0] == pytest.approx(features.loc[~is_test, "Amount"].mean(), rel=1e-5)
+    assert metrics["roc_auc"] > 0.9
+    assert reference.names == [*x_test.columns, "fraud_probability"]
+    np.testing.assert_allclose(reference.proportions.sum(axis=1), 1.0)
+    assert metrics["accuracy"] == pytest.approx(
+        (model.predict(x_test) == df.loc[is_test, "Class"]).mean()
+    )
+
+
+def test_external_memory_needs_xgboost_3(config: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test external memory fails up front on an xgboost without ExtMemQuantileDMatrix."""
+    import xgboost as xgb
+
+    monkeypatch.delattr(xgb, "ExtMemQuantileDMatrix")
+    config["training"]["external_memory"] = True
+
+    with pytest.raises(RuntimeError, match="xgboost>=3.0"):
+        train_model_streaming(config, COLUMNS)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.serving.thresholds import OperatingPoints, build_operating_points, resolve_threshold
+from src.training.evaluate import evaluate_scores
+
+
+@pytest.fixture
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    """Imbalanced labels with overlapping float32 scores."""
+    rng = np.random.default_rng(0)
+    y = (rng.random(20_000) < 0.01).astype(int)
+    scores = np.clip(rng.beta(1, 12, size=len(y)) + y * rng.beta(4, 3, size=len(y)), 0, 1)
+    return y, scores.astype(np.float32)
+
+
+def _cost_at(y: np.ndarray, scores: np.ndarray, threshold: float, fn_cost: float) -> float:
+    flagged = scores > threshold
+    return float(np.sum(flagged & (y == 0)) + fn_cost * np.sum(~flagged & (y == 1)))
+
+
+def test_chosen_threshold_minimises_expected_cost(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test the chosen threshold is the cheapest of every distinct score."""
+    y, scores = scored
+    points = build_operating_points(evaluate_scores(y, scores), fn_cost=50.0, fp_cost=1.0)
+
+    brute_force = min(_cost_at(y, scores, t, 50.0) for t in [1.0, *np.unique(scores)])
+
+    assert _cost_at(y, scores, points.chosen, 50.0) == brute_force
+    assert points.expected_cost.min() == brute_force
+    assert points.chosen < 0.5
+
+
+def test_table_is_compact_and_exact(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test each stored point describes what serving at its threshold flags."""
+    y, scores = scored
+    points = build_operating_points(
+        evaluate_scores(y, scores), fn_cost=50.0, fp_cost=1.0, max_points=21
+    )
+
+    assert len(points.threshold) <= 22
+    assert np.all(np.diff(points.threshold) < 0)
+    for threshold, precision, recall in zip(
+        points.threshold, points.precision, points.recall, strict=True
+    ):
+        flagged = scores > threshold
+        if flagged.any():
+            assert precision == pytest.approx(y[flagged].mean())
+        assert recall == pytest.approx(y[flagged].sum() / y.sum())
+
+
+def test_precision_target_picks_highest_recall(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test a precision target resolves to the lowest threshold reaching it."""
+    y, scores = scored
+    points = build_operating_points(evaluate_scores(y, scores), fn_cost=50.0, fp_cost=1.0)
+
+    threshold = points.for_precision(0.9)
+
+    assert y[scores > threshold].mean() >= 0.9
+    assert all(
+        p < 0.9 for p, t in zip(points.precision, points.threshold, strict=True) if t < threshold
+    )
+    assert points.for_precision(1.01) == points.threshold[np.argmax(points.precision)]
+
+
+def test_resolve_threshold_precedence(
+    scored: tuple[np.ndarray, np.ndarray], tmp_path: Path
+) -> None:
+    """Test target precision beats an explicit threshold, which beats the stored optimum."""
+    y, scores = scored
+    build_operating_points(evaluate_scores(y, scores), fn_cost=50.0, fp_cost=1.0).save(tmp_path)
+    points = OperatingPoints.load(tmp_path)
+    assert points is not None
+
+    assert resolve_threshold(points, 0.7, 0.9) == points.for_precision(0.9)
+    assert resolve_threshold(points, 0.7) == 0.7
+    assert resolve_threshold(points) == points.chosen
+    assert resolve_threshold(OperatingPoints.load(tmp_path / "missing"), None, 0.9) == 0.5
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.training.train import train_model
+
+
+def _write_extract(path: Path, n_rows: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n_rows, 28)), columns=[f"V{i}" for i in range(1, 29)])
+    df.insert(0, "Time", np.arange(n_rows, dtype=float))
+    df["Amount"] = rng.lognormal(3, 1, size=n_rows).round(2)
+    df["Class"] = (df["V1"] + df["V2"] + rng.normal(scale=0.5, size=n_rows) > 1.5).astype(int)
+    df["Card"] = rng.integers(0, 50, size=n_rows)
+    df.to_csv(path, index=False)
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> dict:
+    """In-memory training config over a small synthetic extract."""
+    _write_extract(tmp_path / "history.csv", 3000, seed=0)
+    _write_extract(tmp_path / "new.csv", 1000, seed=1)
+    return {
+        "data": {"source": str(tmp_path / "history.csv"), "test_size": 0.2, "random_state": 42},
+        "features": {"exclude": ["Time", "Class"], "target": "Class"},
+        "model": {
+            "params": {
+                "n_estimators": 300,
+                "max_depth": 3,
+                "learning_rate": 0.3,
+                "random_state": 42,
+                "eval_metric": "auc",
+            }
+        },
+        "training": {"incremental_source": str(tmp_path / "new.csv"), "incremental_rounds": 10},
+    }
+
+
+def test_early_stopping_keeps_trees_up_to_best_iteration(config: dict) -> None:
+    """Test early stopping halts before n_estimators and drops the trees after the best."""
+    config["training"]["early_stopping_rounds"] = 5
+
+    model, _, metrics, _, _ = train_model(config)
+
+    n_trees = model.get_booster().num_boosted_rounds()
+    assert metrics["best_iteration"] + 1 == n_trees == metrics["trees_added"]
+    assert n_trees < 300
+    assert metrics["roc_auc"] > 0.9
+
+
+def test_incremental_training_extends_the_base_model(config: dict) -> None:
+    """Test incremental training adds trees on top of the base and reuses its scaler."""
+    config["model"]["params"]["n_estimators"] = 30
+    base_model, base_fe, _, _, _ = train_model(config)
+
+    model, fe, metrics, _, _ = train_model(config, base=(base_model, base_fe))
+
+    assert fe is base_fe
+    assert metrics["trees_added"] == 10
+    assert model.get_booster().num_boosted_rounds() == 40
+    base_dump = base_model.get_booster().get_dump()
+    assert model.get_booster().get_dump()[:30] == base_dump
+
+
+def test_streaming_rejects_early_stopping(config: dict) -> None:
+    """Test streaming training refuses modes it does not implement."""
+    config["training"].update(streaming=True, early_stopping_rounds=5)
+
+    with pytest.raises(ValueError, match="Streaming"):
+        train_model(config)
+
+
+def test_drift_reference_bins_training_features_and_test_scores(config: dict) -> None:
+    """Test the drift reference covers every model input plus the score."""
+    config["drift"] = {"n_bins": 10}
+
+    model, _, _, _, reference = train_model(config)
+
+    assert reference.names == [*model.get_booster().feature_names, "fraud_probability"]
+    assert reference.proportions.shape == (30, 10)
+    np.testing.assert_allclose(reference.proportions.sum(axis=1), 1.0)
+    # Quantile bins of a continuous feature hold equal shares of the training rows.
+    np.testing.assert_allclose(reference.proportions[0], 0.1, atol=0.01)
+
+
+def test_velocity_features_are_replayed_per_entity(config: dict) -> None:
+    """Test an entity column adds velocity features after the schema features."""
+    config["features"].update(entity_column="Card", velocity={"windows": [30], "capacity": 4})
+    config["model"]["params"]["n_estimators"] = 20
+
+    model, _, _, _, reference = train_model(config)
+
+    velocity_names = ["txn_count_30s", "amount_sum_30s", "amount_zscore_30s"]
+    assert model.get_booster().feature_names[-4:] == ["Amount", *velocity_names]
+    assert reference.names[-4:-1] == velocity_names
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from src.serving.tree_engine import TreeEnsemble
+
+
+@pytest.fixture(scope="module")
+def trained_model() -> xgb.XGBClassifier:
+    """Train a small classifier on synthetic data."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(2000, 6)).astype(np.float32)
+    y = (x[:, 0] + 0.5 * x[:, 1] * x[:, 2] + rng.normal(scale=0.5, size=2000) > 1).astype(int)
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=4, scale_pos_weight=5, random_state=0)
+    model.fit(x, y)
+    return model
+
+
+@pytest.fixture
+def rows() -> np.ndarray:
+    """Rows to score, spanning more than one evaluation chunk."""
+    return np.random.default_rng(1).normal(size=(1500, 6)).astype(np.float32)
+
+
+def test_matches_predict_proba(trained_model: xgb.XGBClassifier, rows: np.ndarray) -> None:
+    """Test native scores match the XGBoost booster."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+
+    np.testing.assert_allclose(
+        engine.predict_proba(rows), trained_model.predict_proba(rows), atol=1e-6
+    )
+    assert engine.n_trees == 20
+    assert engine.max_depth <= 4
+
+
+def test_missing_values_follow_default_direction(
+    trained_model: xgb.XGBClassifier, rows: np.ndarray
+) -> None:
+    """Test NaN inputs take each split's default branch."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+    rows[::3, 0] = np.nan
+
+    np.testing.assert_allclose(
+        engine.predict_proba(rows)[:, 1], trained_model.predict_proba(rows)[:, 1], atol=1e-6
+    )
+
+
+def test_infinite_values_match_predict_proba(
+    trained_model: xgb.XGBClassifier, rows: np.ndarray
+) -> None:
+    """Test +-inf inputs end on the same leaves as in XGBoost."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+    rows[::3, 0] = np.inf
+    rows[1::3, 1] = -np.inf
+
+    np.testing.assert_allclose(
+        engine.predict_proba(rows)[:, 1], trained_model.predict_proba(rows)[:, 1], atol=1e-6
+    )
+
+
+def test_single_row(trained_model: xgb.XGBClassifier, rows: np.ndarray) -> None:
+    """Test a 1-D row is scored like a one-row batch."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+
+    result = engine.predict_proba(rows[0])
+
+    assert result.shape == (1, 2)
+    assert result[0, 1] == pytest.approx(trained_model.predict_proba(rows[:1])[0, 1], abs=1e-6)
+
+
+def test_save_and_load_roundtrip(
+    trained_model: xgb.XGBClassifier, rows: np.ndarray, tmp_path: Path
+) -> None:
+    """Test node tables survive a save/load, including memory-mapped loads."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+    engine.save(tmp_path / "trees")
+
+    loaded = TreeEnsemble.load(tmp_path / "trees", mmap_mode="r")
+
+    assert isinstance(loaded.left, np.memmap)
+    np.testing.assert_array_equal(loaded.predict_margin(rows), engine.predict_margin(rows))
+
+
+def test_rejects_wrong_feature_count(trained_model: xgb.XGBClassifier) -> None:
+    """Test input width is validated."""
+    engine = TreeEnsemble.from_booster(trained_model.get_booster())
+
+    with pytest.raises(ValueError, match="Expected 6 features"):
+        engine.predict_proba(np.zeros((2, 5), dtype=np.float32))
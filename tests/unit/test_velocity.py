@@ -0,0 +1,103 @@
+# tests/unit/test_velocity.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.velocity import VelocitySpec, VelocityStore, add_velocity_features
+
+
+def _brute_force(
+    history: list[tuple[float, float]], time: float, amount: float, spec: VelocitySpec
+) -> list[float]:
+    """Velocity features recomputed from an entity's full history."""
+    recent = history[-spec.capacity :]
+    features: list[float] = []
+    for window in spec.windows:
+        amounts = np.array([a for t, a in recent if time - t <= window])
+        zscore = 0.0
+        if len(amounts) > 1 and amounts.std() > 0:
+            zscore = (amount - amounts.mean()) / amounts.std()
+        features += [float(len(amounts)), float(amounts.sum()), zscore]
+    return features
+
+
+def test_store_matches_brute_force_windows() -> None:
+    """Test the incremental window aggregates equal a recomputation from raw history."""
+    spec = VelocitySpec("card", windows=(10.0, 100.0), capacity=5)
+    store = VelocityStore(spec)
+    rng = np.random.default_rng(0)
+    histories: dict[int, list[tuple[float, float]]] = {}
+    time = 0.0
+    for _ in range(2000):
+        time += float(rng.exponential(2.0))
+        entity = int(rng.integers(0, 20))
+        amount = float(rng.lognormal(3, 1))
+        history = histories.setdefault(entity, [])
+
+        features = store.update(entity, time, amount)
+
+        np.testing.assert_allclose(features, _brute_force(history, time, amount, spec), atol=1e-6)
+        history.append((time, amount))
+
+
+def test_store_evicts_least_recent_entity_and_expires_stale_history() -> None:
+    """Test the LRU bound recycles slots and history older than every window is dropped."""
+    store = VelocityStore(VelocitySpec("card", windows=(60.0,)), max_entities=2)
+    store.update("a", 0.0, 10.0)
+    store.update("b", 1.0, 10.0)
+    store.update("a", 2.0, 10.0)
+    store.update("c", 3.0, 10.0)  # evicts "b", the least recently seen
+
+    assert len(store) == 2
+    assert store.update("b", 4.0, 10.0)[0] == 0.0
+    assert store.update("c", 5.0, 10.0)[0] == 1.0
+    assert store.update("c", 500.0, 10.0)[:2] == [0.0, 0.0]
+    assert store.update(None, 501.0, 10.0) == [0.0, 0.0, 0.0]
+
+
+def test_lookup_without_record_leaves_history_unchanged() -> None:
+    """Test ``record=False`` sees the history but neither adds to it nor tracks new entities."""
+    store = VelocityStore(VelocitySpec("card", windows=(60.0,)))
+    store.update("a", 0.0, 10.0)
+
+    assert store.update("a", 1.0, 20.0, record=False)[:2] == [1.0, 10.0]
+    assert store.update("a", 2.0, 30.0)[:2] == [1.0, 10.0]
+    assert store.update("b", 3.0, 30.0, record=False) == [0.0, 0.0, 0.0]
+    assert len(store) == 1
+
+
+def test_spec_round_trips_and_reads_config(tmp_path: Path) -> None:
+    """Test the spec saved with a model loads back and config without an entity disables it."""
+    spec = VelocitySpec.from_config(
+        {"entity_column": "card", "velocity": {"windows": [60, 3600], "capacity": 8}}
+    )
+    assert spec is not None
+    spec.save(tmp_path)
+
+    assert VelocitySpec.load(tmp_path) == spec
+    assert spec.feature_names[:3] == ["txn_count_60s", "amount_sum_60s", "amount_zscore_60s"]
+    assert VelocitySpec.from_config({"entity_column": None}) is None
+    assert VelocitySpec.load(tmp_path / "missing") is None
+    with pytest.raises(ValueError, match="capacity"):
+        VelocitySpec("card", capacity=0)
+
+
+def test_add_velocity_features_replays_in_time_order() -> None:
+    """Test rows see only earlier transactions of their entity, whatever the row order."""
+    df = pd.DataFrame(
+        {
+            "Time": [30.0, 0.0, 10.0, 20.0],
+            "card": ["a", "a", "b", None],
+            "Amount": [5.0, 1.0, 2.0, 3.0],
+        }
+    )
+    spec = VelocitySpec("card", windows=(60.0,))
+
+    out = add_velocity_features(df, spec)
+
+    assert out["txn_count_60s"].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert out["amount_sum_60s"].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert list(out.columns[:3]) == ["Time", "card", "Amount"]